@@ -0,0 +1,105 @@
+"""
+Benchmark: row-wise apply() derivations vs the vectorized versions in pm_derive.
+
+Runs on the cleaned forecast (outputs/data_clean_forecast.pkl, ~92k rows) when
+it has been built, otherwise on a synthetic frame of the same size.
+
+Usage:
+    python benchmarks/bench_derivations.py [--rows 92000] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import pm_derive
+
+CLEAN_FORECAST = Path(__file__).parent.parent / 'outputs' / 'data_clean_forecast.pkl'
+
+
+# Previous implementations (baseline)
+def classify_tier(r):
+    cr = r['completion_rate']
+    if pd.isna(cr):
+        return 'UNKNOWN'
+    if cr >= 0.90:
+        return 'HIGH'
+    elif cr >= 0.75:
+        return 'MEDIUM'
+    else:
+        return 'LOW'
+
+
+def format_apply(df):
+    df = df.copy()
+    df['total_labor_hrs'] = df['total_labor_hrs'].apply(lambda x: f"{x:,.0f}")
+    df['PLANNED_LABOR_HRS'] = df['PLANNED_LABOR_HRS'].apply(lambda x: f"{x:.1f}")
+    df['complexity_score'] = df['complexity_score'].apply(lambda x: f"{x:.2f}")
+    return df
+
+
+def format_column_config(df):
+    return df, pm_derive.column_formats({'total_labor_hrs': 'hours',
+                                         'PLANNED_LABOR_HRS': 'ratio',
+                                         'complexity_score': 'score'})
+
+
+def load_frame(rows):
+    """Cleaned forecast columns used here + a completion rate per row"""
+    rng = np.random.default_rng(0)
+    if CLEAN_FORECAST.exists():
+        df = pd.read_pickle(CLEAN_FORECAST)[['total_labor_hrs', 'PLANNED_LABOR_HRS', 'complexity_score']]
+        source = str(CLEAN_FORECAST)
+    else:
+        df = pd.DataFrame({'total_labor_hrs': rng.gamma(2, 4, rows),
+                           'PLANNED_LABOR_HRS': rng.gamma(2, 1, rows),
+                           'complexity_score': rng.uniform(0, 1, rows)})
+        source = 'synthetic'
+    completion = rng.uniform(0.4, 1, len(df))
+    completion[rng.uniform(size=len(df)) < 0.1] = np.nan
+    return df.assign(completion_rate=completion), source
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=92000, help="synthetic rows when no cleaned forecast exists")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    df, source = load_frame(args.rows)
+    print(f"{len(df):,} rows ({source})\n")
+
+    # Both versions must agree before timing them
+    assert (df.apply(classify_tier, axis=1) == pm_derive.performance_tier(df['completion_rate'])).all()
+
+    cases = [
+        ('performance_tier', lambda: df.apply(classify_tier, axis=1),
+                             lambda: pm_derive.performance_tier(df['completion_rate'])),
+        ('table formatting', lambda: format_apply(df),
+                             lambda: format_column_config(df)),
+    ]
+
+    print(f"{'derivation':<18} {'apply (ms)':>12} {'vectorized (ms)':>16} {'speedup':>9}")
+    for name, before, after in cases:
+        t_before = best_of(before, args.repeat) * 1000
+        t_after = best_of(after, args.repeat) * 1000
+        print(f"{name:<18} {t_before:>12.1f} {t_after:>16.2f} {t_before / t_after:>8.0f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Distinct PM counts: pandas groupby().nunique() over PMNUM strings vs the
+pm_distinct kernel over interned PM codes.
+
+For every scale the synthetic exports are generated in memory and pushed
+through the pipeline; then each grouping the pages count PMs by is timed
+both ways (best of --repeat) and the results are checked to be identical.
+The one-off interning cost (paid at load time in the dashboard) is shown
+separately.
+
+Usage:
+    python benchmarks/bench_distinct.py [--scales 1 10] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import pm_distinct
+import pm_pipeline
+import synthetic
+
+# (dataset, grouping) - the PM counts behind the page KPIs, charts and tables
+GROUPINGS = [
+    ('forecast', []),
+    ('forecast', ['DEPT_NAME']),
+    ('forecast', ['ZONENAME']),
+    ('forecast', ['interval_category']),
+    ('forecast', ['MONTH']),
+    ('forecast', ['JOB_TYPE']),
+    ('forecast', ['MONTH', 'DEPT_NAME', 'LABOR_CRAFT']),
+    ('path2', ['due_month']),
+    ('path2_pm', ['DEPT_NAME']),
+    ('path2_pm', ['INTERVAL']),
+]
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def pandas_count(df, by):
+    return df['PMNUM'].nunique() if not by else df.groupby(by, observed=True)['PMNUM'].nunique()
+
+
+def kernel_count(df, by):
+    return pm_distinct.count(df['PMNUM']) if not by else pm_distinct.groupby_count(df, by, 'PMNUM')
+
+
+def run_scale(scale, repeat):
+    raw, performance = synthetic.generate(scale, 0)
+    forecast = pm_pipeline.clean_forecast(raw)
+    path2 = pm_pipeline.build_path2(performance, raw)
+    datasets = {'forecast': forecast, 'path2': path2, 'path2_pm': pm_pipeline.build_path2_pm(path2)}
+    print(f"\nscale {scale}: " + ", ".join(f"{name} {len(df):,} rows" for name, df in datasets.items()))
+
+    strings, interned = {}, {}
+    for name, df in datasets.items():
+        strings[name] = df.assign(PMNUM=df['PMNUM'].astype(object))
+        seconds, interned[name] = best_of(lambda: pm_distinct.intern_keys(strings[name].copy()), 1)
+        print(f"  intern {name:<44} {seconds * 1000:>9.1f} ms (once, at load)")
+
+    for name, by in GROUPINGS:
+        before, expected = best_of(lambda: pandas_count(strings[name], by), repeat)
+        after, actual = best_of(lambda: kernel_count(interned[name], by), repeat)
+        if by:
+            pd.testing.assert_series_equal(expected, actual, check_dtype=False, check_index_type=False,
+                                           check_categorical=False)
+        else:
+            assert expected == actual, (expected, actual)
+        label = f"{name} by {', '.join(by) or '(total)'}"
+        print(f"  {label:<51} nunique {before * 1000:>8.1f} ms  kernel {after * 1000:>8.1f} ms  "
+              f"x{before / after:>5.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+    for scale in args.scales:
+        run_scale(scale, args.repeat)
+    print("\nAll counts match")
+
+
+if __name__ == '__main__':
+    main()
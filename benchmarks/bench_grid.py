@@ -0,0 +1,105 @@
+"""
+Detail tables: the full filtered frame sent to st.dataframe vs one page of a
+server-side DetailGrid (pm_grid).
+
+For every scale the synthetic exports are generated in memory and pushed
+through the pipeline, and the largest department is loaded as the Deep Dive
+does (pm_model). For its "All Months" view (every row) and one month, the
+old path - rebuild all rows, project, rename, index, Arrow-encode - is timed
+against a grid that sorts by due date, searches a PM number, and builds and
+encodes one page (best of --repeat). The grid's pages are checked against
+the same slices of the full frame.
+
+Usage:
+    python benchmarks/bench_grid.py [--scales 1 10] [--repeat 5]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import pm_distinct
+import pm_grid
+import pm_model
+import pm_pipeline
+import synthetic
+
+HIDDEN = ['complexity_score', 'task_norm', 'hours_norm', 'desc_norm', 'MONTH_DATE', 'total_labor_per_occ_capped']
+RENAMES = {'task_density': 'tasks_per_hour'}
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def full_frame(model, positions):
+    """The former detail table: every filtered row, projected, renamed, indexed - and its Arrow size"""
+    df = model.wide(rows=positions)
+    clean = df[[col for col in df.columns if col not in HIDDEN]].rename(columns=RENAMES).set_index('PMNUM')
+    return clean, pa.Table.from_pandas(clean).nbytes
+
+
+def grid_page(grid, positions, sort, search, offset):
+    rows = grid.select(positions, sort=sort, descending=sort is not None, search=search)
+    page = grid.page(rows, offset, pm_grid.PAGE_SIZE)
+    return page, pa.Table.from_pandas(page).nbytes, len(rows)
+
+
+def run_scale(scale, repeat):
+    raw, _ = synthetic.generate(scale, 0)
+    forecast = pm_pipeline.clean_forecast(raw)
+    dept = forecast['DEPT_NAME'].value_counts().index[0]
+    model = pm_model.build_model(pm_distinct.intern_keys(forecast[forecast['DEPT_NAME'] == dept]
+                                                         .reset_index(drop=True)))
+    seconds, grid = best_of(lambda: pm_grid.DetailGrid(model, HIDDEN, RENAMES, index='PMNUM'), 1)
+    print(f"\nscale {scale}: {dept}, {len(model):,} rows  (grid projection built once: {seconds * 1000:.1f} ms)")
+
+    months = model.column('MONTH')
+    views = {'All Months': np.arange(len(model)),
+             'one month': np.flatnonzero(months == sorted(set(months))[len(set(months)) // 2])}
+    for view, positions in views.items():
+        before, (full, full_bytes) = best_of(lambda: full_frame(model, positions), repeat)
+        pm = str(full.index[len(full) // 2])
+        cases = [('page 1', None, None, 0),
+                 ('sorted by due date, page 5', 'DUE_DATE', None, 4 * pm_grid.PAGE_SIZE),
+                 (f'search {pm}', None, ('PMNUM', pm), 0)]
+        print(f"  {view:<11} full frame {len(full):>9,} rows {before * 1000:>8.1f} ms {full_bytes / 2**20:>7.1f} MB")
+        for label, sort, search, offset in cases:
+            after, (page, page_bytes, total) = best_of(lambda: grid_page(grid, positions, sort, search, offset), repeat)
+            expected = full
+            if search is not None:
+                expected = full[full.index.astype(str) == search[1]]
+            if sort is not None:
+                expected = expected.sort_values(sort, ascending=False, na_position='last', kind='stable')
+            assert total == len(expected), (total, len(expected))
+            expected = expected.iloc[offset:offset + pm_grid.PAGE_SIZE]
+            pd.testing.assert_frame_equal(expected, page, check_dtype=False, check_categorical=False,
+                                          check_index_type=False)
+            print(f"    {label:<34} grid {total:>9,} rows {after * 1000:>8.1f} ms {page_bytes / 2**10:>7.1f} KB"
+                  f"  x{before / after:>6.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+    for scale in args.scales:
+        run_scale(scale, args.repeat)
+    print("\nAll pages match")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Peak memory and wall time of the forecast ingest: one-shot read_csv vs the
+chunked pm_ingest stream.
+
+A synthetic forecast CSV is written at the requested scale, then each loader
+runs in a fresh Python process so its peak RSS is measured on its own.
+
+Usage:
+    python benchmarks/bench_ingest.py [--scale 10] [--chunk-rows 100000]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import synthetic
+
+SRC = Path(__file__).parent.parent / 'src'
+
+# Runs inside the child process - prints {"seconds": s, "peak_mb": mb, "rows": n}
+CHILD = '''
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+import pm_ingest, pm_pipeline
+
+mode, csv_path, out_path, chunk_rows = sys.argv[2], sys.argv[3], sys.argv[4], int(sys.argv[5])
+start = time.perf_counter()
+if mode == 'read_csv':
+    df = pm_pipeline.load_forecast(csv_path)
+else:
+    pm_ingest.ingest_forecast(csv_path, out_path, chunk_rows)
+seconds = time.perf_counter() - start
+# VmHWM (not ru_maxrss, which Linux carries over from the parent across exec)
+peak_mb = next(int(line.split()[1]) for line in open('/proc/self/status') if line.startswith('VmHWM')) / 1024
+rows = len(df) if mode == 'read_csv' else len(pm_ingest.read_forecast(out_path))
+print(json.dumps({"seconds": seconds, "peak_mb": peak_mb, "rows": rows}))
+'''
+
+
+def run(mode, csv_path, out_path, chunk_rows):
+    result = subprocess.run([sys.executable, '-c', CHILD, str(SRC), mode, str(csv_path), str(out_path),
+                             str(chunk_rows)], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=10)
+    parser.add_argument('--chunk-rows', type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        forecast, performance = synthetic.generate(args.scale)
+        synthetic.write_csv(forecast, performance, tmp)
+        del forecast, performance
+        csv_path = tmp / '103ki_pm_forecast.csv'
+        print(f"{csv_path.stat().st_size / 1e6:,.0f} MB forecast CSV (scale {args.scale})")
+
+        for mode in ['read_csv', 'chunked']:
+            result = run(mode, csv_path, tmp / 'forecast_raw', args.chunk_rows)
+            print(f"  {mode:<9} {result['rows']:>10,} rows  {result['seconds']:>7.2f} s  "
+                  f"peak {result['peak_mb']:>8,.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
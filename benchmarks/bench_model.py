@@ -0,0 +1,116 @@
+"""
+Forecast memory and occurrence reductions: the wide frame vs the
+PM / occurrence / labor model (pm_model).
+
+For every scale the synthetic exports are generated in memory and pushed
+through the pipeline. Both representations are measured deep (the wide frame
+with PMNUM interned), for the whole forecast and for every department read
+back from a store copy as the Deep Dive loads it (pm_data.load_dept_model),
+then the per-occurrence total and a grouped sum are timed both ways (best of
+--repeat) and checked to be identical, as is the wide view rebuilt from the
+model.
+
+Usage:
+    python benchmarks/bench_model.py [--scales 1 10] [--repeat 5]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import pm_distinct
+import pm_model
+import pm_pipeline
+import pm_store
+import synthetic
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def megabytes(n_bytes):
+    return n_bytes / 2**20
+
+
+def department_memory(forecast):
+    """(wide MB, model MB) per department, read from a store copy with the department filter"""
+    sizes = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'forecast'
+        pm_store.write_dataset(pm_pipeline.prepare_store(forecast), path)
+        for dept in pm_store.partition_values(path, 'DEPT_NAME'):
+            rows = pm_distinct.intern_keys(pm_store.read_dataset(path, filters={'DEPT_NAME': dept}))
+            model = pm_model.build_model(rows)
+            sizes[dept] = (megabytes(rows.memory_usage(deep=True, index=True).sum()),
+                           megabytes(sum(model.memory_usage().values())))
+    return sizes
+
+
+def run_scale(scale, repeat):
+    raw, _ = synthetic.generate(scale, 0)
+    forecast = pm_distinct.intern_keys(pm_pipeline.clean_forecast(raw))
+    print(f"\nscale {scale}: forecast {len(forecast):,} rows, {forecast['COUNTKEY'].nunique():,} occurrences, "
+          f"{forecast['PMNUM'].nunique():,} PMs")
+
+    seconds, model = best_of(lambda: pm_model.build_model(forecast), 1)
+    pd.testing.assert_frame_equal(forecast, model.wide(), check_dtype=False, check_categorical=False)
+    rows = np.sort(np.random.default_rng(0).choice(len(forecast), min(len(forecast), 5000), replace=False))
+    pd.testing.assert_frame_equal(forecast.iloc[rows], model.wide(rows=rows), check_dtype=False,
+                                  check_categorical=False)
+
+    wide = megabytes(forecast.memory_usage(deep=True, index=True).sum())
+    tables = {level: megabytes(n) for level, n in model.memory_usage().items()}
+    print(f"  build model {seconds * 1000:>8.1f} ms (once, at load)")
+    print(f"  memory      wide {wide:>7.1f} MB  model {sum(tables.values()):>7.1f} MB  "
+          f"x{wide / sum(tables.values()):>4.1f}  ("
+          + ", ".join(f"{level} {mb:.1f}" for level, mb in tables.items()) + ")")
+    sizes = department_memory(forecast)
+    for dept, (wide, held) in sizes.items():
+        print(f"  {dept:<16} wide {wide:>7.1f} MB  model {held:>7.1f} MB  x{wide / held:>4.1f}")
+    wide, held = (sum(mb) for mb in zip(*sizes.values()))
+    print(f"  {'all departments':<16} wide {wide:>7.1f} MB  model {held:>7.1f} MB  x{wide / held:>4.1f}")
+    columns = {level: sum(1 for col in model.columns if model.level[col] == level) for level in pm_model.LEVELS}
+    print("  columns     " + ", ".join(f"{level} {n}" for level, n in columns.items()))
+
+    before, expected = best_of(
+        lambda: forecast.groupby('COUNTKEY', observed=True)['total_labor_hrs'].transform('sum'), repeat)
+    after, actual = best_of(lambda: pm_model.segment_sum(forecast['COUNTKEY'], forecast['total_labor_hrs']), repeat)
+    np.testing.assert_allclose(expected.to_numpy(), actual)
+    print(f"  {'labor per occurrence (per row)':<36} transform {before * 1000:>8.1f} ms  "
+          f"segment_sum {after * 1000:>8.1f} ms  x{before / after:>5.1f}")
+
+    for by in ['DEPT_NAME', 'LABOR_CRAFT']:
+        before, expected = best_of(
+            lambda: forecast.groupby(by, observed=True)['PLANNED_LABOR_HRS'].sum(), repeat)
+        after, actual = best_of(lambda: model.group_sum(by, 'PLANNED_LABOR_HRS'), repeat)
+        pd.testing.assert_series_equal(expected, actual, check_dtype=False, check_index_type=False,
+                                       check_categorical=False)
+        print(f"  {'planned hours by ' + by:<36} groupby   {before * 1000:>8.1f} ms  "
+              f"group_sum   {after * 1000:>8.1f} ms  x{before / after:>5.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+    for scale in args.scales:
+        run_scale(scale, args.repeat)
+    print("\nAll results match")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+"""
+Scaling benchmark: pipeline stages and each dashboard page's computations,
+run headless (no Streamlit) on synthetic data at several scales.
+
+For every scale the synthetic exports are generated in memory, pushed through
+the pipeline stages, stored/read back as Parquet, and then every page's
+queries (cube rollups, index selections, KDE, Plan vs Execution groupbys and
+scatter reduction) are timed. Results go to a CSV with one row per
+(scale, page, step), so runs from different commits can be compared.
+
+Usage:
+    python benchmarks/bench_pages.py                       # scales 1, 10, 100
+    python benchmarks/bench_pages.py --scales 1 10 --repeat 5 --output results.csv
+    python benchmarks/bench_pages.py --scales 100 --no-store   # skip the Parquet round trip
+"""
+
+import argparse
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import pm_charts
+import pm_cube
+import pm_distinct
+import pm_index
+import pm_kde
+import pm_pipeline
+import pm_store
+import synthetic
+
+RESULTS_DIR = Path(__file__).parent / 'results'
+
+# Same column / index selections the dashboard pages use
+CALENDAR_COLUMNS = ['YEAR_WEEK', 'DEPT_NAME', 'LABOR_CRAFT', 'complexity_level', 'PLANNED_LABOR_HRS']
+DEPT_INDEX_COLUMNS = ['LABOR_CRAFT', 'complexity_level', 'interval_category', 'MONTH', 'LINE', 'ZONENAME']
+PATH2_ROW_COLUMNS = ['PMNUM', 'DEPT_NAME', 'INTERVAL', 'JOB_TYPE', 'due_month', 'completion_rate', 'on_time_rate']
+PATH2_INDEX_COLUMNS = ['DEPT_NAME', 'INTERVAL', 'JOB_TYPE']
+
+
+def timed(fn, repeat):
+    """(best wall time in seconds, result of the last call)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+# =============================================================================
+# PAGE COMPUTATIONS (mirrors the queries in src/dashboard_pages/)
+# =============================================================================
+def executive_overview(ctx):
+    cube = ctx['cube']
+    return {
+        'kpis': lambda: [cube.total('PLANNED_LABOR_HRS'), cube.total('PMNUM', 'nunique'),
+                         cube.total('complexity_score', 'mean'), cube.total('DEPT_NAME', 'nunique')],
+        'monthly by dept': lambda: cube.query(['MONTH', 'DEPT_NAME'], {'PLANNED_LABOR_HRS': 'sum'}),
+        'dept comparison': lambda: cube.query('DEPT_NAME', {'PLANNED_LABOR_HRS': 'sum', 'PMNUM': 'nunique',
+                                                            'complexity_score': 'mean', 'LABOR_CRAFT': 'mode'}),
+        'scope / job counts': lambda: [cube.value_counts('PMSCOPETYPE'), cube.value_counts('JOB_TYPE')],
+    }
+
+
+def department_deep_dive(ctx):
+    cube, rows, index = ctx['cube'], ctx['dept_rows'], ctx['dept_index']
+    dept_filter = {'DEPT_NAME': ctx['dept']}
+    crafts = cube.values('LABOR_CRAFT', filters=dept_filter)
+    craft_filter = {**dept_filter, 'LABOR_CRAFT': crafts}
+
+    def kde():
+        positions = index.positions({'LABOR_CRAFT': crafts})
+        return [pm_kde.binned_kde(rows[col].to_numpy()[positions], np.linspace(0, 1, 200))
+                for col in ['task_norm', 'hours_norm', 'desc_norm']]
+
+    return {
+        'kpis': lambda: [cube.total('total_labor_hrs', filters=dept_filter),
+                         cube.total('PMNUM', 'nunique', filters=dept_filter),
+                         cube.total('complexity_score', 'mean', filters=dept_filter),
+                         cube.total('LABOR_CRAFT', 'mode', filters=dept_filter)],
+        'monthly by craft': lambda: cube.query(['MONTH', 'LABOR_CRAFT'], {'total_labor_hrs': 'sum'},
+                                               filters=craft_filter),
+        'zone summary': lambda: cube.query('ZONENAME', {'PMNUM': 'nunique', 'COUNTKEY': 'count',
+                                                        'PLANNED_LABOR_HRS': 'sum', 'total_labor_hrs': 'sum'},
+                                           filters=craft_filter),
+        'complexity kde': kde,
+        'interval breakdown': lambda: [
+            cube.query('interval_category', {'complexity_score': 'mean', 'PMNUM': 'nunique',
+                                             'PLANNED_LABOR_HRS': 'sum'}, filters=craft_filter),
+            cube.query(['MONTH', 'interval_category'], {'PLANNED_LABOR_HRS': 'sum'}, filters=craft_filter),
+            cube.query('interval_category', {'PMNUM': 'nunique', 'COUNTKEY': 'count', 'PLANNED_LABOR_HRS': 'sum',
+                                             'PLANNED_LABORERS': 'sum', 'complexity_score': 'mean',
+                                             'TASK_COUNT': 'mean'}, filters=craft_filter)],
+        'detail rows': lambda: rows.iloc[index.positions({'LABOR_CRAFT': crafts})],
+    }
+
+
+def workload_calendar(ctx):
+    cube, rows, index = ctx['cube'], ctx['calendar_rows'], ctx['calendar_index']
+    cal_filter = {'DEPT_NAME': ctx['dept']}
+
+    def weekly():
+        positions = index.positions(cal_filter)
+        return (rows['PLANNED_LABOR_HRS'].iloc[positions]
+                .groupby(rows['YEAR_WEEK'].iloc[positions], observed=True).sum())
+
+    return {
+        'filter options': lambda: [cube.values('DEPT_NAME'), cube.values('LABOR_CRAFT'),
+                                   cube.values('complexity_level')],
+        'monthly heatmap': lambda: cube.query('MONTH', {'PLANNED_LABOR_HRS': 'sum'}, filters=cal_filter),
+        'weekly workload': weekly,
+        'dept calendar': lambda: cube.query(['MONTH', 'DEPT_NAME'], {'PLANNED_LABOR_HRS': 'sum'}),
+        'monthly stats': lambda: cube.query('MONTH', {'PLANNED_LABOR_HRS': 'sum', 'PMNUM': 'nunique',
+                                                      'LABOR_CRAFT': 'nunique'}, filters=cal_filter),
+    }
+
+
+def operational_insights(ctx):
+    cube = ctx['cube']
+    return {
+        'interval patterns': lambda: [cube.value_counts('interval_category'),
+                                      cube.query('interval_category', {'PLANNED_LABOR_HRS': 'sum'})],
+        'craft by dept': lambda: cube.query(['DEPT_NAME', 'LABOR_CRAFT'], {'PLANNED_LABOR_HRS': 'sum'}),
+        'scope preferences': lambda: [cube.value_counts('PMSCOPETYPE'),
+                                      cube.query(['DEPT_NAME', 'PMSCOPETYPE'], {'Count': 'count'})],
+        'complexity': lambda: [cube.query('DEPT_NAME', {'complexity_score': 'mean'}),
+                               cube.value_counts('complexity_level')],
+        'job type summary': lambda: cube.query('JOB_TYPE', {'PMNUM': 'nunique', 'PLANNED_LABOR_HRS': 'sum',
+                                                            'complexity_score': 'mean'}),
+    }
+
+
+def plan_vs_execution(ctx):
+    pms, pm_idx, rows, row_idx = ctx['pms'], ctx['pm_index'], ctx['path2_rows'], ctx['path2_index']
+    selection = {'DEPT_NAME': [ctx['dept']]}
+
+    def category_tables():
+        return [pms.groupby(col, observed=True).agg(avg_completion=('completion_rate', 'mean'),
+                                                     avg_ontime=('on_time_rate', 'mean'),
+                                                     avg_hour_dev_pct=('hour_deviation_pct', 'mean'),
+                                                     n_pm=('PMNUM', 'nunique'))
+                for col in ['INTERVAL', 'JOB_TYPE', 'LABOR_CRAFT']]
+
+    return {
+        'filter': lambda: (pms.iloc[pm_idx.positions(selection)], rows.iloc[row_idx.positions(selection)]),
+        'kpis': lambda: [pms['completion_rate'].mean(), pms['on_time_rate'].mean(),
+                         (pms['AVG_ACTUAL_HRS'] - pms['AVG_PLANNED_HRS']).mean(),
+                         (pms['completion_rate'] < 0.75).sum(), len(pms)],
+        'problem pms': lambda: (pms[pms['completion_rate'] < 0.75]
+                                .sort_values(['completion_rate', 'hour_deviation_pct']).head(25)),
+        'dept execution': lambda: pms.groupby('DEPT_NAME', observed=True).agg(
+            avg_completion=('completion_rate', 'mean'), avg_ontime=('on_time_rate', 'mean'),
+            n_pm=('PMNUM', 'nunique')),
+        'category accuracy': category_tables,
+        'monthly trend': lambda: rows.groupby('due_month', observed=True).agg(
+            avg_completion=('completion_rate', 'mean'), avg_ontime=('on_time_rate', 'mean')).assign(
+            total_pm=pm_distinct.groupby_count(rows, 'due_month', 'PMNUM')),
+        'scatter figures': lambda: [pm_charts.pm_scatter(pms, 'AVG_PLANNED_HRS', 'AVG_ACTUAL_HRS',
+                                                         color='performance_tier', title='Planned vs Actual'),
+                                    pm_charts.pm_scatter(pms, 'complexity_score', 'completion_rate',
+                                                         color='performance_tier', title='Completion vs Complexity')],
+    }
+
+
+PAGES = {
+    'Executive Overview': executive_overview,
+    'Department Deep Dive': department_deep_dive,
+    'Workload Calendar': workload_calendar,
+    'Operational Insights': operational_insights,
+    'Plan vs Execution': plan_vs_execution,
+}
+
+
+# =============================================================================
+# RUN
+# =============================================================================
+def run_scale(scale, repeat, seed=0, store=True):
+    results = []
+
+    def record(page, step, seconds, rows):
+        results.append({'scale': scale, 'forecast_rows': rows, 'page': page, 'step': step, 'seconds': seconds})
+        print(f"  {page:<22} {step:<22} {seconds * 1000:>10.1f} ms")
+
+    raw, performance = synthetic.generate(scale, seed)
+    n = len(raw)
+    print(f"\nscale {scale}: {n:,} forecast rows, {len(performance):,} performance rows")
+
+    # Pipeline stages (run once - they dominate at large scales)
+    t, clean = timed(lambda: pm_pipeline.clean_forecast(raw), 1)
+    record('pipeline', 'clean_forecast', t, n)
+    t, path2 = timed(lambda: pm_pipeline.build_path2(performance, raw), 1)
+    record('pipeline', 'build_path2', t, n)
+    t, pms = timed(lambda: pm_pipeline.build_path2_pm(path2), 1)
+    record('pipeline', 'build_path2_pm', t, n)
+
+    # Columnar store round trip for the forecast
+    if store:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'forecast'
+            t, _ = timed(lambda: pm_store.write_dataset(pm_pipeline.prepare_store(clean), path), 1)
+            record('store', 'write forecast', t, n)
+            t, calendar_rows = timed(lambda: pm_store.read_dataset(path, CALENDAR_COLUMNS), repeat)
+            record('store', 'read calendar columns', t, n)
+    else:
+        calendar_rows = pm_pipeline.prepare_store(clean[CALENDAR_COLUMNS + ['DUE_DATE']])[CALENDAR_COLUMNS]
+
+    dept = clean['DEPT_NAME'].value_counts().index[0]
+    dept_rows = clean[clean['DEPT_NAME'] == dept].reset_index(drop=True)
+    path2_rows = pm_pipeline.prepare_store(path2)[PATH2_ROW_COLUMNS]
+
+    # Load-time structures (built once per data load in the dashboard)
+    t, cube = timed(lambda: pm_cube.build_cube(clean[pm_cube.CUBE_COLUMNS]), 1)
+    record('load', 'build_cube', t, n)
+    t, dept_index = timed(lambda: pm_index.build_index(dept_rows, DEPT_INDEX_COLUMNS), 1)
+    record('load', 'build dept index', t, n)
+    t, calendar_index = timed(lambda: pm_index.build_index(calendar_rows, ['DEPT_NAME', 'LABOR_CRAFT',
+                                                                         'complexity_level']), 1)
+    record('load', 'build calendar index', t, n)
+    pm_idx = pm_index.build_index(pms, PATH2_INDEX_COLUMNS)
+    path2_index = pm_index.build_index(path2_rows, PATH2_INDEX_COLUMNS)
+
+    ctx = {'cube': cube, 'dept': dept, 'dept_rows': dept_rows, 'dept_index': dept_index,
+           'calendar_rows': calendar_rows, 'calendar_index': calendar_index,
+           'pms': pms, 'pm_index': pm_idx, 'path2_rows': path2_rows, 'path2_index': path2_index}
+
+    for page, steps in PAGES.items():
+        page_total = 0.0
+        for step, fn in steps(ctx).items():
+            t, _ = timed(fn, repeat)
+            page_total += t
+            record(page, step, t, n)
+        record(page, 'TOTAL', page_total, n)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=3, help="runs per page step (best time is kept)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-store', action='store_true', help="skip the Parquet write/read round trip")
+    parser.add_argument('--output', type=Path, help="CSV file (default: benchmarks/results/pages_<timestamp>.csv)")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for scale in args.scales:
+        rows.extend(run_scale(scale, args.repeat, args.seed, store=not args.no_store))
+
+    results = pd.DataFrame(rows).assign(commit=git_commit(),
+                                        python=platform.python_version(),
+                                        pandas=pd.__version__,
+                                        run_at=datetime.now().isoformat(timespec='seconds'))
+    output = args.output or RESULTS_DIR / f"pages_{datetime.now():%Y%m%d_%H%M%S}.csv"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    results.to_csv(output, index=False)
+
+    totals = results[results['step'] == 'TOTAL'].pivot(index='page', columns='scale', values='seconds')
+    print(f"\nPage totals (s):\n{totals.round(3).to_string()}\n\nResults written to {output}")
+
+
+if __name__ == '__main__':
+    main()
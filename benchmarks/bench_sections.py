@@ -0,0 +1,69 @@
+"""
+Department Deep Dive latency: sections computed one after another vs on a thread pool.
+
+For each worker count (PM_SECTION_WORKERS) a fresh Python process runs the
+page headless with profiling on - once to warm the loaders, then timed
+reruns - and reports the page time plus the per-section compute times the
+scheduler recorded. With enough cores the page should approach its slowest
+section (critical path) rather than the sum of all sections.
+
+Needs the datasets built by src/pm_pipeline.py.
+
+Usage:
+    python benchmarks/bench_sections.py [--workers 1 4 16] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+DASHBOARD = Path(__file__).parent.parent / 'src' / 'preventive_maintenance_dashboard.py'
+
+# Runs inside the child process - prints one JSON line with the best rerun
+CHILD = '''
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file(sys.argv[1], default_timeout=600)
+at.switch_page("dashboard_pages/department_deep_dive.py")
+at.run()
+assert not at.exception, at.exception
+best = None
+for _ in range(int(sys.argv[2])):
+    start = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - start
+    assert not at.exception, at.exception
+    if best is None or seconds < best[0]:
+        records = [r for r in at.session_state['perf_runs'][-1]['records'] if r['kind'] == 'compute']
+        best = (seconds, records)
+print(json.dumps({"seconds": best[0], "records": best[1]}))
+'''
+
+
+def run(workers, repeat):
+    env = dict(os.environ, PM_SECTION_WORKERS=str(workers), PM_PROFILE='1')
+    result = subprocess.run([sys.executable, '-c', CHILD, str(DASHBOARD), str(repeat)],
+                            capture_output=True, text=True, check=True, env=env)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--repeat', type=int, default=5, help="timed reruns per worker count (best is kept)")
+    args = parser.parse_args(argv)
+
+    print(f"Department Deep Dive, {os.cpu_count()} cores")
+    for workers in args.workers:
+        result = run(workers, args.repeat)
+        print(f"  {workers:>3} workers  page {result['seconds'] * 1000:>8.0f} ms")
+        for rec in result['records']:
+            print(f"      {rec['section']:<48} {rec['ms']:>8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
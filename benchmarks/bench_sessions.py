@@ -0,0 +1,100 @@
+"""
+Memory of N concurrent dashboard sessions: per-session copies vs one shared copy.
+
+For each cache mode (PM_CACHE_MODE=session / shared) a fresh Python process
+starts N Streamlit test sessions on a thread pool; every session walks through
+the pages at the same time, as N planners would. Reports peak and final RSS
+of the process and the datasets pm_memory saw loaded, and checks that every
+session rendered without an exception.
+
+Needs the datasets built by src/pm_pipeline.py.
+
+Usage:
+    python benchmarks/bench_sessions.py [--sessions 30] [--modes session shared]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).parent.parent / 'src'
+
+# Runs inside the child process - prints one JSON line with the measurements
+CHILD = '''
+import json, sys, time
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, sys.argv[1])
+import threading
+from streamlit.runtime.scriptrunner import script_cache
+from streamlit.testing.v1 import AppTest
+import pm_memory
+
+# A server compiles each page once for all sessions; every AppTest has its own script cache,
+# and compiling from several threads at once trips CPython 3.11's AST checks - compile one at a time
+_compile_lock = threading.Lock()
+_get_bytecode = script_cache.ScriptCache.get_bytecode
+def get_bytecode(self, script_path):
+    with _compile_lock:
+        return _get_bytecode(self, script_path)
+script_cache.ScriptCache.get_bytecode = get_bytecode
+
+script, n_sessions, pages = sys.argv[2], int(sys.argv[3]), sys.argv[4].split(',')
+
+def session(i):
+    at = AppTest.from_file(script, default_timeout=600)
+    at.run()
+    errors = [str(e.value) for e in at.exception]
+    for page in pages:
+        at.switch_page(f"dashboard_pages/{page}.py").run()
+        errors += [str(e.value) for e in at.exception]
+    return errors
+
+start = time.perf_counter()
+with ThreadPoolExecutor(n_sessions) as pool:
+    errors = [e for result in pool.map(session, range(n_sessions)) for e in result]
+seconds = time.perf_counter() - start
+status = dict(line.split(':', 1) for line in open('/proc/self/status') if line.startswith('Vm'))
+report = pm_memory.report()
+print(json.dumps({"seconds": seconds, "errors": errors[:3], "n_errors": len(errors),
+                  "peak_mb": int(status['VmHWM'].split()[0]) / 1024,
+                  "rss_mb": int(status['VmRSS'].split()[0]) / 1024,
+                  "datasets_mb": float(report.loc[report['item'] == 'all datasets', 'MB'].iloc[0])}))
+'''
+
+PAGES = ['executive_overview', 'department_deep_dive', 'workload_calendar',
+         'operational_insights', 'plan_vs_execution']
+
+
+def run(mode, n_sessions, pages):
+    env = dict(os.environ, PM_CACHE_MODE=mode)
+    result = subprocess.run([sys.executable, '-c', CHILD, str(SRC), str(SRC / 'preventive_maintenance_dashboard.py'),
+                             str(n_sessions), ','.join(pages)],
+                            capture_output=True, text=True, check=True, env=env)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=30)
+    parser.add_argument('--modes', nargs='+', default=['session', 'shared'])
+    parser.add_argument('--pages', nargs='+', default=PAGES)
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{args.sessions} concurrent sessions, pages: {', '.join(args.pages)}")
+    for mode in args.modes:
+        result = run(mode, args.sessions, args.pages)
+        print(f"  {mode:<8} peak {result['peak_mb']:>8,.0f} MB  final {result['rss_mb']:>8,.0f} MB  "
+              f"datasets {result['datasets_mb']:>6,.0f} MB  {result['seconds']:>7.1f} s  "
+              f"errors {result['n_errors']}")
+        for error in result['errors']:
+            print(f"    {error}")
+        failed |= result['n_errors'] > 0
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
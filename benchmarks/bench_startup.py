@@ -0,0 +1,77 @@
+"""
+Cold-start and warm-rerun timing for each dashboard page.
+
+Each page is run headless with streamlit's AppTest in a fresh Python process:
+  cold - first run (imports, dataset reads, cube/index builds, empty caches)
+  warm - the same page rerun straight after (what a widget click costs)
+
+Needs the datasets built by src/pm_pipeline.py.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 3] [--output timing.csv]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+DASHBOARD = Path(__file__).parent.parent / 'src' / 'preventive_maintenance_dashboard.py'
+
+PAGES = {
+    "Executive Overview": 'dashboard_pages/executive_overview.py',
+    "Department Deep Dive": 'dashboard_pages/department_deep_dive.py',
+    "Workload Calendar": 'dashboard_pages/workload_calendar.py',
+    "Operational Insights": 'dashboard_pages/operational_insights.py',
+    "Plan vs Execution": 'dashboard_pages/plan_vs_execution.py',
+}
+
+# Runs inside the child process - prints {"cold": s, "warm": s}
+CHILD = '''
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file(sys.argv[1], default_timeout=600)
+at.switch_page(sys.argv[2])
+start = time.perf_counter()
+at.run()
+cold = time.perf_counter() - start
+assert not at.exception, at.exception
+
+start = time.perf_counter()
+at.run()
+warm = time.perf_counter() - start
+print(json.dumps({"cold": cold, "warm": warm}))
+'''
+
+
+def time_page(page_path):
+    result = subprocess.run([sys.executable, '-c', CHILD, str(DASHBOARD), page_path],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help="fresh processes per page (best time is kept)")
+    parser.add_argument('--output', type=Path, help="optional CSV file for the results")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for name, page_path in PAGES.items():
+        runs = [time_page(page_path) for _ in range(args.repeat)]
+        rows.append({'page': name,
+                     'cold_s': min(r['cold'] for r in runs),
+                     'warm_s': min(r['warm'] for r in runs)})
+
+    report = pd.DataFrame(rows)
+    print(report.to_string(index=False, float_format=lambda x: f"{x:.3f}"))
+    if args.output:
+        report.to_csv(args.output, index=False)
+
+
+if __name__ == '__main__':
+    main()
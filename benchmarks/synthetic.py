@@ -0,0 +1,198 @@
+"""
+Synthetic PM datasets with the schema of the Maximo exports, at any scale.
+
+Scale 1 is about the size of the real data (~92k forecast rows, ~18k PMs in
+the performance export); scale 10 is ten times the PMs, and so on. PMs get an
+interval, department, 1-2 crafts and job plan attributes; the forecast then
+has one row per due date x craft over the April-March fiscal year, like
+103ki_pm_forecast.csv.
+
+    forecast, performance = generate(scale=10)       # in memory
+    python benchmarks/synthetic.py --scale 10 --out /tmp/pm10   # CSV files
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FISCAL_START = pd.Timestamp('2026-04-01')
+FISCAL_DAYS = 365
+
+# Interval mix (share of PMs) and step in days
+INTERVALS = {
+    '1-DAYS': (0.002, 1), '1-WEEKS': (0.02, 7), '2-WEEKS': (0.02, 14), '1-MONTHS': (0.15, 30),
+    '2-MONTHS': (0.06, 61), '3-MONTHS': (0.2, 91), '6-MONTHS': (0.2, 182), '1-YEARS': (0.268, 365),
+    '2-YEARS': (0.06, 730), '45-DAYS': (0.01, 45),
+}
+
+# (DEPT, DEPT_NAME, share of PMs, location column) - FACILITIES has no DEPT_NAME in the export
+DEPARTMENTS = [
+    ('PA1', 'PAINT 1', 0.20, 'ZONENAME'), ('PA2', 'PAINT 2', 0.20, 'ZONENAME'),
+    ('EN1', 'ENGINE ASSEMBLY', 0.22, 'ZONENAME'), ('MA1', 'MACHINING', 0.14, 'LINE'),
+    ('BP1', 'BUMPER PAINT', 0.12, 'ZONENAME'), ('FA1', None, 0.12, None),
+]
+
+CRAFTS = ['MECH', 'ELEC', 'PIPE', 'CTRL', 'PROD', 'ROBOT', 'HVAC', 'TOOL']
+JOB_TYPES = ['INSPECTION', 'REPAIR', 'ADJUSTMENT']
+SCOPE_TYPES = ['ASSET', 'LOCATION']
+
+# Scale 1 sizes
+PMS_PER_SCALE = 12000          # PMs in the forecast
+PERFORMANCE_ONLY_SHARE = 0.7   # extra PMs that only appear in the performance export
+LOCATIONS_PER_SCALE = 2500
+
+
+def generate_pms(scale, rng):
+    """One row per PM with its job plan attributes"""
+    n = int(PMS_PER_SCALE * scale)
+    names = list(INTERVALS)
+    shares = np.array([INTERVALS[i][0] for i in names])
+    interval = rng.choice(len(names), n, p=shares / shares.sum())
+    dept_shares = np.array([d[2] for d in DEPARTMENTS])
+    dept = rng.choice(len(DEPARTMENTS), n, p=dept_shares / dept_shares.sum())
+
+    step = np.array([INTERVALS[i][1] for i in names])[interval]
+    tasks = rng.integers(1, 25, n)
+    return pd.DataFrame({
+        'pm': np.arange(n),
+        'interval': interval,
+        'step': step,
+        'offset': rng.integers(0, np.minimum(step, FISCAL_DAYS)),
+        'dept': dept,
+        'n_crafts': rng.choice([1, 2], n, p=[0.7, 0.3]),
+        'craft1': rng.integers(0, len(CRAFTS), n),
+        'craft2': rng.integers(0, len(CRAFTS), n),
+        'job_type': rng.choice(len(JOB_TYPES), n, p=[0.5, 0.3, 0.2]),
+        'scope': rng.integers(0, len(SCOPE_TYPES), n),
+        'tasks': tasks,
+        'desc_len': tasks * rng.integers(20, 200, n),
+        'hours': rng.choice([0.25, 0.5, 1, 2, 4, 8, 12], n, p=[0.1, 0.3, 0.25, 0.15, 0.1, 0.07, 0.03]),
+        'laborers': rng.choice([1, 2, 3, 4], n, p=[0.6, 0.25, 0.1, 0.05]),
+        'location': rng.integers(0, int(LOCATIONS_PER_SCALE * scale), n),
+        'area': rng.integers(1, 9, n),
+    })
+
+
+def expand_occurrences(pms):
+    """PM rows -> one row per due date x craft (vectorized)"""
+    # Due dates: offset, offset + step, ... inside the fiscal year
+    n_due = (FISCAL_DAYS - 1 - pms['offset'].to_numpy()) // pms['step'].to_numpy() + 1
+    pm_idx = np.repeat(np.arange(len(pms)), n_due)
+    k = np.arange(len(pm_idx)) - np.repeat(np.cumsum(n_due) - n_due, n_due)
+    day = pms['offset'].to_numpy()[pm_idx] + k * pms['step'].to_numpy()[pm_idx]
+
+    # One row per craft on the job plan
+    n_crafts = pms['n_crafts'].to_numpy()[pm_idx]
+    occ_idx = np.repeat(np.arange(len(pm_idx)), n_crafts)
+    second = np.arange(len(occ_idx)) - np.repeat(np.cumsum(n_crafts) - n_crafts, n_crafts)
+    rows = pms.iloc[pm_idx[occ_idx]].reset_index(drop=True)
+    rows['day'] = day[occ_idx]
+    rows['craft'] = np.where(second == 0, rows['craft1'], rows['craft2'])
+    return rows
+
+
+def generate_forecast(scale=1, seed=0):
+    """Forecast as pm_pipeline.load_forecast returns it (parsed dates, categoricals)"""
+    rng = np.random.default_rng(seed)
+    rows = expand_occurrences(generate_pms(scale, rng))
+    n = len(rows)
+
+    def cat(values, labels):
+        return pd.Categorical.from_codes(values, categories=labels)
+
+    pmnum = pd.Series(cat(rows['pm'].to_numpy(), [f'PM{100000 + i}' for i in range(rows['pm'].max() + 1)]))
+    pmnum = pmnum.astype(str)
+    due = FISCAL_START + pd.to_timedelta(rows['day'], unit='D')
+    dept = rows['dept'].to_numpy()
+    location_col = np.array([d[3] for d in DEPARTMENTS], dtype=object)[dept]
+    area = rows['area'].astype(str)
+
+    df = pd.DataFrame({
+        'DUE_DATE': due,
+        'PMNUM': pmnum,
+        'COUNTKEY': due.dt.strftime('%Y-%m-%d') + '-' + pmnum.astype(str),
+        'PMDESCRIPTION': 'PM TASK ' + pmnum.astype(str),
+        'INTERVAL': cat(rows['interval'].to_numpy(), list(INTERVALS)),
+        'FORECASTJP': 'JP' + pmnum.astype(str),
+        'JOB_TYPE': cat(rows['job_type'].to_numpy(), JOB_TYPES),
+        'LABOR_CRAFT': cat(rows['craft'].to_numpy(), CRAFTS),
+        'PLANNED_LABORERS': rows['laborers'].astype(float).where(rng.random(n) > 0.01),
+        'PLANNED_LABOR_HRS': rows['hours'].astype(float).where(rng.random(n) > 0.01),
+        'TOTAL_MATERIAL_COST': np.nan,
+        'TASK_COUNT': rows['tasks'].astype(float),
+        'TOTAL_TASK_DESC_LENGTH': rows['desc_len'].astype(float),
+        'PMSCOPETYPE': cat(rows['scope'].to_numpy(), SCOPE_TYPES),
+        'LOCATION': 'LOC' + rows['location'].astype(str),
+        'LOCATIONDESC': 'LOCATION ' + rows['location'].astype(str),
+        'PLANT': pd.Categorical(['KI'] * n),
+        'DEPT': cat(dept, [d[0] for d in DEPARTMENTS]),
+        'DEPT_NAME': np.array([d[1] or 'FACILITIES' for d in DEPARTMENTS], dtype=object)[dept],
+        'DEPT_TYPE': pd.Categorical(np.array([d[0][:2] for d in DEPARTMENTS])[dept]),
+        'LINE': pd.Categorical(('L' + area).where(location_col == 'LINE')),
+        'ZONENAME': pd.Categorical(('ZONE ' + area).where(location_col == 'ZONENAME')),
+        'PROCESSNAME': pd.Categorical(['PROCESS ' + a for a in area]),
+    })
+    return df
+
+
+def generate_performance(forecast, scale=1, seed=0):
+    """Last year's execution summary: most forecast PMs plus PMs that were retired since"""
+    rng = np.random.default_rng(seed + 1)
+    pms = forecast.drop_duplicates('PMNUM')[['PMNUM', 'INTERVAL', 'PLANNED_LABOR_HRS']]
+    pms = pms.sample(frac=0.85, random_state=seed)
+    n_extra = int(PMS_PER_SCALE * scale * PERFORMANCE_ONLY_SHARE)
+    pmnum = np.concatenate([pms['PMNUM'].astype(str).to_numpy(),
+                            [f'PM{900000 + i}' for i in range(n_extra)]])
+    n = len(pmnum)
+
+    step = np.concatenate([pms['INTERVAL'].map({k: v[1] for k, v in INTERVALS.items()}).astype(float).to_numpy(),
+                           rng.choice([7, 30, 91, 365], n_extra)])
+    scheduled = np.maximum(FISCAL_DAYS // step, 1).astype(int)
+    not_completed = rng.binomial(scheduled, rng.beta(1, 8, n))
+    late = rng.binomial(scheduled - not_completed, rng.beta(1, 5, n))
+    planned = np.concatenate([pms['PLANNED_LABOR_HRS'].fillna(0.5).to_numpy(),
+                              rng.choice([0.5, 1, 2, 4], n_extra)])
+
+    return pd.DataFrame({
+        'PMNUM': pmnum,
+        'TIMES_SCHEDULED': scheduled,
+        'TIMES_ONTIME': scheduled - not_completed - late,
+        'TIMES_LATE': late,
+        'TIMES_NOT_COMPLETED': not_completed,
+        'AVG_PLANNED_HRS': planned,
+        'AVG_ACTUAL_HRS': planned * rng.lognormal(-0.2, 0.6, n),
+    })
+
+
+def generate(scale=1, seed=0):
+    forecast = generate_forecast(scale, seed)
+    return forecast, generate_performance(forecast, scale, seed)
+
+
+def write_csv(forecast, performance, out_dir):
+    """Writes the two exports the way Maximo does (cp1252, FACILITIES without a DEPT_NAME)"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    forecast = forecast.assign(DUE_DATE=forecast['DUE_DATE'].dt.strftime('%Y-%m-%d'),
+                               DEPT_NAME=forecast['DEPT_NAME'].astype(object)
+                               .where(forecast['DEPT'] != 'FA1'))
+    forecast.to_csv(out_dir / '103ki_pm_forecast.csv', index=False, encoding='cp1252')
+    performance.to_csv(out_dir / '101ki_pm_performance.csv', index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic PM exports")
+    parser.add_argument('--scale', type=float, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', type=Path, required=True, help="folder for the two CSV files")
+    args = parser.parse_args(argv)
+
+    forecast, performance = generate(args.scale, args.seed)
+    write_csv(forecast, performance, args.out)
+    print(f"{len(forecast):,} forecast rows, {len(performance):,} performance rows -> {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,661 @@
+# =============================================================================
+# PAGE 2: DEPARTMENT DEEP DIVE
+# =============================================================================
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+import pm_derive
+import pm_grid
+import pm_profiler
+import pm_sections
+from pm_data import (KDE_GRID, cached_result, complexity_densities, list_departments, load_cube,
+                     load_dept_index, load_dept_model)
+
+pm_profiler.checkpoint("Page setup")
+
+st.title("🔍 Department Deep Dive")
+st.markdown("*Detailed analysis for individual departments*")
+st.markdown("---")
+
+# DEPARTMENT SELECTOR - BUTTONS
+pm_profiler.checkpoint("Select Department")
+st.subheader("Select Department")
+
+dept_list = list_departments()
+
+# Create columns for buttons (adjust number based on how many departments you have)
+# Using 4 columns, but you can change this
+cols_per_row = 6
+
+# Split departments into rows
+for i in range(0, len(dept_list), cols_per_row):
+    cols = st.columns(cols_per_row)
+    for j, col in enumerate(cols):
+        if i + j < len(dept_list):
+            dept = dept_list[i + j]
+            with col:
+                if st.button(dept, key=f"dept_{dept}", use_container_width=True):
+                    st.session_state.selected_dept = dept
+
+# Get selected department (default to first one if none selected)
+if 'selected_dept' not in st.session_state:
+    st.session_state.selected_dept = dept_list[0]
+
+selected_dept = st.session_state.selected_dept
+
+st.markdown(f"### Currently viewing: **{selected_dept}**")
+st.markdown("---")
+
+# Charts query the cube; row-level data (KDE + detail tables) loads only the selected department's partitions,
+# held as PM / occurrence / labor tables - detail tables rebuild just the rows they show
+cube = load_cube()
+dept_filter = {'DEPT_NAME': selected_dept}
+dept_model = load_dept_model(selected_dept)
+dept_index = load_dept_index(selected_dept)
+
+available_crafts = cube.values('LABOR_CRAFT', filters=dept_filter)
+complexity_options = ['All Levels'] + cube.values('complexity_level', filters=dept_filter)
+VIZ_OPTIONS = ["Heatmap - Labor Hours", "Scatter - Occurrences vs Hours"]
+METRIC_OPTIONS = ["Total Labor Hours", "Labor Assignments"]
+COMPLEXITY_ORDER = ['Low', 'Medium', 'High', 'Very High']
+COMPLEXITY_COLORS = {'Low': '#90EE90', 'Medium': '#FFD700', 'High': '#FFA500', 'Very High': '#FF6347'}
+# Detail tables leave out the internal calculations and show task_density as tasks_per_hour
+DETAIL_HIDDEN = ['complexity_score', 'task_norm', 'hours_norm', 'desc_norm', 'MONTH_DATE', 'total_labor_per_occ_capped']
+DETAIL_RENAMES = {'task_density': 'tasks_per_hour'}
+
+# Paginated detail tables - output projection built once per department and dataset version
+detail_grid = cached_result(f'deep_dive/detail_grid/{selected_dept}',
+                            lambda: pm_grid.DetailGrid(dept_model, DETAIL_HIDDEN, DETAIL_RENAMES, index='PMNUM'))
+
+# =============================================================================
+# SECTIONS - data + figures of each independent block, computed on the section thread pool
+# (pm_sections); they only read the cube / department index and never call st.*
+# =============================================================================
+def kpi_section():
+    return {'hours': cube.total('total_labor_hrs', filters=dept_filter),
+            'pms': cube.total('PMNUM', 'nunique', filters=dept_filter),
+            'complexity': cube.total('complexity_score', 'mean', filters=dept_filter),
+            'craft': cube.total('LABOR_CRAFT', 'mode', filters=dept_filter) or 'N/A'}
+
+
+def monthly_craft_section(craft_filter):
+    monthly_craft = cube.query(['MONTH', 'LABOR_CRAFT'], {'total_labor_hrs': 'sum'}, filters=craft_filter)
+    monthly_craft = monthly_craft.sort_values('MONTH')
+
+    fig1 = px.area(monthly_craft,
+                   x='MONTH',
+                   y='total_labor_hrs',
+                   color='LABOR_CRAFT',
+                   title=f"{selected_dept} - Monthly Labor Hours by Craft",
+                   labels={'total_labor_hours': 'Planned Hours', 'MONTH': 'Month'},
+                   height=400)
+
+    fig1.update_layout(
+        xaxis_tickangle=-45,
+        legend_title_text='Craft',
+        #hovermode='x unified'  # Nice hover effect that shows all crafts at once
+    )
+    return fig1
+
+
+def zone_section(crafts, craft_filter, viz_type):
+    """Location column of the department, its zone summary and the figures of the chosen visualization"""
+    # Determine if this department uses LINE or ZONENAME
+    # Check which has more non-null values for this department
+    line_count = dept_index.count(dept_index.not_null('LINE'))
+    zone_count = dept_index.count(dept_index.not_null('ZONENAME'))
+
+    use_line = line_count > zone_count or selected_dept == 'MACHINING'
+    location_type = 'LINE' if use_line else 'ZONENAME'
+    location_col = 'LINE' if use_line else 'ZONENAME'
+
+    # Filter out null values
+    zone_bits = dept_index.select({'LABOR_CRAFT': crafts}) & dept_index.not_null(location_col)
+    zone = {'location_type': location_type, 'location_col': location_col, 'bits': zone_bits, 'summary': None}
+
+    if dept_index.count(zone_bits) == 0:
+        return zone
+
+    # Aggregate by zone/line
+    zone_summary = cube.query(location_col, {
+        'PMNUM': 'nunique',  # Total unique PMs
+        'COUNTKEY': 'count',  # Total PM occurrences
+        'PLANNED_LABOR_HRS': 'sum',
+        'total_labor_hrs': 'sum'
+    }, filters=craft_filter)
+
+    zone_summary.columns = [location_type, 'Unique PMs', 'Total Occurrences',
+                            'Planned Labor Hrs', 'Total Labor Hrs']
+
+    # FILTER OUT ZEROS
+    zone['summary'] = zone_summary = zone_summary[
+        (zone_summary['Planned Labor Hrs'] > 0) |
+        (zone_summary['Total Labor Hrs'] > 0)
+    ]
+
+    if viz_type == VIZ_OPTIONS[0]:
+        # Heatmap showing both planned and total labor hours
+        fig1 = px.bar(zone_summary,
+                      x=location_type,
+                      y='Total Labor Hrs',
+                      title=f"Total Labor Hours by {location_type}",
+                      color='Total Labor Hrs',
+                      color_continuous_scale='Blues',
+                      labels={'Total Labor Hrs': 'Hours'})
+        fig1.update_layout(xaxis_tickangle=-45)
+        zone['hours'] = fig1
+
+        # Zone Interval Mix
+        zone_interval = cube.query([location_col, 'interval_category'], {'total_labor_hrs': 'sum'},
+                                   filters=craft_filter)
+
+        # Filter out zeros
+        zone_interval = zone_interval[zone_interval['total_labor_hrs'] > 0]
+
+        zone['interval_mix'] = None
+        if not zone_interval.empty:
+            fig2 = px.bar(zone_interval,
+                          x=location_col,
+                          y='total_labor_hrs',
+                          color='interval_category',
+                          title=f"{location_type} Workload by Interval Type",
+                          labels={'total_labor_hrs': 'Total Labor Hours',
+                                  'interval_category': 'Interval'},
+                          barmode='stack',
+                          color_discrete_sequence=px.colors.qualitative.Set2)
+
+            fig2.update_layout(
+                xaxis_tickangle=-45,
+                legend_title_text='Interval Type',
+                height=450
+            )
+            zone['interval_mix'] = fig2
+
+    else:  # Scatter plot
+        fig3 = px.scatter(zone_summary,
+                          x='Total Occurrences',
+                          y='Total Labor Hrs',
+                          size='Unique PMs',
+                          color='Planned Labor Hrs',
+                          hover_name=location_type,
+                          title=f"{location_type} Workload Analysis (bubble size = unique PMs)",
+                          labels={'Total Occurrences': 'PM Occurrences',
+                                  'Total Labor Hrs': 'Total Labor Hours'},
+                          color_continuous_scale='Viridis',
+                          height=500)
+
+        # Add zone/line labels to points
+        fig3.update_traces(textposition='top center')
+        zone['scatter'] = fig3
+
+    return zone
+
+
+def complexity_section(crafts, craft_filter, complexity_level):
+    """KDE of the complexity components, job type mix and complexity levels"""
+    if complexity_level == 'All Levels':
+        complexity_filter = craft_filter
+    else:
+        complexity_filter = {**craft_filter, 'complexity_level': complexity_level}
+
+    # Create KDE line plots (binned KDE, cached per department/craft/complexity selection)
+    fig_kde = go.Figure()
+    densities = complexity_densities(selected_dept, tuple(crafts),
+                                     None if complexity_level == 'All Levels' else complexity_level)
+
+    # Task norm
+    fig_kde.add_trace(go.Scatter(
+        x=KDE_GRID,
+        y=densities['task_norm'],
+        name='Task Count (normalized)',
+        mode='lines',
+        line=dict(color='#81f2e9', width=2),
+        fill='tozeroy',
+        fillcolor='rgba(129, 242, 233, 0.2)'
+    ))
+
+    # Hours norm
+    fig_kde.add_trace(go.Scatter(
+        x=KDE_GRID,
+        y=densities['hours_norm'],
+        name='Labor Hours (normalized)',
+        mode='lines',
+        line=dict(color='#fcd107', width=2),
+        fill='tozeroy',
+        fillcolor='rgba(252, 209, 7, 0.2)'
+    ))
+
+    # Description norm
+    fig_kde.add_trace(go.Scatter(
+        x=KDE_GRID,
+        y=densities['desc_norm'],
+        name='Description Length (normalized)',
+        mode='lines',
+        line=dict(color='#32f58a', width=2),
+        fill='tozeroy',
+        fillcolor='rgba(49, 246, 138, 0.2)'
+    ))
+
+    fig_kde.update_layout(
+        title=f"{selected_dept} - Distribution of Normalized Complexity Components",
+        xaxis_title="Normalized Value (0-1)",
+        yaxis_title="Density",
+        height=350,  # Shorter height
+        #hovermode='x unified',
+        showlegend=True,
+        legend=dict(
+            orientation="h",  # Horizontal legend
+            yanchor="bottom",
+            y=1.02,  # Position above the chart
+            xanchor="center",
+            x=0.5
+        )
+    )
+
+    job_type_dist = cube.value_counts('JOB_TYPE', filters=complexity_filter).reset_index()
+    job_type_dist.columns = ['Job Type', 'Count']
+
+    fig2 = px.pie(job_type_dist,
+                  values='Count',
+                  names='Job Type',
+                  title=f"{selected_dept} - Job Types",
+                  color_discrete_sequence=px.colors.qualitative.Pastel)
+
+    complexity_dist = cube.value_counts('complexity_level', filters=complexity_filter).reset_index()
+    complexity_dist.columns = ['Complexity Level', 'Count']
+
+    # Order by complexity
+    complexity_dist['Complexity Level'] = pd.Categorical(
+        complexity_dist['Complexity Level'],
+        categories=COMPLEXITY_ORDER,
+        ordered=True
+    )
+    complexity_dist = complexity_dist.sort_values('Complexity Level')
+
+    fig3 = px.bar(complexity_dist,
+                  x='Complexity Level',
+                  y='Count',
+                  title=f"{selected_dept} - PM Complexity Levels",
+                  color='Complexity Level',
+                  color_discrete_map=COMPLEXITY_COLORS)
+    return {'kde': fig_kde, 'job_types': fig2, 'levels': fig3}
+
+
+def interval_complexity_section(craft_filter):
+    # Complexity by interval
+    interval_complexity = cube.query('interval_category', {
+        'complexity_score': 'mean',
+        'PMNUM': 'nunique',
+        'PLANNED_LABOR_HRS': 'sum'
+    }, filters=craft_filter)
+    interval_complexity.columns = ['Interval', 'Avg Complexity', 'PM Count', 'Total Hours']
+    interval_complexity = interval_complexity.sort_values('Avg Complexity', ascending=False)
+
+    fig1 = px.bar(interval_complexity,
+                  x='Interval',
+                  y='Avg Complexity',
+                  title=f"{selected_dept} - Average Complexity by Interval",
+                  color='Avg Complexity',
+                  color_continuous_scale='Reds',
+                  text='Avg Complexity')
+
+    fig1.update_traces(texttemplate='%{text:.2f}', textposition='outside')
+    fig1.update_layout(xaxis_tickangle=-45)
+
+    # Hours per PM by interval
+    interval_complexity['Hours per PM'] = interval_complexity['Total Hours'] / interval_complexity['PM Count']
+
+    fig2 = px.bar(interval_complexity,
+                  x='Interval',
+                  y='Hours per PM',
+                  title=f"{selected_dept} - Labor Hours per PM by Interval",
+                  color='Hours per PM',
+                  color_continuous_scale='Blues',
+                  text='Hours per PM')
+
+    fig2.update_traces(texttemplate='%{text:.1f}', textposition='outside')
+    fig2.update_layout(xaxis_tickangle=-45)
+    return fig1, fig2
+
+
+def monthly_interval_section(craft_filter, metric_choice):
+    if metric_choice == "Total Labor Hours":
+        metric_col = 'PLANNED_LABOR_HRS'
+        y_label = 'Labor Assignments'
+    else:
+        metric_col = 'PLANNED_LABORERS'
+        y_label = 'Planned Laborers'
+
+    # Aggregate by month and interval
+    monthly_interval = cube.query(['MONTH', 'interval_category'], {metric_col: 'sum'}, filters=craft_filter)
+    monthly_interval = monthly_interval.sort_values('MONTH')
+
+    fig3 = px.bar(monthly_interval,
+                  x='MONTH',
+                  y=metric_col,
+                  color='interval_category',
+                  title=f"{selected_dept} - Monthly {metric_choice} by Interval Type",
+                  labels={metric_col: y_label, 'interval_category': 'Interval'},
+                  barmode='stack',
+                  height=500)
+
+    fig3.update_layout(
+        xaxis_tickangle=-45,
+        legend_title_text='Interval Type',
+        hovermode='x unified'
+    )
+    return fig3
+
+
+def bottleneck_section(craft_filter):
+    """Busiest months and the interval breakdown table"""
+    # Find months with highest workload by interval type
+    monthly_totals = cube.query('MONTH', {
+        'PLANNED_LABOR_HRS': 'sum',
+        'PLANNED_LABORERS': 'sum',
+        'PMNUM': 'nunique'
+    }, filters=craft_filter)
+    monthly_totals.columns = ['Month', 'Total Hours', 'Labor Assignments', 'PM Count']
+    monthly_totals = monthly_totals.sort_values('Total Hours', ascending=False)
+
+    interval_summary = cube.query('interval_category', {
+        'PMNUM': 'nunique',
+        'COUNTKEY': 'count',
+        'PLANNED_LABOR_HRS': 'sum',
+        'PLANNED_LABORERS': 'sum',
+        'complexity_score': 'mean',
+        'TASK_COUNT': 'mean'
+    }, filters=craft_filter)
+
+    interval_summary.columns = ['Interval', 'Unique PMs', 'Total Occurrences',
+                                'Total Hours', 'Labor Assignments', 'Avg Complexity', 'Avg Tasks']
+    interval_summary['Hours per PM'] = interval_summary['Total Hours'] / interval_summary['Unique PMs']
+    interval_summary = interval_summary.sort_values('Total Hours', ascending=False)
+    return monthly_totals.head(3), interval_summary
+
+
+def interval_breakdown_section():
+    interval_dist = cube.value_counts('interval_category', filters=dept_filter).reset_index()
+    interval_dist.columns = ['Interval Category', 'Count']
+
+    return px.bar(interval_dist,
+                  x='Interval Category',
+                  y='Count',
+                  title=f"{selected_dept} - PM Frequency Distribution",
+                  color='Count',
+                  color_continuous_scale='Blues')
+
+
+# Widget values are read ahead from session state so every section starts computing now;
+# a widget that renders a different value re-submits the sections that depend on it
+crafts_key = f"crafts_{selected_dept}"
+craft_guess = st.session_state.get(crafts_key, available_crafts)
+viz_guess = st.session_state.get('zone_viz', VIZ_OPTIONS[0])
+complexity_guess = st.session_state.get('complexity_filter', 'All Levels')
+if complexity_guess not in complexity_options:
+    complexity_guess = 'All Levels'
+metric_guess = st.session_state.get('interval_metric', METRIC_OPTIONS[0])
+
+sections = pm_sections.SectionScheduler()
+
+
+def submit_craft_sections(crafts):
+    """(Re)starts every section that depends on the craft selection"""
+    craft_filter = {**dept_filter, 'LABOR_CRAFT': crafts}
+    sections.submit("Monthly Labor Hours by Craft", monthly_craft_section, craft_filter)
+    sections.submit("Zone/Line Analysis", zone_section, crafts, craft_filter, viz_guess)
+    sections.submit("Complexity Factor Distributions", complexity_section, crafts, craft_filter, complexity_guess)
+    sections.submit("Interval Complexity", interval_complexity_section, craft_filter)
+    sections.submit("Monthly Interval Stacking", monthly_interval_section, craft_filter, metric_guess)
+    sections.submit("Bottleneck Months", bottleneck_section, craft_filter)
+
+
+sections.submit("KPI cards", kpi_section)
+submit_craft_sections(craft_guess)
+sections.submit("Maintenance Interval Breakdown", interval_breakdown_section)
+
+# KEY METRICS CARDS
+pm_profiler.checkpoint("KPI cards")
+kpi = sections.result("KPI cards")
+col1, col2, col3, col4, col5 = st.columns(5)
+
+with col1:
+    st.metric("Total Hours", f"{kpi['hours']:,.0f}")
+
+with col2:
+    st.metric("Total PMs", f"{kpi['pms']:,}")
+
+with col3:
+    st.metric("Avg Complexity", f"{kpi['complexity']:.2f}")
+
+with col4:
+    st.metric("Primary Craft", kpi['craft'])
+
+with col5:
+    avg_hrs_per_pm = kpi['hours'] / kpi['pms'] if kpi['pms'] > 0 else 0
+    st.metric("Avg Hrs/PM", f"{avg_hrs_per_pm:.1f}")
+
+st.markdown("---")
+
+# MONTHLY FORECAST WITH CRAFT BREAKDOWN =========================================================
+pm_profiler.checkpoint("Monthly Labor Hours by Craft")
+st.subheader("📅 Monthly Labor Hours by Craft")
+
+# Craft filter
+selected_crafts = st.multiselect("Filter by Craft", available_crafts, default=available_crafts, key=crafts_key)
+if selected_crafts != craft_guess:
+    submit_craft_sections(selected_crafts)
+
+craft_bits = dept_index.select({'LABOR_CRAFT': selected_crafts})
+craft_filter = {**dept_filter, 'LABOR_CRAFT': selected_crafts}
+
+pm_profiler.plotly_chart(sections.result("Monthly Labor Hours by Craft"), use_container_width=True)
+
+# COLLAPSIBLE DETAIL DATA
+if st.checkbox("📋 View detailed data", key="monthly_craft_detail"):
+    st.markdown("#### Detailed Monthly Data")
+    
+    # Month filter for detail view
+    all_months_option = ['All Months'] + sorted(dept_index.values('MONTH', craft_bits))
+    selected_month_detail = st.selectbox("Filter by Month", all_months_option, key="month_detail_filter")
+    
+    # Filter data based on selection
+    detail_bits = craft_bits
+    if selected_month_detail != 'All Months':
+        detail_bits = detail_bits & dept_index.level('MONTH', selected_month_detail)
+    
+    # Sorted / searched / paged server-side - only the visible page is built and sent
+    pm_grid.render(detail_grid, dept_index.to_positions(detail_bits), key="monthly_craft_grid")
+
+st.markdown("---")
+
+# ZONE/LINE ANALYSIS (switches based on department) =========================================================
+pm_profiler.checkpoint("Zone/Line Analysis")
+st.subheader("📍 Zone/Line Analysis")
+
+zone = sections.result("Zone/Line Analysis")
+location_type, location_col, zone_bits = zone['location_type'], zone['location_col'], zone['bits']
+
+st.info(f"**{selected_dept}** uses **{location_type}** for location tracking")
+
+if zone['summary'] is None:
+    st.warning(f"No {location_type} data available for this department")
+else:
+    # Visualization choice
+    viz_type = st.radio("Select Visualization", VIZ_OPTIONS, horizontal=True, key="zone_viz")
+    if viz_type != viz_guess:
+        viz_guess = viz_type
+        sections.submit("Zone/Line Analysis", zone_section, selected_crafts, craft_filter, viz_type)
+        zone = sections.result("Zone/Line Analysis")
+    zone_summary = zone['summary']
+    
+    if viz_type == VIZ_OPTIONS[0]:
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            pm_profiler.plotly_chart(zone['hours'], use_container_width=True)
+        
+        with col2:
+            if zone['interval_mix'] is None:
+                st.warning("No interval data available")
+            else:
+                pm_profiler.plotly_chart(zone['interval_mix'], use_container_width=True)
+    
+    else:  # Scatter plot
+        pm_profiler.plotly_chart(zone['scatter'], use_container_width=True)
+    
+    # COLLAPSIBLE ZONE DETAIL DATA
+    if st.checkbox("📋 View zone detailed data", key="zone_detail"):
+        st.markdown("#### Zone/Line Detailed Data")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            # Zone/Line filter
+            all_zones_option = ['All'] + sorted(dept_index.values(location_col, zone_bits))
+            selected_zone_filter = st.selectbox(f"Filter by {location_type}", all_zones_option, key="zone_filter")
+        
+        with col2:
+            # Interval filter
+            all_intervals_option = ['All Intervals'] + sorted(dept_index.values('interval_category', zone_bits))
+            selected_interval_filter = st.selectbox("Filter by Interval", all_intervals_option, key="interval_filter")
+        
+        # Apply filters
+        zone_detail_bits = zone_bits
+        
+        if selected_zone_filter != 'All':
+            zone_detail_bits = zone_detail_bits & dept_index.level(location_col, selected_zone_filter)
+        
+        if selected_interval_filter != 'All Intervals':
+            zone_detail_bits = zone_detail_bits & dept_index.level('interval_category', selected_interval_filter)
+        
+        # Sorted / searched / paged server-side - only the visible page is built and sent
+        pm_grid.render(detail_grid, dept_index.to_positions(zone_detail_bits), key="zone_grid")
+
+    st.markdown("---")
+    
+    # Summary table
+    st.subheader(f"📊 Zone/Line Summary Table")
+    
+    zone_summary_display = zone_summary.sort_values('Total Occurrences', ascending=False)
+    
+    pm_profiler.dataframe(zone_summary_display, use_container_width=True, hide_index=True,
+                 column_config=pm_derive.column_formats({'Planned Labor Hrs': 'hours',
+                                                         'Total Labor Hrs': 'hours'}))
+
+st.markdown("---")
+
+
+# COMPLEXITY FACTOR DISTRIBUTION (KDE)
+pm_profiler.checkpoint("Complexity Factor Distributions")
+st.subheader("📈 Complexity Factor Distributions")
+st.markdown("*Kernel Density Estimation of the three components that make up the complexity score*")
+
+# COMPLEXITY LEVEL FILTER
+selected_complexity_filter = st.selectbox("Filter by Complexity Level", complexity_options, key="complexity_filter")
+if selected_complexity_filter != complexity_guess:
+    complexity_guess = selected_complexity_filter
+    sections.submit("Complexity Factor Distributions", complexity_section,
+                    selected_crafts, craft_filter, selected_complexity_filter)
+
+# Apply complexity filter
+if selected_complexity_filter == 'All Levels':
+    complexity_bits = craft_bits
+else:
+    complexity_bits = craft_bits & dept_index.level('complexity_level', selected_complexity_filter)
+
+complexity = sections.result("Complexity Factor Distributions")
+pm_profiler.plotly_chart(complexity['kde'], use_container_width=True)
+
+# ROW 2: JOB TYPE MIX & COMPLEXITY DISTRIBUTION
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("🔧 Job Type Mix")
+    pm_profiler.plotly_chart(complexity['job_types'], use_container_width=True)
+
+with col2:
+    st.subheader("📊 Complexity Distribution")
+    pm_profiler.plotly_chart(complexity['levels'], use_container_width=True)
+
+# COLLAPSIBLE COMPLEXITY DETAIL DATA
+if st.checkbox("📋 View complexity detailed data", key="complexity_detail"):
+    st.markdown("#### Complexity Detailed Data")
+    
+    # Sorted / searched / paged server-side - only the visible page is built and sent
+    pm_grid.render(detail_grid, dept_index.to_positions(complexity_bits), key="complexity_grid",
+                   note=f" (filtered by: {selected_complexity_filter})")
+
+st.markdown("---")
+
+# INTERVAL FREQUENCY ANALYSIS ===============================================================
+pm_profiler.checkpoint("Maintenance Interval Deep Dive")
+st.subheader("⏰ Maintenance Interval Deep Dive")
+
+# INTERVAL VS COMPLEXITY
+st.markdown("#### Interval Complexity Analysis")
+
+fig1, fig2 = sections.result("Interval Complexity")
+col1, col2 = st.columns(2)
+
+with col1:
+    pm_profiler.plotly_chart(fig1, use_container_width=True)
+
+with col2:
+    pm_profiler.plotly_chart(fig2, use_container_width=True)
+
+st.markdown("---")
+
+# MONTHLY INTERVAL STACKING - LABOR HOURS
+st.markdown("#### Monthly Labor Bottleneck Analysis")
+st.markdown("*How do different interval types stack up month-to-month?*")
+
+# Toggle between labor hours and laborers
+metric_choice = st.radio("View by:", METRIC_OPTIONS, horizontal=True, key="interval_metric")
+if metric_choice != metric_guess:
+    metric_guess = metric_choice
+    sections.submit("Monthly Interval Stacking", monthly_interval_section, craft_filter, metric_choice)
+
+pm_profiler.plotly_chart(sections.result("Monthly Interval Stacking"), use_container_width=True)
+
+st.markdown("---")
+
+# BOTTLENECK IDENTIFICATION
+st.markdown("#### 🚨 Potential Bottleneck Months")
+
+top_months, interval_summary = sections.result("Bottleneck Months")
+
+# Top 3 bottleneck months
+pm_profiler.checkpoint("Top 3 bottleneck months")
+col1, col2, col3 = st.columns(3)
+
+for idx, (i, row) in enumerate(top_months.iterrows()):
+    with [col1, col2, col3][idx]:
+        st.metric(
+            label=f"#{idx+1}: {row['Month']}",
+            value=f"{row['Total Hours']:,.0f} hrs",
+            delta=f"{row['Labor Assignments']:.0f} assignments | {row['PM Count']} PMs"
+        )
+
+st.markdown("---")
+
+# INTERVAL MIX TABLE
+st.markdown("#### 📊 Interval Breakdown Table")
+
+# Format for display
+pm_profiler.dataframe(interval_summary, use_container_width=True, hide_index=True,
+             column_config=pm_derive.column_formats({'Total Hours': 'hours',
+                                                     'Labor Assignments': 'hours',
+                                                     'Hours per PM': 'ratio',
+                                                     'Avg Complexity': 'score',
+                                                     'Avg Tasks': 'ratio'}))
+
+# INTERVAL BREAKDOWN
+pm_profiler.checkpoint("Maintenance Interval Breakdown")
+st.subheader("⏰ Maintenance Interval Breakdown")
+
+pm_profiler.plotly_chart(sections.result("Maintenance Interval Breakdown"), use_container_width=True)
+
+sections.finish()
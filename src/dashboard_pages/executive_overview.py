@@ -0,0 +1,128 @@
+# =============================================================================
+# PAGE 1: EXECUTIVE OVERVIEW
+# =============================================================================
+import streamlit as st
+import plotly.express as px
+
+import pm_derive
+import pm_profiler
+from pm_data import cached_figure, cached_result, load_cube
+
+pm_profiler.checkpoint("Page setup")
+
+# No filters on this page - every figure and table is built once per dataset version
+# (cached_figure / cached_result) and later visits only send it
+cube = load_cube()
+
+st.title("🏭 Executive Overview - Plant-Wide PM Forecast")
+st.markdown("*12-Month Preventive Maintenance Outlook*")
+st.markdown("---")
+
+# TOP KPI CARDS
+def kpis():
+    return {'total_hours': cube.total('PLANNED_LABOR_HRS'),
+            'total_pms': cube.total('PMNUM', 'nunique'),
+            'avg_complexity': cube.total('complexity_score', 'mean'),
+            'dept_count': cube.total('DEPT_NAME', 'nunique')}
+
+kpi = cached_result('executive/kpis', kpis)
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    st.metric("Total Planned Hours", f"{kpi['total_hours']:,.0f}")
+
+with col2:
+    st.metric("Total PMs", f"{kpi['total_pms']:,}")
+
+with col3:
+    st.metric("Avg Complexity Score", f"{kpi['avg_complexity']:.2f}")
+
+with col4:
+    st.metric("Departments", f"{kpi['dept_count']}")
+
+st.markdown("---")
+
+# MONTHLY LABOR HOURS TREND (Stacked by Department)
+pm_profiler.checkpoint("Monthly Labor Hours by Department")
+st.subheader("📊 Monthly Labor Hours by Department")
+
+def monthly_dept_figure():
+    monthly_dept = cube.query(['MONTH', 'DEPT_NAME'], {'PLANNED_LABOR_HRS': 'sum'})
+    monthly_dept = monthly_dept.sort_values('MONTH')
+
+    fig1 = px.bar(monthly_dept,
+                  x='MONTH',
+                  y='PLANNED_LABOR_HRS',
+                  color='DEPT_NAME',
+                  title="Monthly Planned Labor Hours - All Departments",
+                  labels={'PLANNED_LABOR_HRS': 'Planned Hours', 'MONTH': 'Month'},
+                  barmode='stack',
+                  height=500)
+
+    fig1.update_layout(xaxis_tickangle=-45, legend_title_text='Department')
+    return fig1
+
+pm_profiler.plotly_chart(cached_figure('executive/monthly_dept', monthly_dept_figure), use_container_width=True)
+
+st.markdown("---")
+
+# DEPARTMENT COMPARISON TABLE
+pm_profiler.checkpoint("Department Comparison")
+st.subheader("📋 Department Comparison")
+
+def department_summary():
+    dept_summary = cube.query('DEPT_NAME', {
+        'PLANNED_LABOR_HRS': 'sum',
+        'PMNUM': 'nunique',
+        'complexity_score': 'mean',
+        'LABOR_CRAFT': 'mode'
+    })
+    dept_summary['LABOR_CRAFT'] = dept_summary['LABOR_CRAFT'].fillna('N/A')
+
+    dept_summary.columns = ['Department', 'Total Hours', 'PM Count', 'Avg Complexity', 'Primary Craft']
+    dept_summary['Avg Hours/PM'] = dept_summary['Total Hours'] / dept_summary['PM Count']
+    return dept_summary.sort_values('Total Hours', ascending=False)
+
+dept_summary = cached_result('executive/dept_summary', department_summary)
+
+# Format for display (formatted by the grid - values stay numeric)
+pm_profiler.dataframe(dept_summary, use_container_width=True, hide_index=True,
+             column_config=pm_derive.column_formats({'Total Hours': 'hours',
+                                                     'Avg Hours/PM': 'ratio',
+                                                     'Avg Complexity': 'score'}))
+
+st.markdown("---")
+
+# SCOPE TYPE BREAKDOWN
+pm_profiler.checkpoint("Scope Type Distribution")
+st.subheader("🎯 Scope Type Distribution")
+
+col1, col2 = st.columns(2)
+
+def scope_figure():
+    scope_counts = cube.value_counts('PMSCOPETYPE').reset_index()
+    scope_counts.columns = ['Scope Type', 'Count']
+
+    return px.pie(scope_counts,
+                  values='Count',
+                  names='Scope Type',
+                  title="PM Distribution by Scope Type",
+                  color_discrete_sequence=px.colors.qualitative.Set3)
+
+def job_type_figure():
+    # Job type breakdown
+    job_counts = cube.value_counts('JOB_TYPE').head(10).reset_index()
+    job_counts.columns = ['Job Type', 'Count']
+
+    return px.bar(job_counts,
+                  x='Count',
+                  y='Job Type',
+                  orientation='h',
+                  title="Top 10 Job Types",
+                  color_discrete_sequence=['#636EFA'])
+
+with col1:
+    pm_profiler.plotly_chart(cached_figure('executive/scope', scope_figure), use_container_width=True)
+
+with col2:
+    pm_profiler.plotly_chart(cached_figure('executive/job_types', job_type_figure), use_container_width=True)
@@ -0,0 +1,229 @@
+# =============================================================================
+# PAGE 4: OPERATIONAL INSIGHTS
+# =============================================================================
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+import pm_derive
+import pm_profiler
+from pm_data import cached_figure, cached_result, load_cube
+
+pm_profiler.checkpoint("Page setup")
+
+# No filters on this page - every figure and table is built once per dataset version
+# (cached_figure / cached_result) and later visits only send it
+cube = load_cube()
+
+st.title("💡 Operational Insights")
+st.markdown("*Strategic patterns across maintenance operations*")
+st.markdown("---")
+
+# INTERVAL PATTERNS
+pm_profiler.checkpoint("Maintenance Interval Patterns")
+st.subheader("⏰ Maintenance Interval Patterns")
+
+col1, col2 = st.columns(2)
+
+def interval_summary():
+    # Interval distribution
+    interval_dist = cube.value_counts('interval_category').reset_index()
+    interval_dist.columns = ['Interval Category', 'PM Count']
+
+    # Calculate labor hours by interval
+    interval_hours = cube.query('interval_category', {'PLANNED_LABOR_HRS': 'sum'})
+    interval_hours.columns = ['Interval Category', 'Total Hours']
+
+    summary = interval_dist.merge(interval_hours, on='Interval Category')
+    return summary.sort_values('PM Count', ascending=False)
+
+def interval_count_figure():
+    fig1 = px.bar(cached_result('operational/interval_summary', interval_summary),
+                  x='Interval Category',
+                  y='PM Count',
+                  title="PM Distribution by Frequency",
+                  color='Total Hours',
+                  color_continuous_scale='Blues',
+                  labels={'PM Count': 'Number of PMs'})
+
+    fig1.update_layout(xaxis_tickangle=-45)
+    return fig1
+
+def interval_hours_figure():
+    # Hours distribution by interval
+    return px.pie(cached_result('operational/interval_summary', interval_summary),
+                  values='Total Hours',
+                  names='Interval Category',
+                  title="Labor Hours by Interval Type",
+                  color_discrete_sequence=px.colors.sequential.RdBu)
+
+with col1:
+    pm_profiler.plotly_chart(cached_figure('operational/interval_counts', interval_count_figure),
+                             use_container_width=True)
+
+with col2:
+    pm_profiler.plotly_chart(cached_figure('operational/interval_hours', interval_hours_figure),
+                             use_container_width=True)
+
+st.markdown("---")
+
+# CRAFT UTILIZATION ACROSS DEPARTMENTS
+pm_profiler.checkpoint("Craft Utilization Across Departments")
+st.subheader("🔧 Craft Utilization Across Departments")
+
+def craft_heatmap_figure():
+    # Craft x Department heatmap
+    craft_dept = cube.query(['DEPT_NAME', 'LABOR_CRAFT'], {'PLANNED_LABOR_HRS': 'sum'})
+    craft_dept_pivot = craft_dept.pivot(index='LABOR_CRAFT', columns='DEPT_NAME', values='PLANNED_LABOR_HRS').fillna(0)
+
+    fig3 = px.imshow(craft_dept_pivot,
+                     labels=dict(x="Department", y="Craft", color="Planned Hours"),
+                     title="Craft Utilization Heatmap - Hours by Department & Craft",
+                     color_continuous_scale='Viridis',
+                     aspect="auto",
+                     height=500)
+
+    fig3.update_xaxes(side="bottom", tickangle=-45)
+    return fig3
+
+pm_profiler.plotly_chart(cached_figure('operational/craft_heatmap', craft_heatmap_figure), use_container_width=True)
+
+st.markdown("---")
+
+# ASSET VS LOCATION SCOPE PREFERENCES
+pm_profiler.checkpoint("Asset vs Location Scope Preferences")
+st.subheader("🎯 Asset vs Location Scope Preferences")
+
+col1, col2 = st.columns(2)
+
+def scope_figure():
+    # Overall scope distribution
+    scope_dist = cube.value_counts('PMSCOPETYPE').reset_index()
+    scope_dist.columns = ['Scope Type', 'Count']
+
+    return px.pie(scope_dist,
+                  values='Count',
+                  names='Scope Type',
+                  title="Overall Scope Distribution",
+                  color_discrete_sequence=['#FF6B6B', '#4ECDC4'])
+
+def asset_focus_figure():
+    # Scope by department
+    scope_dept = cube.query(['DEPT_NAME', 'PMSCOPETYPE'], {'Count': 'count'})
+    scope_dept_pivot = scope_dept.pivot(index='DEPT_NAME', columns='PMSCOPETYPE', values='Count').fillna(0)
+
+    # Calculate percentage
+    scope_dept_pivot['Asset %'] = (scope_dept_pivot.get('ASSET', 0) /
+                                   (scope_dept_pivot.get('ASSET', 0) + scope_dept_pivot.get('LOCATION', 0)) * 100)
+    scope_dept_pivot = scope_dept_pivot.sort_values('Asset %', ascending=False).reset_index()
+
+    fig5 = px.bar(scope_dept_pivot,
+                  x='DEPT_NAME',
+                  y='Asset %',
+                  title="Department Asset-Focus Ranking",
+                  labels={'Asset %': 'Asset Focus %', 'DEPT_NAME': 'Department'},
+                  color='Asset %',
+                  color_continuous_scale='RdYlGn')
+
+    fig5.update_layout(xaxis_tickangle=-45)
+    return fig5
+
+with col1:
+    pm_profiler.plotly_chart(cached_figure('operational/scope', scope_figure), use_container_width=True)
+
+with col2:
+    pm_profiler.plotly_chart(cached_figure('operational/asset_focus', asset_focus_figure), use_container_width=True)
+
+st.markdown("---")
+
+# TASK COMPLEXITY TRENDS
+pm_profiler.checkpoint("Task Complexity Analysis")
+st.subheader("📈 Task Complexity Analysis")
+
+col1, col2 = st.columns(2)
+
+def complexity_dept_figure():
+    # Complexity by department
+    complexity_dept = cube.query('DEPT_NAME', {'complexity_score': 'mean'})
+    complexity_dept.columns = ['Department', 'Avg Complexity Score']
+    complexity_dept = complexity_dept.sort_values('Avg Complexity Score', ascending=False)
+
+    return px.bar(complexity_dept,
+                  x='Avg Complexity Score',
+                  y='Department',
+                  orientation='h',
+                  title="Average Complexity by Department",
+                  color='Avg Complexity Score',
+                  color_continuous_scale='Reds')
+
+def complexity_level_figure():
+    # Complexity level distribution
+    complexity_level_dist = cube.value_counts('complexity_level').reset_index()
+    complexity_level_dist.columns = ['Complexity Level', 'Count']
+
+    # Order properly
+    complexity_order = ['Low', 'Medium', 'High', 'Very High']
+    complexity_level_dist['Complexity Level'] = pd.Categorical(
+        complexity_level_dist['Complexity Level'],
+        categories=complexity_order,
+        ordered=True
+    )
+    complexity_level_dist = complexity_level_dist.sort_values('Complexity Level')
+
+    return px.bar(complexity_level_dist,
+                  x='Complexity Level',
+                  y='Count',
+                  title="PM Distribution by Complexity Level",
+                  color='Complexity Level',
+                  color_discrete_map={'Low': '#90EE90', 'Medium': '#FFD700',
+                                      'High': '#FFA500', 'Very High': '#FF6347'})
+
+with col1:
+    pm_profiler.plotly_chart(cached_figure('operational/complexity_dept', complexity_dept_figure),
+                             use_container_width=True)
+
+with col2:
+    pm_profiler.plotly_chart(cached_figure('operational/complexity_levels', complexity_level_figure),
+                             use_container_width=True)
+
+st.markdown("---")
+
+# JOB TYPE INSIGHTS
+pm_profiler.checkpoint("Job Type Distribution")
+st.subheader("🏗️ Job Type Distribution")
+
+def job_type_summary():
+    summary = cube.query('JOB_TYPE', {
+        'PMNUM': 'nunique',
+        'PLANNED_LABOR_HRS': 'sum',
+        'complexity_score': 'mean'
+    })
+
+    summary.columns = ['Job Type', 'PM Count', 'Total Hours', 'Avg Complexity']
+    return summary.sort_values('Total Hours', ascending=False).head(15)
+
+job_types = cached_result('operational/job_type_summary', job_type_summary)
+
+def job_type_figure():
+    return px.scatter(job_types,
+                      x='PM Count',
+                      y='Total Hours',
+                      size='Avg Complexity',
+                      color='Avg Complexity',
+                      hover_name='Job Type',
+                      title="Job Type Analysis - Count vs Hours (bubble size = complexity)",
+                      labels={'PM Count': 'Number of PMs', 'Total Hours': 'Total Labor Hours'},
+                      color_continuous_scale='Plasma',
+                      height=500)
+
+pm_profiler.plotly_chart(cached_figure('operational/job_types', job_type_figure), use_container_width=True)
+
+st.markdown("---")
+
+# KEY INSIGHTS TABLE
+pm_profiler.checkpoint("Summary Statistics by Job Type")
+st.subheader("📊 Summary Statistics by Job Type")
+
+pm_profiler.dataframe(job_types, use_container_width=True, hide_index=True,
+             column_config=pm_derive.column_formats({'Total Hours': 'hours',
+                                                     'Avg Complexity': 'score'}))
@@ -0,0 +1,340 @@
+# ============================================================================
+# PAGE 5: Plan vs Execution 
+# ============================================================================
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+import pm_charts
+import pm_derive
+import pm_distinct
+import pm_profiler
+from pm_data import (PAGE_COLUMNS, load_path2, load_path2_index, load_path2_pm, load_path2_pm_index,
+                     load_path2_pm_table)
+
+pm_profiler.checkpoint("Page setup")
+
+# KPIs, charts and tables read the PM-grain table (each PM counted once - it has a row per
+# dept / interval / job type / craft it works under, so it matches a filter on any of them);
+# the occurrence rows are only needed for the monthly trend
+pms = load_path2_pm()
+pms_index = load_path2_pm_index()
+path2 = load_path2(PAGE_COLUMNS["Plan vs Execution"])
+path2_index = load_path2_index()
+pm_table = load_path2_pm_table()
+
+st.title("📊 Plan vs Execution")
+st.markdown("*How well do our PM plans match reality?*")
+
+st.info("""
+This dashboard compares **planned vs actual labor performance** across PMs, 
+departments, intervals, and job types. Use the filters below and in the sidebar 
+to explore planning accuracy patterns and execution discipline.
+""")
+
+# Filters 
+st.markdown("### Filters")
+
+col_f1, col_f2, col_f3 = st.columns(3)
+
+with col_f1:
+    dept_filter = st.multiselect(
+        "Department", 
+        options=sorted(pms_index.bitmaps['DEPT_NAME']), 
+        default=[])
+
+with col_f2:
+    interval_filter = st.multiselect(
+        "Interval",
+        options=sorted(pms_index.bitmaps['INTERVAL']),
+        default=[])
+
+with col_f3:
+    job_type_filter = st.multiselect(
+        "Job Type", 
+        options=sorted(pms_index.bitmaps['JOB_TYPE']),
+        default=[])
+
+# Apply Filters - bitmaps AND together, then the selected rows are taken in one go
+path2_selection = {col: values for col, values in [('DEPT_NAME', dept_filter),
+                                                    ('INTERVAL', interval_filter),
+                                                    ('JOB_TYPE', job_type_filter)] if values}
+if path2_selection:
+    pm_filtered = pms.iloc[pms_index.positions(path2_selection)]
+    path2_filtered = path2.iloc[path2_index.positions(path2_selection)]
+else:
+    pm_filtered = pms
+    path2_filtered = path2
+pm_filtered = pm_filtered.drop_duplicates('PMNUM')
+
+if pm_filtered.empty:
+    st.warning("No data for selected filters.")
+    st.stop()
+
+# KPIs 
+st.markdown('### Overall Performance')
+
+fail_threshold = 0.75
+
+avg_completion = pm_filtered['completion_rate'].mean()
+avg_ontime = pm_filtered['on_time_rate'].mean()
+avg_bias_hrs = (pm_filtered['AVG_ACTUAL_HRS'] - pm_filtered['AVG_PLANNED_HRS']).mean()
+failing_pm_count = (pm_filtered['completion_rate'] < fail_threshold).sum()
+total_pm_count = len(pm_filtered)
+
+pm_profiler.checkpoint("KPI cards")
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    st.metric("Avg Completion Rate", f"{avg_completion:.1%}")
+
+with col2: 
+    st.metric("Avg On-Time Rate", f"{avg_ontime:.1%}")
+
+with col3:
+    st.metric("Avg Hour Bias (Actual - Planned)", f"{avg_bias_hrs:.2f} hrs")
+
+with col4: 
+    st.metric("Failing PMs (<75% complete)", f"{failing_pm_count} of {total_pm_count}")
+
+st.write(f"Showing **{total_pm_count:,}** unique PMs based on selected filters.")
+st.success("Execution looks **reasonably strong overall**, but specific departments and categories show opportunities to reduce bias.")
+
+# Highlight message depending on average completion (use success/warning dynamically)
+if avg_completion >= 0.80:
+    st.success("Execution looks strong overall based on selected filters.")
+elif avg_completion >= 0.60:
+    st.warning("Execution shows moderate variation; improvement opportunities exist.")
+else:
+    st.error("Execution appears weak under current filters; many PMs are failing to meet expectations.")
+
+st.divider()
+
+# Failing threshold and worst PMs
+st.markdown("### 🚨 Problem PMs")
+
+fail_threshold = st.slider("Completion Rate Threshold for 'Failing' PMs",
+                           min_value=0.0,
+                           max_value=1.0,
+                           value=0.75,
+                           step=0.05)
+
+failing = pm_filtered[pm_filtered['completion_rate'] < fail_threshold]
+
+if failing.empty:
+    st.info("No PMs below the selected completion threshold.")
+else:
+    # Rank by completion then by hour deviation
+    failing['rank'] = failing['completion_rate'].rank(method='first')
+    worst_pms = (failing
+        .sort_values(['completion_rate', 'hour_deviation_pct'])
+        [['PMNUM', 'DEPT_NAME', 'INTERVAL', 'JOB_TYPE','completion_rate', 'on_time_rate',
+          'AVG_PLANNED_HRS', 'AVG_ACTUAL_HRS', 'hour_deviation_pct']]
+        .head(25))
+
+    # format %
+    pm_profiler.dataframe(worst_pms, use_container_width=True, hide_index=True,
+                 column_config=pm_derive.column_formats({'completion_rate': 'percent',
+                                                         'on_time_rate': 'percent',
+                                                         'hour_deviation_pct': 'ratio'}))
+    st.caption("Worst-performing PMs based on the selected completion threshold, sorted by completion rate and hour deviation.")
+
+    # Row-level drill-down - only this PM's forecast occurrences are read
+    if st.checkbox("🔎 Show forecast occurrences for a PM", key="pm_drilldown"):
+        drill_pm = st.selectbox("PM", worst_pms['PMNUM'].tolist(), key="pm_drilldown_pm")
+        pm_profiler.dataframe(load_path2(filters={'PMNUM': drill_pm}), use_container_width=True, hide_index=True)
+
+st.divider()
+
+# Execution aggregates (pm_table answers them in pandas or DuckDB) -> table column names
+EXECUTION_COLUMNS = {'completion_rate': 'avg_completion', 'on_time_rate': 'avg_ontime',
+                     'hour_deviation_pct': 'avg_hour_dev_pct', 'PMNUM': 'n_pm'}
+
+# Department execution
+pm_profiler.checkpoint("Department Execution Discipline")
+st.subheader("🏭 Department Execution Discipline")
+
+dept_exec = (pm_table.query('DEPT_NAME', {'completion_rate': 'mean',
+                                         'on_time_rate': 'mean',
+                                         'PMNUM': 'nunique'}, filters=path2_selection)
+             .rename(columns=EXECUTION_COLUMNS))
+
+# Sort by Completion rate
+dept_exec = dept_exec.sort_values('avg_completion')
+
+fig_dept = px.bar(dept_exec,
+                  x='avg_completion',
+                  y='DEPT_NAME', 
+                  orientation='h',
+                  color='avg_completion',
+                  color_continuous_scale='RdYlGn', 
+                  labels={'avg_completion': 'Avg Completion Rate', 'DEPT_NAME': 'Department'},
+                  title='Completion Rate by Department')
+
+fig_dept.update_layout(xaxis_tickformat='.0%')
+pm_profiler.plotly_chart(fig_dept, use_container_width=True)
+st.caption("Departments toward the top with higher completion and greener shading show stronger execution discipline.")
+
+
+with st.expander('Show department table'):
+    pm_profiler.dataframe(dept_exec, use_container_width=True, hide_index=True,
+                 column_config=pm_derive.column_formats({'avg_completion': 'percent',
+                                                         'avg_ontime': 'percent'}))
+
+st.divider()
+
+# Accuracy by chosen category
+pm_profiler.checkpoint("Accuracy by Category")
+st.subheader("🎯 Accuracy by Category")
+
+category = st.selectbox("Group by:",
+                        options=['INTERVAL', 'JOB_TYPE', 'LABOR_CRAFT'])
+
+cat_summary = (pm_table.query(category, {'completion_rate': 'mean',
+                                        'on_time_rate': 'mean',
+                                        'hour_deviation_pct': 'mean',
+                                        'PMNUM': 'nunique'}, filters=path2_selection)
+    .rename(columns=EXECUTION_COLUMNS)
+    .sort_values('avg_completion'))
+
+fig_cat = px.bar(cat_summary,
+                 x='avg_completion',
+                 y=category,
+                 orientation='h',
+                 color='avg_hour_dev_pct',
+                 color_continuous_scale='RdYlGn_r',
+                 labels={'avg_completion': 'Avg Completion Rate',
+                         'avg_hour_dev_pct': 'Avg Hour Deviation %',
+                         category: category.replace('_', ' ').title()},
+                 title=f"Completion & Bias by {category.replace('_', ' ').title()}")
+
+fig_cat.update_layout(xaxis_tickformat=".0%")
+pm_profiler.plotly_chart(fig_cat, use_container_width=True)
+st.caption("Use this view to see which intervals, job types, or crafts have lower completion or higher planning bias.")
+
+with st.expander("Show category table"):
+    pm_profiler.dataframe(cat_summary, use_container_width=True, hide_index=True,
+                 column_config=pm_derive.column_formats({'avg_completion': 'percent',
+                                                         'avg_ontime': 'percent',
+                                                         'avg_hour_dev_pct': 'ratio'}))
+
+st.divider()
+
+# Planning Bias
+pm_profiler.checkpoint("Planning Bias – Planned vs Actual Labor Hours")
+st.subheader("📐 Planning Bias – Planned vs Actual Labor Hours")
+
+col_left, col_right = st.columns(2)
+
+with col_left:
+    fig_hist = px.histogram(pm_filtered,
+                            x='hour_deviation_pct',
+                            nbins=40,
+                            title="Distribution of Hour Deviation % (Actual vs Planned)",
+                            labels={'hour_deviation_pct': 'Hour Deviation %'})
+    
+    fig_hist.add_vline(x=0, line_dash="dash")
+    pm_profiler.plotly_chart(fig_hist, use_container_width=True)
+    st.caption("Bars to the right of 0 indicate overruns (actual > planned); bars to the left indicate underruns.")
+
+
+with col_right:
+    # One point per PM, or a density view when too many PMs are selected
+    fig_scatter = pm_charts.pm_scatter(pm_filtered,
+                             x='AVG_PLANNED_HRS',
+                             y='AVG_ACTUAL_HRS',
+                             color='performance_tier',
+                             hover_data=['PMNUM', 'DEPT_NAME', 'INTERVAL'],
+                             title="Planned vs Actual Hours by PM",
+                             labels={'AVG_PLANNED_HRS': 'Planned Hours', 'AVG_ACTUAL_HRS': 'Actual Hours', 'performance_tier': 'Preformance Tier'})
+    
+    fig_scatter.add_shape(type="line",
+                          x0=0, y0=0,
+                          x1=pm_filtered['AVG_PLANNED_HRS'].max(),
+                          y1=pm_filtered['AVG_PLANNED_HRS'].max(),
+                          line=dict(dash="dash"))
+    
+    pm_profiler.plotly_chart(fig_scatter, use_container_width=True)
+    st.caption("Points far from the dashed line highlight PMs with large planning bias (over- or under-estimated hours).")
+
+st.divider()
+
+# Failing vs Successful PM
+pm_profiler.checkpoint("Failing vs Successful PM Characteristics")
+st.subheader("🧪 Failing vs Successful PM Characteristics")
+
+failing = pm_filtered[pm_filtered['completion_rate'] < fail_threshold]
+successful = pm_filtered[pm_filtered['completion_rate'] >= fail_threshold]
+
+comp_df = pd.DataFrame({'Group': ['Failing PMs', 'Successful PMs'],
+                        'Avg Planned Hours': [failing['AVG_PLANNED_HRS'].mean(),
+                                              successful['AVG_PLANNED_HRS'].mean()],
+                        'Avg Actual Hours': [failing['AVG_ACTUAL_HRS'].mean(),
+                                             successful['AVG_ACTUAL_HRS'].mean()],
+                        'Avg Hour Deviation %': [failing['hour_deviation_pct'].mean(),
+                                                 successful['hour_deviation_pct'].mean()],
+                        'Avg Complexity Score': [failing['complexity_score'].mean(),
+                                                 successful['complexity_score'].mean()],
+                        'Count of PMs': [pm_distinct.count(failing['PMNUM']),
+                                         pm_distinct.count(successful['PMNUM'])]})
+
+pm_profiler.dataframe(comp_df, use_container_width=True, hide_index=True)
+st.caption("Compare how complexity, planned vs actual hours, and deviation differ between failing and successful PMs.")
+
+st.divider()
+
+# Monthly trends in completion 
+pm_profiler.checkpoint("Monthly Trends in Completion & On-Time Performance")
+st.subheader("🕒 Monthly Trends in Completion & On-Time Performance")
+
+monthly = (path2_filtered
+    .groupby('due_month', observed=True)
+    .agg(avg_completion=('completion_rate', 'mean'),
+         avg_ontime=('on_time_rate', 'mean'))
+    .assign(total_pm=pm_distinct.groupby_count(path2_filtered, 'due_month', 'PMNUM'))
+    .reset_index()
+    .sort_values('due_month'))
+
+fig_trend = px.line(monthly,
+                    x='due_month',
+                    y=['avg_completion', 'avg_ontime'],
+                    labels={'value': 'Rate', 'due_month': 'Month', 'variable': 'Metric'},
+                    title="Monthly Completion vs On-Time Rate")
+
+fig_trend.update_layout(yaxis_tickformat=".0%")
+pm_profiler.plotly_chart(fig_trend, use_container_width=True)
+st.caption("Use this view to spot seasonal patterns, ramp-up periods, or sustained improvements/declines in execution performance.")
+
+with st.expander("Show monthly table"):
+    pm_profiler.dataframe(monthly, use_container_width=True, hide_index=True,
+                 column_config=pm_derive.column_formats({'avg_completion': 'percent',
+                                                         'avg_ontime': 'percent'}))
+
+st.divider()
+
+# Complexity vs completion 
+pm_profiler.checkpoint("Complexity vs Completion Rate")
+st.subheader("🧩 Complexity vs Completion Rate")
+
+fig_complex = pm_charts.pm_scatter(pm_filtered,
+                         x='complexity_score',
+                         y='completion_rate',
+                         color='performance_tier',
+                         hover_data=['PMNUM', 'DEPT_NAME', 'INTERVAL', 'JOB_TYPE'],
+                         labels={'complexity_score': 'Complexity Score',
+                                 'completion_rate': 'Completion Rate',
+                                 'performance_tier': 'Performance Tier'},
+                         title="Completion vs Complexity")
+
+fig_complex.update_layout(yaxis_tickformat=".0%")
+pm_profiler.plotly_chart(fig_complex, use_container_width=True)
+st.caption("Helps identify whether low-complexity PMs are failing (process issue) or failures are concentrated in high-complexity work (expected risk).")
+
+# Download filtered data (every column - only read when the button is clicked)
+def filtered_csv():
+    return load_path2(filters=path2_selection or None).to_csv(index=False).encode('utf-8')
+
+st.download_button(label="📥 Download filtered Path 2 data (CSV)",
+                   data=filtered_csv,
+                   file_name="path2_filtered.csv",
+                   mime="text/csv")
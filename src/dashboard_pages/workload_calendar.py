@@ -0,0 +1,246 @@
+# =============================================================================
+# PAGE 3: WORKLOAD CALENDAR
+# =============================================================================
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+import pm_derive
+import pm_profiler
+import pm_schedule
+from pm_data import default_capacity, leveled_schedule, load_cube, weekly_workload
+
+pm_profiler.checkpoint("Page setup")
+
+cube = load_cube()
+
+st.title("📅 Workload Calendar Heatmap")
+st.markdown("*Visualize PM density and identify scheduling bottlenecks*")
+st.markdown("---")
+
+# FILTERS IN SIDEBAR
+st.sidebar.header("Calendar Filters")
+
+# Department filter
+dept_options = ['All Departments'] + cube.values('DEPT_NAME')
+selected_dept_cal = st.sidebar.selectbox("Department", dept_options, key="cal_dept")
+
+# Craft filter
+craft_options = ['All Crafts'] + cube.values('LABOR_CRAFT')
+selected_craft_cal = st.sidebar.selectbox("Craft", craft_options, key="cal_craft")
+
+# Complexity filter
+complexity_options = ['All Levels'] + cube.values('complexity_level')
+selected_complexity = st.sidebar.selectbox("Complexity Level", complexity_options, key="cal_complexity")
+
+# Filter data
+cal_filter = {}
+
+if selected_dept_cal != 'All Departments':
+    cal_filter['DEPT_NAME'] = selected_dept_cal
+
+if selected_craft_cal != 'All Crafts':
+    cal_filter['LABOR_CRAFT'] = selected_craft_cal
+
+if selected_complexity != 'All Levels':
+    cal_filter['complexity_level'] = selected_complexity
+
+# Monthly hours (used by the metrics and the heatmap)
+monthly_hours = cube.query('MONTH', {'PLANNED_LABOR_HRS': 'sum'}, filters=cal_filter)
+
+# SUMMARY METRICS
+pm_profiler.checkpoint("KPI cards")
+col1, col2, col3 = st.columns(3)
+
+with col1:
+    total_hours = cube.total('PLANNED_LABOR_HRS', filters=cal_filter)
+    st.metric("Total Planned Hours", f"{total_hours:,.0f}")
+
+with col2:
+    total_pms = cube.total('PMNUM', 'nunique', filters=cal_filter)
+    st.metric("Total PMs", f"{total_pms:,}")
+
+with col3:
+    peak_month = monthly_hours.set_index('MONTH')['PLANNED_LABOR_HRS'].idxmax()
+    st.metric("Peak Month", peak_month)
+
+st.markdown("---")
+
+# MONTHLY HEATMAP
+pm_profiler.checkpoint("Monthly Labor Hours Heatmap")
+st.subheader("🔥 Monthly Labor Hours Heatmap")
+
+monthly_hours = monthly_hours.sort_values('MONTH')
+
+# Create heatmap-style visualization
+fig1 = px.bar(monthly_hours,
+              x='MONTH',
+              y='PLANNED_LABOR_HRS',
+              title="Monthly Workload Distribution",
+              labels={'PLANNED_LABOR_HRS': 'Planned Hours', 'MONTH': 'Month'},
+              color='PLANNED_LABOR_HRS',
+              color_continuous_scale='YlOrRd',  # Yellow to Red heat colors
+              height=400)
+
+fig1.update_layout(xaxis_tickangle=-45)
+pm_profiler.plotly_chart(fig1, use_container_width=True)
+
+st.markdown("---")
+
+# WEEKLY BREAKDOWN (More granular view)
+pm_profiler.checkpoint("Weekly Workload Breakdown")
+st.subheader("📊 Weekly Workload Breakdown")
+
+weekly_hours = weekly_workload(cal_filter.get('DEPT_NAME'),
+                               cal_filter.get('LABOR_CRAFT'),
+                               cal_filter.get('complexity_level'))
+
+# Limit to first 52 weeks if data spans multiple years
+if len(weekly_hours) > 52:
+    weekly_hours = weekly_hours.head(52)
+
+fig2 = go.Figure(data=go.Scatter(
+    x=weekly_hours['YEAR_WEEK'],
+    y=weekly_hours['PLANNED_LABOR_HRS'],
+    mode='lines+markers',
+    line=dict(color='#FF6B6B', width=2),
+    marker=dict(size=6),
+    fill='tozeroy',
+    fillcolor='rgba(255, 107, 107, 0.2)'
+))
+
+fig2.update_layout(
+    title="Weekly Labor Hours Trend",
+    xaxis_title="Week",
+    yaxis_title="Planned Hours",
+    height=400,
+    xaxis_tickangle=-45
+)
+
+pm_profiler.plotly_chart(fig2, use_container_width=True)
+
+st.markdown("---")
+
+# CAPACITY LEVELING
+pm_profiler.checkpoint("Capacity Leveling")
+st.subheader("🧮 Capacity Leveling")
+st.markdown("*Shift PMs inside their interval window so no craft goes over its weekly capacity*")
+
+if st.checkbox("Propose a leveled schedule", key="cal_level"):
+    level_dept = cal_filter.get('DEPT_NAME')
+
+    lcol1, lcol2 = st.columns(2)
+    with lcol1:
+        headroom = st.slider("Default capacity (% of average weekly crew hours)", 80, 150,
+                             round(pm_schedule.HEADROOM * 100), step=5,
+                             key="cal_headroom")
+    with lcol2:
+        window_pct = st.slider("Allowed shift (% of PM interval)", 5, 50, int(pm_schedule.WINDOW_SHARE * 100),
+                               step=5, key="cal_window")
+
+    capacity_table = pd.DataFrame(list(default_capacity(level_dept, headroom / 100).items()),
+                                  columns=['Craft', 'Weekly Capacity (hrs)'])
+    capacity_table = st.data_editor(capacity_table, hide_index=True, disabled=['Craft'],
+                                    use_container_width=True, key=f"cal_capacity_{level_dept}_{headroom}")
+
+    result = leveled_schedule(level_dept,
+                              tuple(zip(capacity_table['Craft'], capacity_table['Weekly Capacity (hrs)'])),
+                              window_pct / 100)
+    summary = result['summary']
+
+    # Before / after curve for the selected craft (or all crafts)
+    weekly_level = result['weekly']
+    if 'LABOR_CRAFT' in cal_filter:
+        weekly_level = weekly_level[weekly_level['LABOR_CRAFT'] == cal_filter['LABOR_CRAFT']]
+    weekly_level = weekly_level.groupby('WEEK_START')[['before', 'after', 'capacity']].sum().reset_index()
+
+    lcol1, lcol2, lcol3, lcol4 = st.columns(4)
+    with lcol1:
+        st.metric("Hours Over Capacity", f"{summary['overload_after']:,.0f}",
+                  delta=f"{summary['overload_after'] - summary['overload_before']:,.0f}", delta_color="inverse")
+    with lcol2:
+        st.metric("Peak Week (hrs)", f"{weekly_level['after'].max():,.0f}",
+                  delta=f"{weekly_level['after'].max() - weekly_level['before'].max():,.0f}", delta_color="inverse")
+    with lcol3:
+        st.metric("PMs Moved", f"{summary['moved']:,}", help=f"{summary['movable']:,} of "
+                  f"{summary['occurrences']:,} occurrences have a window wide enough to move")
+    with lcol4:
+        st.metric("Solve Time", f"{summary['seconds']:.2f} s")
+
+    fig_level = go.Figure()
+    fig_level.add_trace(go.Scatter(x=weekly_level['WEEK_START'], y=weekly_level['before'],
+                                   mode='lines', name='Current', line=dict(color='#FF6B6B', width=2)))
+    fig_level.add_trace(go.Scatter(x=weekly_level['WEEK_START'], y=weekly_level['after'],
+                                   mode='lines', name='Leveled', line=dict(color='#4ECDC4', width=2)))
+    if np.isfinite(weekly_level['capacity']).all():
+        fig_level.add_trace(go.Scatter(x=weekly_level['WEEK_START'], y=weekly_level['capacity'],
+                                       mode='lines', name='Capacity', line=dict(color='gray', dash='dash')))
+    fig_level.update_layout(
+        title="Weekly Crew Hours - Current vs Leveled",
+        xaxis_title="Week",
+        yaxis_title="Crew Hours",
+        height=400
+    )
+    pm_profiler.plotly_chart(fig_level, use_container_width=True)
+
+    if 'complexity_level' in cal_filter:
+        st.caption("Leveling covers every complexity level - the complexity filter is not applied here.")
+
+    moves = result['moves'].sort_values(['DUE_DATE', 'COUNTKEY'])
+    st.markdown(f"**Proposed moves** ({len(moves):,})")
+    pm_profiler.dataframe(moves.head(500), use_container_width=True, hide_index=True)
+    st.download_button("Download proposed schedule (CSV)", data=moves.to_csv(index=False),
+                       file_name="pm_leveled_schedule.csv", mime="text/csv")
+
+st.markdown("---")
+
+# PM COUNT HEATMAP BY MONTH AND DEPARTMENT
+pm_profiler.checkpoint("Department Workload Calendar")
+st.subheader("🗓️ Department Workload Calendar")
+
+# Create month x department heatmap
+dept_month_pivot = cube.query(['MONTH', 'DEPT_NAME'], {'PLANNED_LABOR_HRS': 'sum'}, filters=cal_filter)
+dept_month_pivot = dept_month_pivot.pivot(index='DEPT_NAME', columns='MONTH', values='PLANNED_LABOR_HRS').fillna(0)
+
+fig3 = px.imshow(dept_month_pivot,
+                 labels=dict(x="Month", y="Department", color="Planned Hours"),
+                 title="Department Workload Heatmap (All Months)",
+                 color_continuous_scale='RdYlGn_r',  # Red = high, Green = low
+                 aspect="auto",
+                 height=500)
+
+fig3.update_xaxes(side="bottom", tickangle=-45)
+pm_profiler.plotly_chart(fig3, use_container_width=True)
+
+st.markdown("---")
+
+# BOTTLENECK ANALYSIS
+pm_profiler.checkpoint("Potential Scheduling Bottlenecks")
+st.subheader("⚠️ Potential Scheduling Bottlenecks")
+
+# Find months with highest workload
+monthly_stats = cube.query('MONTH', {
+    'PLANNED_LABOR_HRS': 'sum',
+    'PMNUM': 'nunique',
+    'LABOR_CRAFT': 'nunique'
+}, filters=cal_filter)
+
+monthly_stats.columns = ['Month', 'Total Hours', 'PM Count', 'Unique Crafts']
+monthly_stats = monthly_stats.sort_values('Total Hours', ascending=False)
+
+# Highlight top 3 busiest months
+st.markdown("**Top 3 Busiest Months:**")
+top_3 = monthly_stats.head(3)
+
+for idx, row in top_3.iterrows():
+    st.warning(f"**{row['Month']}**: {row['Total Hours']:,.0f} hours | {row['PM Count']} PMs | {row['Unique Crafts']} crafts needed")
+
+st.markdown("---")
+
+# Full monthly breakdown table
+pm_profiler.checkpoint("Monthly Breakdown Table")
+st.subheader("📋 Monthly Breakdown Table")
+pm_profiler.dataframe(monthly_stats, use_container_width=True, hide_index=True,
+             column_config=pm_derive.column_formats({'Total Hours': 'hours'}))
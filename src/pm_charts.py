@@ -0,0 +1,100 @@
+"""
+Server-side chart helpers: reduced scatter plots and pre-serialized figures.
+
+path2 repeats each PM once per forecast row, so a plain px.scatter ships every
+repeated point (and its hover data) to the browser. pm_scatter sends one point
+per PM while the selection is small, and a binned 2D density (counts computed
+here, only the bin grid is sent) once it is too large to read as points.
+
+st.plotly_chart validates and serializes the figure it is given on every
+rerun. A FigureJSON holds the figure's JSON, serialized once (cached per
+dataset version by pm_data.cached_figure), and send_json puts it on the page
+as is.
+
+    fig = pm_scatter(path2_filtered, 'AVG_PLANNED_HRS', 'AVG_ACTUAL_HRS',
+                     color='performance_tier', hover_data=['PMNUM', 'DEPT_NAME'])
+    chart = FigureJSON(fig)           # fig.to_json(), once
+    send_json(chart, use_container_width=True)
+"""
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Above this many PMs the chart switches to the density view
+MAX_POINTS = 5000
+
+# Density view resolution (bins per axis)
+DENSITY_BINS = 60
+
+
+def pm_points(df, x, y, key='PMNUM'):
+    """One row per PM (the first occurrence), rows missing x or y dropped"""
+    return df.dropna(subset=[x, y]).drop_duplicates(key)
+
+
+def density_heatmap(df, x, y, bins=DENSITY_BINS, title=None, labels=None):
+    """2D histogram binned with numpy - the figure holds bins x bins counts, not the points"""
+    labels = labels or {}
+    counts, x_edges, y_edges = np.histogram2d(df[x].to_numpy(float), df[y].to_numpy(float), bins=bins)
+    counts = np.where(counts > 0, counts, np.nan)  # empty bins stay transparent
+
+    fig = go.Figure(go.Heatmap(x=(x_edges[:-1] + x_edges[1:]) / 2,
+                               y=(y_edges[:-1] + y_edges[1:]) / 2,
+                               z=counts.T,
+                               colorscale='Viridis',
+                               colorbar=dict(title='PMs'),
+                               hovertemplate='x: %{x:.2f}<br>y: %{y:.2f}<br>PMs: %{z}<extra></extra>'))
+    fig.update_layout(title=title,
+                      xaxis_title=labels.get(x, x),
+                      yaxis_title=labels.get(y, y))
+    return fig
+
+
+def pm_scatter(df, x, y, color=None, hover_data=None, title=None, labels=None, max_points=MAX_POINTS):
+    """Scatter of one point per PM, or a density heatmap when there are more than max_points PMs"""
+    points = pm_points(df, x, y)
+    if len(points) > max_points:
+        prefix = f"{title} - " if title else ""
+        title = f"{prefix}density of {len(points):,} PMs (filter to see individual PMs)"
+        return density_heatmap(points, x, y, title=title, labels=labels)
+
+    return px.scatter(points, x=x, y=y, color=color, hover_data=hover_data, title=title, labels=labels)
+
+
+class FigureJSON:
+    """A finished figure as the JSON Streamlit sends, plus the layout fields the page element needs"""
+
+    def __init__(self, fig):
+        self.spec = fig.to_json()
+        self.title = fig.layout.title.text
+        self.width = fig.layout.width
+        self.height = fig.layout.height
+
+    def __len__(self):
+        return len(self.spec)
+
+
+def send_json(chart, use_container_width=True, key=None):
+    """st.plotly_chart for a FigureJSON: the spec is sent as is, without re-validating or re-encoding.
+
+    Static charts only (no selection events), with the Streamlit theme.
+    """
+    import streamlit as st
+    from streamlit.elements.lib.layout_utils import LayoutConfig
+    from streamlit.elements.lib.utils import compute_and_register_element_id
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+
+    # Same sizing as st.plotly_chart: full width, or the figure's own (plotly.js defaults 700 x 450)
+    width = 'stretch' if use_container_width else int(chart.width or 700)
+    height = int(chart.height or 450)
+
+    proto = PlotlyChartProto()
+    proto.theme = 'streamlit'
+    proto.spec = chart.spec
+    proto.config = '{}'
+    proto.id = compute_and_register_element_id('plotly_chart', user_key=key, key_as_main_identity=False,
+                                               dg=st._main, plotly_spec=proto.spec, plotly_config=proto.config,
+                                               selection_mode=[], is_selection_activated=False,
+                                               theme='streamlit', width=width, height=height, alt=None)
+    return st._main._enqueue('plotly_chart', proto, layout_config=LayoutConfig(width=width, height=height))
@@ -0,0 +1,251 @@
+"""
+Incremental complexity scoring for the forecast.
+
+complexity_score is the mean of three min-max scaled components (task density,
+labor hours per occurrence capped at the 0.996 quantile, description
+intensity) and complexity_level splits it at its quartiles. Refitting that on
+every new export reshuffles levels that were already published. A
+ComplexityModel keeps the published scale and cutoffs next to running
+min/max, t-digest sketches and a row sample, so new rows are scored and
+absorbed in O(new rows). The published scale is only refit when the
+estimated share of rows that would change level passes DRIFT_THRESHOLD.
+
+    model = fit(features)                   # full fit (first build, --force)
+    model = refresh(features, model)        # absorbs rows with unseen COUNTKEYs
+    clean = model.apply(features)           # scores + levels on the published scale
+    drift_report(model)
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+import pm_derive
+
+# Raw components (labor is capped before scaling) and their scaled columns
+COMPONENTS = ['task_density', 'total_labor_per_occurrence', 'desc_intensity']
+NORM_COLUMNS = ['task_norm', 'hours_norm', 'desc_norm']
+LABOR = COMPONENTS.index('total_labor_per_occurrence')
+
+LABOR_CAP_QUANTILE = 0.996
+LEVEL_QUANTILES = (0.25, 0.75)
+LEVELS = ['Low', 'Medium', 'High']
+
+# Refit the published scale once more than 5% of rows would change level
+DRIFT_THRESHOLD = 0.05
+
+SKETCH_COMPRESSION = 400   # ~200 centroids per t-digest
+SAMPLE_SIZE = 20_000       # reservoir of raw components used to estimate level shifts
+
+
+class TDigest:
+    """Merging t-digest - weighted centroids that shrink towards the tails"""
+
+    def __init__(self, compression=SKETCH_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return self.weights.sum()
+
+    def update(self, values):
+        """Merges new values into the centroids (sort of new values + centroids)"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        means = np.concatenate([self.means, values])
+        weights = np.concatenate([self.weights, np.ones(len(values))])
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+
+        # k1 scale function: one centroid per unit of k, so tail centroids stay tiny
+        cum = np.cumsum(weights)
+        q = (cum - weights / 2) / cum[-1]
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+        return self
+
+    def _knots(self):
+        cum = np.cumsum(self.weights)
+        ranks = np.r_[0, cum - self.weights / 2, cum[-1]]
+        return ranks / cum[-1], np.r_[self.min, self.means, self.max]
+
+    def quantile(self, q):
+        ranks, values = self._knots()
+        return np.interp(q, ranks, values)
+
+    def cdf(self, x):
+        ranks, values = self._knots()
+        return np.interp(x, values, ranks)
+
+
+class ComplexityModel:
+    """Published scale + cutoffs, with running statistics of every row absorbed since"""
+
+    def __init__(self, cap, low, high, thresholds):
+        self.cap = cap
+        self.low = np.asarray(low, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.thresholds = tuple(thresholds)
+
+        self.n_published = 0
+        self.published_shares = {}
+        self.n_rows = 0
+        self.new_rows = 0
+        self.rescaled = False
+        self.last_shift = 0.0
+        self.keys = pd.Index([], dtype=object)
+        self.raw_low = np.full(len(COMPONENTS), np.inf)
+        self.raw_high = np.full(len(COMPONENTS), -np.inf)
+        self.labor = TDigest()
+        self.scores = TDigest()
+        self.sample = np.empty((0, len(COMPONENTS)))
+        self.rng = np.random.default_rng(0)
+
+    def normalize(self, raw):
+        """Raw component matrix -> scaled components on the published scale (clipped to 0-1)"""
+        capped = raw.copy()
+        capped[:, LABOR] = np.minimum(capped[:, LABOR], self.cap)
+        span = self.high - self.low
+        span[span == 0] = 1
+        return np.clip((capped - self.low) / span, 0, 1)
+
+    def score(self, raw):
+        return self.normalize(raw).mean(axis=1)
+
+    def level(self, scores):
+        return pm_derive.complexity_level(pd.Series(scores), self.thresholds)
+
+    def apply(self, df):
+        """Adds the capped labor, scaled components, score and level columns"""
+        df = df.copy()
+        normalized = self.normalize(components(df))
+        df['total_labor_per_occ_capped'] = df['total_labor_per_occurrence'].clip(upper=self.cap)
+        df['complexity_score'] = normalized.mean(axis=1)
+        for i, col in enumerate(NORM_COLUMNS):
+            df[col] = normalized[:, i]
+        df['complexity_level'] = pm_derive.complexity_level(df['complexity_score'], self.thresholds)
+        return df
+
+    def absorb(self, df):
+        """Updates the running statistics with new rows - O(len(df))"""
+        raw = components(df)
+        self.new_rows = len(raw)
+        if len(raw) == 0:
+            return self
+        self.raw_low = np.fmin(self.raw_low, np.nanmin(raw, axis=0))
+        self.raw_high = np.fmax(self.raw_high, np.nanmax(raw, axis=0))
+        self.labor.update(raw[:, LABOR])
+        self.scores.update(self.score(raw))
+        self._sample(raw)
+        self.n_rows += len(raw)
+        return self
+
+    def _sample(self, raw):
+        """Reservoir sample of raw component rows (algorithm R, vectorized)"""
+        space = SAMPLE_SIZE - len(self.sample)
+        head, rest = raw[:space], raw[space:]
+        self.sample = np.vstack([self.sample, head])
+        if len(rest):
+            seen = self.n_rows + len(head) + np.arange(len(rest))
+            slots = (self.rng.random(len(rest)) * (seen + 1)).astype(int)
+            keep = slots < SAMPLE_SIZE
+            # Later rows win when two land on the same slot, as in the sequential algorithm
+            self.sample[slots[keep]] = rest[keep]
+
+    def candidate(self):
+        """The scale a global refit would publish now, estimated from the running statistics"""
+        cap = self.labor.quantile(LABOR_CAP_QUANTILE)
+        low, high = self.raw_low.copy(), self.raw_high.copy()
+        low[LABOR], high[LABOR] = min(low[LABOR], cap), min(high[LABOR], cap)
+        model = ComplexityModel(cap, low, high, (0, 1))
+        model.thresholds = tuple(np.nanquantile(model.score(self.sample), LEVEL_QUANTILES))
+        return model
+
+    def level_shift(self, candidate=None):
+        """Estimated share of rows whose level would change on a global refit"""
+        if len(self.sample) == 0:
+            return 0.0
+        candidate = candidate or self.candidate()
+        published = self.level(self.score(self.sample))
+        refit = candidate.level(candidate.score(self.sample))
+        return float((published.astype(object) != refit.astype(object)).mean())
+
+
+def components(df):
+    """Raw component matrix (rows x COMPONENTS)"""
+    return df[COMPONENTS].to_numpy(dtype=float)
+
+
+def fit(df):
+    """Full fit - exact quantiles, same scale and cutoffs as a MinMaxScaler over all rows"""
+    cap = df['total_labor_per_occurrence'].quantile(LABOR_CAP_QUANTILE)
+    raw = components(df)
+    capped = raw.copy()
+    capped[:, LABOR] = np.minimum(capped[:, LABOR], cap)
+
+    model = ComplexityModel(cap, np.nanmin(capped, axis=0), np.nanmax(capped, axis=0), (0, 1))
+    scores = pd.Series(model.score(raw))
+    model.thresholds = tuple(scores.quantile(list(LEVEL_QUANTILES)))
+    model.absorb(df)
+    model.keys = pd.Index(df['COUNTKEY'].unique())
+
+    model.n_published = model.n_rows
+    model.published_shares = model.level(scores).value_counts(normalize=True).to_dict()
+    model.rescaled = True
+    return model
+
+
+def refresh(df, previous=None, threshold=DRIFT_THRESHOLD):
+    """Absorbs rows with unseen COUNTKEYs into a copy of the published model; refits once levels would drift.
+
+    Rows that drop out of the export stay in the running statistics until the
+    next full fit, but only the current export's COUNTKEYs are remembered.
+    """
+    if previous is None:
+        return fit(df)
+    model = copy.deepcopy(previous)
+    model.absorb(df[~df['COUNTKEY'].isin(model.keys)])
+    model.keys = pd.Index(df['COUNTKEY'].unique())
+    model.rescaled = False
+    model.last_shift = model.level_shift()
+    if model.last_shift > threshold:
+        refit = fit(df)
+        refit.last_shift = model.last_shift
+        return refit
+    return model
+
+
+def drift_report(model):
+    """Published vs current statistics, one row per metric (threshold only where one applies)"""
+    candidate = model.candidate()
+    rows = [('rows', model.n_published, model.n_rows),
+            ('new_rows', 0, model.new_rows),
+            ('labor_cap', model.cap, candidate.cap)]
+    for i, col in enumerate(COMPONENTS):
+        rows.append((f'{col}_min', model.low[i], candidate.low[i]))
+        rows.append((f'{col}_max', model.high[i], candidate.high[i]))
+    rows.append(('low_threshold', model.thresholds[0], candidate.thresholds[0]))
+    rows.append(('high_threshold', model.thresholds[1], candidate.thresholds[1]))
+
+    # Level shares on the published scale: at publish time vs all rows absorbed since
+    below = model.scores.cdf(list(model.thresholds))
+    current = {'Low': below[0], 'Medium': below[1] - below[0], 'High': 1 - below[1]}
+    for level in LEVELS:
+        rows.append((f'share_{level}', model.published_shares.get(level, 0.0), current[level]))
+
+    # Share of sampled rows that changed level / would change level at the last refresh
+    rows.append(('level_shift', 0.0, model.last_shift, DRIFT_THRESHOLD))
+    rows.append(('rescaled', 0, int(model.rescaled)))
+    return pd.DataFrame(rows, columns=['metric', 'published', 'current', 'threshold'])
@@ -0,0 +1,145 @@
+"""
+Pre-aggregated forecast cube.
+
+The forecast is rolled up once to one row ("cell") per combination of the
+dimensions below, with summed measures. Page charts group the cells instead
+of the raw rows, so a widget click costs a groupby over a few thousand cells.
+
+Distinct PM counts can't be summed across cells, so the cube also keeps the
+set of PMs in every cell (a cell -> PM code table). Sets merge by union, which
+keeps `nunique` exact for any rollup (counted by pm_distinct on the PM codes).
+
+    cube = build_cube(forecast)
+    cube.query(['MONTH', 'DEPT_NAME'], {'PLANNED_LABOR_HRS': 'sum'})
+    cube.query('DEPT_NAME', {'PMNUM': 'nunique', 'complexity_score': 'mean'},
+               filters={'LABOR_CRAFT': ['MECH', 'ELEC']})
+"""
+
+import numpy as np
+import pandas as pd
+
+import pm_distinct
+import pm_profiler
+
+DIMENSIONS = ['MONTH', 'DEPT_NAME', 'LABOR_CRAFT', 'interval_category', 'complexity_level',
+              'LINE', 'ZONENAME', 'JOB_TYPE', 'PMSCOPETYPE']
+
+# Additive measures stored per cell, each with its non-null count ('mean' is derived as sum / count,
+# so missing values are skipped as in a raw groupby mean)
+MEASURES = ['PLANNED_LABOR_HRS', 'total_labor_hrs', 'PLANNED_LABORERS', 'complexity_score', 'TASK_COUNT']
+COUNTS = {col: f'{col}_count' for col in MEASURES}
+
+# Source columns needed to build the cube
+CUBE_COLUMNS = DIMENSIONS + MEASURES + ['PMNUM']
+
+ROWS = 'rows'
+
+
+class Cube:
+    """Cells (dimensions + summed measures, their non-null counts, row count) and the PMs in each cell"""
+
+    def __init__(self, cells, cell_pms, n_pms):
+        self.cells = cells          # one row per cell, index = cell id
+        self.cell_pms = cell_pms    # DataFrame(cell, pm) - unique pairs
+        self.n_pms = n_pms
+
+    def _mask(self, filters):
+        mask = np.ones(len(self.cells), dtype=bool)
+        for col, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                mask &= self.cells[col].isin(list(value)).to_numpy()
+            else:
+                mask &= (self.cells[col] == value).to_numpy()
+        return mask
+
+    def _distinct_pms(self, group_ids, n_groups, mask):
+        """Exact distinct PM count per group (group_ids is per cell, -1 = excluded)"""
+        cell = self.cell_pms['cell'].to_numpy()
+        pm = self.cell_pms['pm'].to_numpy()
+        keep = mask[cell]
+        return pm_distinct.grouped_count(group_ids[cell[keep]], pm[keep], n_groups, self.n_pms)
+
+    def query(self, by, agg, filters=None):
+        """Like df.groupby(by).agg(agg).reset_index() on the raw rows.
+
+        agg maps column -> 'sum' | 'mean' | 'count' | 'nunique' | 'mode'.
+        'count' is the raw row count, 'nunique' works for PMNUM and any dimension,
+        'mode' is the most frequent dimension value (by raw rows).
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        pm_profiler.scanned(len(self.cells))
+        mask = self._mask(filters)
+        cells = self.cells[mask]
+
+        if by:
+            grouped = cells.groupby(by, observed=True, sort=True)
+            result = grouped[[ROWS]].sum()
+        else:
+            result = pd.DataFrame({ROWS: [cells[ROWS].sum()]})
+
+        for col, how in agg.items():
+            if how == 'count':
+                result[col] = result[ROWS]
+            elif how == 'sum':
+                result[col] = grouped[col].sum() if by else cells[col].sum()
+            elif how == 'mean':
+                sums = grouped[[col, COUNTS[col]]].sum() if by else cells[[col, COUNTS[col]]].sum().to_frame().T
+                result[col] = sums[col] / sums[COUNTS[col]]
+            elif how == 'nunique' and col == 'PMNUM':
+                group_ids = np.full(len(self.cells), -1, dtype=np.int64)
+                group_ids[mask] = grouped.ngroup().fillna(-1).to_numpy() if by else 0
+                result[col] = self._distinct_pms(group_ids, len(result), mask)
+            elif how == 'nunique':
+                result[col] = grouped[col].nunique() if by else cells[col].nunique()
+            elif how == 'mode':
+                weights = cells.groupby(by + [col], observed=True)[ROWS].sum().reset_index()
+                # Ties resolve to the smallest value, like Series.mode()[0]
+                weights = weights.sort_values(col, kind='stable').sort_values(ROWS, ascending=False, kind='stable')
+                top = weights.drop_duplicates(by) if by else weights.head(1)
+                top = top[by + [col]].astype({col: object})
+                result[col] = top.set_index(by)[col] if by else (top[col].to_numpy() if len(top) else None)
+            else:
+                raise ValueError(f"Unsupported aggregation {how!r} for {col}")
+
+        result = result.drop(columns=ROWS) if ROWS not in agg else result
+        return result.reset_index() if by else result
+
+    def total(self, col, how='sum', filters=None):
+        """Single grand-total value"""
+        return self.query([], {col: how}, filters)[col].iloc[0]
+
+    def value_counts(self, col, filters=None):
+        """Like df[col].value_counts() on the raw rows"""
+        counts = self.query(col, {ROWS: 'count'}, filters).set_index(col)[ROWS]
+        return counts.sort_values(ascending=False, kind='stable').rename('count')
+
+    def values(self, col, filters=None):
+        """Sorted distinct values of a dimension"""
+        return sorted(self.cells.loc[self._mask(filters), col].dropna().unique().tolist())
+
+
+def build_cube(df):
+    """Rolls the forecast up to one row per distinct dimension combination"""
+    keys = df[DIMENSIONS]
+    cell_id = keys.groupby(DIMENSIONS, observed=True, dropna=False, sort=False).ngroup().to_numpy()
+
+    cells = (df[MEASURES]
+             .join(df[MEASURES].notna().rename(columns=COUNTS))
+             .assign(**{ROWS: 1})
+             .groupby(cell_id)
+             .sum())
+    first = keys.groupby(cell_id).first() if len(df) else keys
+    cells = first.join(cells)
+
+    # Restore categorical dimension dtypes (groupby.first returns plain values for them)
+    for col in DIMENSIONS:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            cells[col] = pd.Categorical(cells[col], categories=df[col].cat.categories)
+
+    # Unique (cell, PM) pairs over the interned PM codes - rows without a PMNUM don't count as a PM
+    pm_codes, n_pms = pm_distinct.key_codes(df['PMNUM'])
+    has_pm = pm_codes >= 0
+    pairs = np.unique(cell_id[has_pm].astype(np.int64) * n_pms + pm_codes[has_pm])
+    cell_pms = pd.DataFrame({'cell': pairs // n_pms, 'pm': pairs % n_pms})
+
+    return Cube(cells.reset_index(drop=True), cell_pms, n_pms)
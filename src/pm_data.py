@@ -0,0 +1,343 @@
+"""
+Shared data access for the dashboard pages.
+
+Every loader is cached, so whichever page loads a dataset first pays for it
+and the other pages reuse it.
+
+Datasets come from the newest published snapshot of the store (pm_registry):
+a new pipeline build is loaded in the background and swapped in without a
+restart, and each rerun keeps reading the version it started on.
+
+Datasets are loaded once per process and version and shared read-only by
+every session (PM_CACHE_MODE=shared, the default): pandas copy-on-write makes
+the column and row selections pages take from them views rather than copies.
+PM_CACHE_MODE=session hands every call its own copy instead.
+
+PM_QUERY_BACKEND=duckdb answers the page aggregates with SQL over the Parquet
+store instead of the in-memory cube and frames (see pm_query).
+"""
+
+import inspect
+import os
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import pm_distinct
+import pm_memory
+import pm_profiler
+import pm_store
+
+# Page-specific helpers (cube, query backends, indexes, model, KDE, scheduling) are imported
+# inside the loaders that use them, so a page only pays for the modules its loaders need.
+
+# Path to outputs 
+OUTPUT_DIR = Path(__file__).parent.parent / 'outputs'
+
+# Columnar datasets (built by src/pm_pipeline.py): store/<name>, published as store/versions/<version>/<name>
+STORE_DIR = OUTPUT_DIR / 'store'
+
+# Aggregate backend: 'pandas' (in-memory cube / frames) or 'duckdb' (SQL over the Parquet store)
+QUERY_BACKENDS = ['pandas', 'duckdb']   # pm_query.BACKENDS
+QUERY_BACKEND = os.environ.get('PM_QUERY_BACKEND', 'pandas')
+if QUERY_BACKEND not in QUERY_BACKENDS:
+    raise ValueError(f"PM_QUERY_BACKEND must be one of {QUERY_BACKENDS}, not {QUERY_BACKEND!r}")
+
+# Dataset cache: 'shared' = one read-only copy per process and dataset version,
+# 'session' = every call gets its own copy
+CACHE_MODES = ['shared', 'session']
+CACHE_MODE = os.environ.get('PM_CACHE_MODE', 'shared')
+if CACHE_MODE not in CACHE_MODES:
+    raise ValueError(f"PM_CACHE_MODE must be one of {CACHE_MODES}, not {CACHE_MODE!r}")
+
+# Selections from a shared frame are views; writing to one copies it instead of the shared data
+pd.set_option('mode.copy_on_write', True)
+
+# Row-level columns each page reads (None = every column, for the detail tables).
+# Executive Overview and Operational Insights only use the aggregate cube.
+PAGE_COLUMNS = {
+    "Department Deep Dive": None,
+    "Workload Calendar": ['YEAR_WEEK', 'DEPT_NAME', 'LABOR_CRAFT', 'complexity_level', 'PLANNED_LABOR_HRS'],
+    # Occurrence rows for the monthly trend; everything else reads the PM-grain table
+    "Plan vs Execution": ['PMNUM', 'DEPT_NAME', 'INTERVAL', 'JOB_TYPE', 'due_month',
+                          'completion_rate', 'on_time_rate'],
+}
+
+# Categorical filter columns with a bitmap index (filters resolve to row positions, no frame copies)
+INDEX_COLUMNS = {
+    "Department Deep Dive": ['LABOR_CRAFT', 'complexity_level', 'interval_category', 'MONTH', 'LINE', 'ZONENAME'],
+    "Workload Calendar": ['DEPT_NAME', 'LABOR_CRAFT', 'complexity_level'],
+    "Plan vs Execution": ['DEPT_NAME', 'INTERVAL', 'JOB_TYPE'],
+}
+
+# =============================================================================
+# DATASET VERSIONS
+# =============================================================================
+# Each rerun reads the snapshot it pinned; the registry swaps in new builds in the background
+_pinned = threading.local()
+
+
+@st.cache_resource
+def dataset_registry():
+    import pm_registry
+    return pm_registry.Registry(STORE_DIR, warm=preload,
+                                on_retire=lambda snapshot: pm_memory.forget(snapshot.version)).start()
+
+
+def current_snapshot():
+    """The snapshot this rerun pinned (the active one outside a rerun)"""
+    snapshot = getattr(_pinned, 'snapshot', None)
+    return snapshot if snapshot is not None else dataset_registry().active
+
+
+@contextmanager
+def using_snapshot(snapshot):
+    """Makes snapshot the current one for this thread (preloads, worker threads of a rerun)"""
+    previous = getattr(_pinned, 'snapshot', None)
+    _pinned.snapshot = snapshot
+    try:
+        yield snapshot
+    finally:
+        _pinned.snapshot = previous
+
+
+@contextmanager
+def pinned_snapshot():
+    """Pins the active dataset version for one rerun - wrap page.run() in it"""
+    with dataset_registry().pinned() as snapshot, using_snapshot(snapshot):
+        yield snapshot
+
+
+def _hashable(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+def _label(func, args):
+    parts = [f"{len(v)} cols" if isinstance(v, list) else str(v) for v in args if v]
+    return f"{func.__name__.removeprefix('load_')}({', '.join(parts)})"
+
+
+def snapshot_resource(track=True, bounded_by=()):
+    """Like st.cache_resource, but memoized on the pinned snapshot (and dropped with it).
+
+    The decorated function gets the snapshot as its first argument. track=True
+    reports the result in the memory panel. A call that sets any argument named
+    in bounded_by (a filtered read: one PM, one selection) goes to the
+    snapshot's bounded LRU instead of being held for the snapshot's lifetime.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            snapshot = current_snapshot()
+            bound = signature.bind(snapshot, *args, **kwargs)
+            bound.apply_defaults()
+            values = list(bound.arguments.values())[1:]
+            bounded = any(bound.arguments[name] for name in bounded_by)
+
+            def build():
+                value = func(*bound.args, **bound.kwargs)
+                if track and not bounded:
+                    pm_memory.register(f"{snapshot.version} {_label(func, values)}", value)
+                return value
+            memo = snapshot.cached if bounded else snapshot.get
+            return memo((func.__name__, *map(_hashable, values)), build)
+        return wrapper
+    return decorator
+
+
+def dataset(bounded_by=()):
+    """Dataset loader: one read-only frame per snapshot, or with PM_CACHE_MODE=session a copy per call.
+
+    Reads that set an argument in bounded_by are filtered reads, kept in the bounded LRU.
+    """
+    def decorator(func):
+        shared = snapshot_resource(bounded_by=bounded_by)(func)
+        if CACHE_MODE == 'shared':
+            return shared
+
+        @wraps(func)
+        def copied(*args, **kwargs):
+            return shared(*args, **kwargs).copy(deep=True)
+        return copied
+    return decorator
+
+
+def versioned(func):
+    """Passes the pinned snapshot's version as the first argument (part of an st.cache_data key)"""
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(current_snapshot().version, *args, **kwargs)
+    return wrapper
+
+
+# Load data (memoized per snapshot, so each column/partition selection only loads once).
+# Filtered reads (one department, one PM, a download selection) are kept in the bounded LRU.
+# PMNUM comes back interned (categorical codes), so PM counts never hash the strings.
+@pm_profiler.profiled()
+@dataset(bounded_by=['dept'])
+def load_forecast(snapshot, columns=None, dept=None):
+    """Forecast dataset - only the requested columns, optionally one department's partitions"""
+    filters = {'DEPT_NAME': dept} if dept else None
+    return pm_distinct.intern_keys(pm_store.read_dataset(snapshot.path / 'forecast', columns, filters))
+
+@pm_profiler.profiled()
+@dataset(bounded_by=['filters'])
+def load_path2(snapshot, columns=None, filters=None):
+    """Merged plan vs execution dataset"""
+    return pm_distinct.intern_keys(pm_store.read_dataset(snapshot.path / 'path2', columns, filters))
+
+@pm_profiler.profiled()
+@dataset()
+def load_path2_pm(snapshot):
+    """Plan vs execution at PM grain (one row per PMNUM and dept / interval / job type / craft it has)"""
+    return pm_distinct.intern_keys(pm_store.read_dataset(snapshot.path / 'path2_pm'))
+
+# Aggregate cube - built once per snapshot and shared (read-only) across reruns
+@pm_profiler.profiled()
+@snapshot_resource()
+def load_cube(snapshot):
+    if QUERY_BACKEND == 'duckdb':
+        import pm_query
+        return pm_query.DuckDBTable(snapshot.path / 'forecast')
+    import pm_cube
+    return pm_cube.build_cube(load_forecast(pm_cube.CUBE_COLUMNS))
+
+# Plan vs execution aggregates at PM grain (same query interface as the cube), each PM once per group
+@pm_profiler.profiled()
+@snapshot_resource(track=False)
+def load_path2_pm_table(snapshot):
+    import pm_query
+    if QUERY_BACKEND == 'duckdb':
+        return pm_query.DuckDBTable(snapshot.path / 'path2_pm', unit='PMNUM')
+    return pm_query.FrameTable(load_path2_pm(), load_path2_pm_index(), unit='PMNUM')
+
+# One department's full forecast as PM / occurrence / labor tables (pm_model) - the wide
+# rows are only rebuilt for the detail tables, so the department is held ~4x smaller
+# (3.7-4.6x per department at scale 1, benchmarks/bench_model.py)
+@pm_profiler.profiled()
+@snapshot_resource()
+def load_dept_model(snapshot, dept):
+    import pm_model
+    rows = pm_store.read_dataset(snapshot.path / 'forecast', PAGE_COLUMNS["Department Deep Dive"], {'DEPT_NAME': dept})
+    return pm_model.build_model(pm_distinct.intern_keys(rows))
+
+# Bitmap indexes - built once per snapshot, row positions line up with the cached frames / models
+@pm_profiler.profiled()
+@snapshot_resource()
+def load_dept_index(snapshot, dept):
+    import pm_index
+    return pm_index.build_index(load_dept_model(dept).wide(INDEX_COLUMNS["Department Deep Dive"]),
+                                INDEX_COLUMNS["Department Deep Dive"])
+
+@pm_profiler.profiled()
+@snapshot_resource()
+def load_calendar_index(snapshot):
+    import pm_index
+    return pm_index.build_index(load_forecast(PAGE_COLUMNS["Workload Calendar"]),
+                                INDEX_COLUMNS["Workload Calendar"])
+
+@pm_profiler.profiled()
+@snapshot_resource()
+def load_path2_index(snapshot):
+    import pm_index
+    return pm_index.build_index(load_path2(PAGE_COLUMNS["Plan vs Execution"]),
+                                INDEX_COLUMNS["Plan vs Execution"])
+
+@pm_profiler.profiled()
+@snapshot_resource()
+def load_path2_pm_index(snapshot):
+    import pm_index
+    return pm_index.build_index(load_path2_pm(), INDEX_COLUMNS["Plan vs Execution"])
+
+
+# Finished results and figures of the filter-free pages (Executive Overview, Operational Insights).
+# Kept per snapshot in a bounded LRU (the datasets and cube they come from are never evicted):
+# a revisit is a lookup, and a new dataset version starts empty.
+def cached_result(key, build):
+    """build() once per dataset version, on first request; shared by every session"""
+    return current_snapshot().cached(('result', key), build)
+
+def cached_figure(chart_id, build):
+    """Plotly figure chart_id as its finished JSON (pm_charts.FigureJSON), built and serialized once
+    per dataset version - render it with pm_profiler.plotly_chart"""
+    def serialize():
+        import pm_charts
+        return pm_charts.FigureJSON(build())
+    return current_snapshot().cached(('figure', chart_id), serialize)
+
+
+def preload(snapshot):
+    """Loads what the pages open with, before the registry makes the snapshot active"""
+    with using_snapshot(snapshot):
+        load_cube()
+        load_path2_pm_table()
+        load_path2_index()
+        load_calendar_index()
+
+# Weekly hours per calendar filter combination - revisiting a combination is a cache hit.
+# Bounded so only the most recently used combinations stay in memory.
+@versioned
+@pm_profiler.profiled()
+@st.cache_data(max_entries=64)
+def weekly_workload(version, dept=None, craft=None, complexity=None):
+    rows = load_forecast(PAGE_COLUMNS["Workload Calendar"])
+    filters = {col: value for col, value in [('DEPT_NAME', dept), ('LABOR_CRAFT', craft),
+                                             ('complexity_level', complexity)] if value is not None}
+    positions = load_calendar_index().positions(filters)
+
+    # YEAR_WEEK is precomputed by the pipeline - no date formatting here
+    weekly = (rows['PLANNED_LABOR_HRS'].iloc[positions]
+              .groupby(rows['YEAR_WEEK'].iloc[positions], observed=True)
+              .sum())
+    weekly.index = weekly.index.astype(str)
+    return weekly.sort_index().reset_index()
+
+# Complexity component densities per Deep Dive selection, on a fixed 0-1 grid
+KDE_GRID = np.linspace(0, 1, 200)
+
+@versioned
+@pm_profiler.profiled()
+@st.cache_data(max_entries=64)
+def complexity_densities(version, dept, crafts, complexity=None):
+    import pm_kde
+    model = load_dept_model(dept)
+    filters = {'LABOR_CRAFT': list(crafts)}
+    if complexity is not None:
+        filters['complexity_level'] = complexity
+    positions = load_dept_index(dept).positions(filters)
+    return {col: pm_kde.binned_kde(model.column(col, positions), KDE_GRID)
+            for col in ['task_norm', 'hours_norm', 'desc_norm']}
+
+# Capacity leveling for the Workload Calendar - capacities and window are part of the cache key
+@versioned
+@pm_profiler.profiled()
+@st.cache_data(max_entries=16)
+def default_capacity(version, dept=None, headroom=None):
+    import pm_schedule
+    return pm_schedule.default_capacity(load_forecast(pm_schedule.SCHEDULE_COLUMNS, dept=dept),
+                                        pm_schedule.HEADROOM if headroom is None else headroom)
+
+@versioned
+@pm_profiler.profiled()
+@st.cache_data(max_entries=16)
+def leveled_schedule(version, dept, capacity, window_share):
+    import pm_schedule
+    rows = load_forecast(pm_schedule.SCHEDULE_COLUMNS, dept=dept)
+    return pm_schedule.level_schedule(rows, dict(capacity), window_share)
+
+@versioned
+@st.cache_data
+def list_departments(version):
+    # Read from the partition folder names - no data is loaded
+    return pm_store.partition_values(current_snapshot().path / 'forecast', 'DEPT_NAME')
@@ -0,0 +1,62 @@
+"""
+Vectorized derivations shared by the pipeline and the dashboard.
+
+Bandings are whole-column operations (np.select / pd.cut) rather than a
+Python function applied row by row, and table display formats are handed to
+st.dataframe as column_config instead of turning numbers into strings:
+
+    pf['performance_tier'] = performance_tier(pf['completion_rate'])
+    st.dataframe(table, column_config=column_formats({'Total Hours': 'hours'}))
+"""
+
+import numpy as np
+import pandas as pd
+
+# Completion-rate tiers - checked top-down, anything lower is LOW
+TIER_THRESHOLDS = [('HIGH', 0.90), ('MEDIUM', 0.75)]
+
+# Frequency bands for interval_category
+INTERVAL_BINS = [0, 3, 10, 20, 45, 75, 135, 270, 540, float('inf')]
+INTERVAL_LABELS = ['Daily', 'Weekly', 'Bi-Weekly', 'Monthly', 'Bi-Monthly',
+                   'Quarterly', 'Semi-Annual', 'Annual', 'Multi-Year']
+
+# Display formats (printf-style, see st.column_config.NumberColumn)
+NUMBER_FORMATS = {
+    'hours': '%,.0f',     # 12,345
+    'count': '%,d',       # 1,234
+    'ratio': '%.1f',      # 12.3
+    'score': '%.2f',      # 0.42
+    'percent': 'percent', # 0.123 -> 12.30%
+}
+
+
+def performance_tier(completion_rate):
+    """HIGH / MEDIUM / LOW by completion rate, UNKNOWN when missing"""
+    cr = pd.Series(completion_rate)
+    conditions = [cr.isna()] + [cr >= threshold for _, threshold in TIER_THRESHOLDS]
+    choices = ['UNKNOWN'] + [tier for tier, _ in TIER_THRESHOLDS]
+    return pd.Series(np.select(conditions, choices, default='LOW'), index=cr.index, dtype=object)
+
+
+def interval_category(interval_days):
+    """Frequency band (Daily ... Multi-Year) from the interval length in days"""
+    return pd.cut(interval_days, bins=INTERVAL_BINS, labels=INTERVAL_LABELS, right=True)
+
+
+def complexity_level(complexity_score, thresholds=None):
+    """Low / Medium / High split at the score's quartiles (or at fixed (low, high) thresholds)"""
+    if thresholds is None:
+        thresholds = complexity_score.quantile(0.25), complexity_score.quantile(0.75)
+    low_threshold, high_threshold = thresholds
+    return pd.cut(complexity_score,
+                  bins=[0, low_threshold, high_threshold, 1.0],
+                  labels=['Low', 'Medium', 'High'],
+                  include_lowest=True)
+
+
+def column_formats(spec):
+    """{column: format name} -> st.dataframe column_config (values stay numeric and sortable)"""
+    import streamlit as st
+
+    return {col: st.column_config.NumberColumn(format=NUMBER_FORMATS[kind])
+            for col, kind in spec.items()}
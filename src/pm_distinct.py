@@ -0,0 +1,116 @@
+"""
+Exact distinct counts over interned keys.
+
+PMNUM is interned to integer codes once, when a dataset is loaded (a
+categorical column already holds codes; anything else is factorized), so a
+"PM count" never hashes PM strings again. grouped_count() is the one kernel
+behind every distinct PM count - the cube's rollups, the PM-grain table and
+the page-level counts:
+
+- dense: a (group x key) boolean table is marked and summed per group - one
+  pass, no sort; used while the table stays under DENSE_LIMIT cells
+- sparse: (group, key) pairs packed into one int64, sorted, and the first
+  occurrence of each pair counted per group
+
+group_ids() numbers the groups from the key columns' codes the same way, so
+a standalone grouped count hashes neither the PMs nor categorical group keys.
+
+    df = intern_keys(df)                              # at load time
+    codes, n_keys = key_codes(df['PMNUM'])
+    grouped_count(group_ids, codes, n_groups, n_keys)  # distinct PMs per group
+    groupby_count(df, 'due_month', 'PMNUM')           # == groupby(...)['PMNUM'].nunique()
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Key columns interned at load time
+KEYS = ['PMNUM']
+
+# Largest group x key table (cells = bytes of scratch) counted with the dense kernel
+DENSE_LIMIT = 1 << 24
+
+
+def intern_keys(df, keys=KEYS):
+    """Key columns -> categorical (integer codes + one copy of each value); others untouched"""
+    for col in keys:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def key_codes(values):
+    """(int64 codes, number of keys) - -1 marks a missing value"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy().astype(np.int64), max(len(values.cat.categories), 1)
+    codes, uniques = pd.factorize(values)
+    return codes.astype(np.int64), max(len(uniques), 1)
+
+
+def grouped_count(group_ids, codes, n_groups, n_keys):
+    """Distinct keys per group (rows with group id or code -1 are left out)"""
+    keep = (group_ids >= 0) & (codes >= 0)
+    groups = group_ids[keep].astype(np.int64)
+    pairs = groups * n_keys + codes[keep]
+    if n_groups * n_keys <= DENSE_LIMIT:
+        seen = np.zeros(n_groups * n_keys, dtype=bool)
+        seen[pairs] = True
+        return np.count_nonzero(seen.reshape(n_groups, n_keys), axis=1)
+    pairs.sort()
+    first = np.ones(len(pairs), dtype=bool)
+    first[1:] = pairs[1:] != pairs[:-1]
+    return np.bincount(pairs[first] // n_keys, minlength=n_groups)
+
+
+def count(values):
+    """Like values.nunique()"""
+    codes, n_keys = key_codes(values)
+    return int(grouped_count(np.zeros(len(codes), dtype=np.int64), codes, 1, n_keys)[0])
+
+
+def _levels(values):
+    """(codes, sorted distinct values) of a grouping column - -1 marks a null key"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy().astype(np.int64), values.cat.categories
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes.astype(np.int64), pd.Index(uniques)
+
+
+def group_ids(df, by):
+    """(group id per row, number of groups, group keys) - like groupby(by, observed=True, sort=True).
+
+    Ids come from the key columns' codes (mixed radix, then compacted to the
+    groups present), so categorical keys are never hashed. -1 = a null key.
+    """
+    ids = np.zeros(len(df), dtype=np.int64)
+    levels = []
+    for col in by:
+        codes, uniques = _levels(df[col])
+        ids = np.where((ids < 0) | (codes < 0), -1, ids * len(uniques) + codes)
+        levels.append(uniques)
+    sizes = [len(level) for level in levels]
+    n_cells = math.prod(sizes)
+    valid = ids >= 0
+    if n_cells <= DENSE_LIMIT:
+        present = np.bincount(ids[valid], minlength=n_cells) > 0
+        cells = np.flatnonzero(present)
+        ids[valid] = (np.cumsum(present) - 1)[ids[valid]]
+    else:
+        cells, inverse = np.unique(ids[valid], return_inverse=True)
+        ids[valid] = inverse
+    keys = np.unravel_index(cells, sizes)
+    if len(by) == 1:
+        index = levels[0][keys[0]].rename(by[0])
+    else:
+        index = pd.MultiIndex(levels=levels, codes=list(keys), names=by)
+    return ids, len(cells), index
+
+
+def groupby_count(df, by, col):
+    """Like df.groupby(by, observed=True)[col].nunique() - groups sorted, null keys dropped"""
+    by = [by] if isinstance(by, str) else list(by)
+    ids, n_groups, index = group_ids(df, by)
+    codes, n_keys = key_codes(df[col])
+    return pd.Series(grouped_count(ids, codes, n_groups, n_keys), index=index, name=col)
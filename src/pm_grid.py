@@ -0,0 +1,110 @@
+"""
+Paginated detail grids: sort, filter and page server-side, send only the visible rows.
+
+A detail table used to rebuild every filtered forecast row, rename the lot
+and ship it all to st.dataframe. A DetailGrid works on the row positions a
+bitmap index selects (pm_index) and the department's model (pm_model):
+
+- the output projection (which columns are shown, under which names, which
+  can be searched) is worked out once, when the grid is built
+- a text filter and a sort read one column for the selected rows
+  (a categorical is filtered on its categories, then by code)
+- only the page slice is rebuilt as a wide frame and renamed, with plain
+  values (no categorical dictionaries), so a page costs the same to send
+  whatever the department's size
+
+    grid = DetailGrid(model, hidden=['task_norm'], renames={'task_density': 'tasks_per_hour'}, index='PMNUM')
+    rows = grid.select(positions, sort='DUE_DATE', descending=True, search=('ZONENAME', 'paint'))
+    grid.page(rows, offset=200, limit=100)         # 100 rows, PMNUM index, output names
+    render(grid, positions, key='zone_detail')     # controls + page on a Streamlit page
+"""
+
+import numpy as np
+import pandas as pd
+
+import pm_profiler
+
+PAGE_SIZES = [50, 100, 500, 1000]
+PAGE_SIZE = 100
+
+SOURCE_ORDER = "(forecast order)"
+
+
+class DetailGrid:
+    """Output projection of a ForecastModel plus filter / sort / page over its row positions"""
+
+    def __init__(self, model, hidden=(), renames=None, index=None):
+        self.model = model
+        self.columns = [col for col in model.columns if col not in set(hidden)]   # model names, shown order
+        self.renames = dict(renames or {})
+        self.index = index
+        self.output = {self.renames.get(col, col): col for col in self.columns}   # output name -> model name
+        dtypes = model.wide(self.columns, rows=np.arange(0)).dtypes
+        # The index column (PM number) first, then the text columns in shown order
+        names = sorted(self.output, key=lambda name: name != index)
+        self.searchable = [name for name in names
+                           if not pd.api.types.is_numeric_dtype(dtypes[self.output[name]])
+                           and not pd.api.types.is_datetime64_any_dtype(dtypes[self.output[name]])]
+        self.sortable = names
+
+    def _values(self, name, rows):
+        col = self.output[name]
+        return self.model.wide([col], rows=rows)[col]
+
+    def _matches(self, name, rows, text):
+        """Rows whose value contains text (case-insensitive)"""
+        values = self._values(name, rows)
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            hits = values.cat.categories.astype(str).str.contains(text, case=False, regex=False)
+            return np.isin(values.cat.codes.to_numpy(), np.flatnonzero(hits))
+        return values.astype('string').str.contains(text, case=False, regex=False).fillna(False).to_numpy(dtype=bool)
+
+    def select(self, positions, sort=None, descending=False, search=None):
+        """Row positions after the text filter (output column, text) and the sort (stable, missing last)"""
+        rows = np.asarray(positions, dtype=np.int64)
+        if search is not None and search[1]:
+            rows = rows[self._matches(search[0], rows, search[1])]
+        if sort is not None and len(rows):
+            values = self._values(sort, rows).reset_index(drop=True)
+            order = values.sort_values(ascending=not descending, na_position='last', kind='stable').index
+            rows = rows[order.to_numpy()]
+        return rows
+
+    def page(self, rows, offset=0, limit=PAGE_SIZE):
+        """Wide frame of rows[offset:offset + limit] - output names, index column set"""
+        frame = self.model.wide(self.columns, rows=rows[offset:offset + limit]).rename(columns=self.renames)
+        # Plain values: a categorical would ship its whole dictionary (every PM, location...) with the page
+        for col in frame.columns[frame.dtypes == 'category']:
+            frame[col] = np.asarray(frame[col])
+        return frame.set_index(self.index) if self.index is not None else frame
+
+
+def render(grid, positions, key, note=""):
+    """Sort / search / page controls and the visible page; widget state is kept under key"""
+    import streamlit as st
+
+    col1, col2, col3, col4, col5 = st.columns([3, 1, 3, 3, 2])
+    with col1:
+        sort = st.selectbox("Sort by", [SOURCE_ORDER] + grid.sortable, key=f"{key}_sort")
+    with col2:
+        st.markdown("<div style='height: 1.9rem'></div>", unsafe_allow_html=True)
+        descending = st.toggle("Desc", key=f"{key}_desc")
+    with col3:
+        search_col = st.selectbox("Search in", grid.searchable, key=f"{key}_search_col")
+    with col4:
+        search_text = st.text_input("Contains", key=f"{key}_search")
+    with col5:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(PAGE_SIZE), key=f"{key}_size")
+
+    with pm_profiler.section(f"grid select: {key}"):
+        rows = grid.select(positions, sort=None if sort == SOURCE_ORDER else sort, descending=descending,
+                           search=(search_col, search_text.strip()))
+    n_pages = max(1, -(-len(rows) // page_size))
+    page = min(int(st.number_input("Page", min_value=1, value=1, step=1, key=f"{key}_page")), n_pages)
+    offset = (page - 1) * page_size
+    with pm_profiler.section(f"grid page: {key}"):
+        frame = grid.page(rows, offset, page_size)
+
+    shown = f"rows {offset + 1:,}-{offset + len(frame):,}" if len(frame) else "no rows"
+    st.markdown(f"**Showing {len(rows):,} records** ({shown}, page {page:,} of {n_pages:,}){note}")
+    pm_profiler.dataframe(frame, use_container_width=True, height=400)
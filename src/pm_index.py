@@ -0,0 +1,93 @@
+"""
+Bitmap index over categorical filter columns.
+
+One packed bitmap (1 bit per row) is built per level of each indexed column.
+Filters are answered by OR-ing the bitmaps of the selected levels within a
+column and AND-ing across columns - no column scans and no DataFrame copies.
+The result converts to row positions, and callers pull only the columns they
+aggregate:
+
+    index = build_index(path2, ['DEPT_NAME', 'INTERVAL', 'JOB_TYPE'])
+    rows = index.positions({'DEPT_NAME': ['PAINT 1', 'PAINT 2'], 'JOB_TYPE': 'REPAIR'})
+    path2['completion_rate'].to_numpy()[rows].mean()
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class BitmapIndex:
+    """Packed bitmaps per (column, level); filters combine with & (AND) and | (OR)"""
+
+    def __init__(self, n_rows, bitmaps, nulls):
+        self.n_rows = n_rows
+        self.bitmaps = bitmaps  # {column: {level: packed uint8 bitmap}}
+        self.nulls = nulls      # {column: packed bitmap of missing values}
+        self._empty = np.zeros((n_rows + 7) // 8, dtype=np.uint8)
+        self._all = np.packbits(np.ones(n_rows, dtype=bool), bitorder='little')
+
+    def all(self):
+        return self._all.copy()
+
+    def level(self, col, value):
+        """Bitmap of rows where col == value"""
+        return self.bitmaps[col].get(value, self._empty)
+
+    def any_of(self, col, values):
+        """Bitmap of rows where col is one of values (OR)"""
+        bits = self._empty.copy()
+        for value in values:
+            bits |= self.level(col, value)
+        return bits
+
+    def not_null(self, col):
+        return self._all & ~self.nulls[col]
+
+    def select(self, filters=None):
+        """{col: value | [values]} -> bitmap. Values OR within a column, columns AND together
+        (same semantics as pm_cube / pm_store filters, so an empty list matches nothing)"""
+        bits = self.all()
+        for col, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                bits &= self.any_of(col, value)
+            else:
+                bits &= self.level(col, value)
+        return bits
+
+    def to_positions(self, bits):
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows, bitorder='little'))
+
+    def positions(self, filters=None):
+        """Row positions matching filters (see select)"""
+        return self.to_positions(self.select(filters))
+
+    def values(self, col, bits):
+        """Levels of col that occur in the selected rows"""
+        return [level for level, level_bits in self.bitmaps[col].items() if (level_bits & bits).any()]
+
+    def count(self, bits):
+        return int(np.unpackbits(bits, count=self.n_rows, bitorder='little').sum())
+
+
+def build_index(df, columns):
+    """Builds one bitmap per level of each column"""
+    bitmaps, nulls = {}, {}
+    for col in columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            codes, levels = df[col].cat.codes.to_numpy(), df[col].cat.categories
+        else:
+            codes, levels = pd.factorize(df[col])
+
+        # Sort row positions by code once, then each level is a contiguous slice
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(-1, len(levels) + 1))
+
+        def packed(rows):
+            bits = np.zeros(len(df), dtype=bool)
+            bits[rows] = True
+            return np.packbits(bits, bitorder='little')
+
+        bitmaps[col] = {level: packed(order[bounds[k + 1]:bounds[k + 2]])
+                        for k, level in enumerate(levels)}
+        nulls[col] = packed(order[bounds[0]:bounds[1]])
+    return BitmapIndex(len(df), bitmaps, nulls)
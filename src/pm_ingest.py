@@ -0,0 +1,104 @@
+"""
+Streaming ingest of the raw Maximo forecast export.
+
+A single pd.read_csv of 103ki_pm_forecast.csv holds every text column as
+Python strings before categorizing and parsing dates, so peak memory is a few
+times the final frame. Here the CSV is read in chunks with a fixed schema and
+an explicit date format, categories are unified across chunks as new values
+show up, and each chunk goes straight into a Parquet file. Peak memory is
+bounded by the chunk size instead of the file size.
+
+    ingest_forecast('data/103ki_pm_forecast.csv', 'outputs/.pipeline_cache/forecast_raw')
+    df = read_forecast('outputs/.pipeline_cache/forecast_raw')  # same frame as a full read_csv
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import pm_store
+
+CHUNK_ROWS = 100_000
+ENCODING = 'cp1252'
+DATE_FORMAT = '%Y-%m-%d'
+
+# Fixed schema of the forecast export. Numbers are float64 in every chunk
+# (a chunk without missing values would otherwise come back as int64).
+DATE_COLUMNS = ['DUE_DATE']
+TEXT_COLUMNS = ['PMNUM', 'COUNTKEY', 'PMDESCRIPTION', 'FORECASTJP', 'LOCATION', 'LOCATIONDESC']
+NUMBER_COLUMNS = ['PLANNED_LABORERS', 'PLANNED_LABOR_HRS', 'TOTAL_MATERIAL_COST', 'TASK_COUNT',
+                  'TOTAL_TASK_DESC_LENGTH']
+CATEGORY_COLUMNS = ['INTERVAL', 'JOB_TYPE', 'LABOR_CRAFT', 'PMSCOPETYPE', 'DEPT', 'DEPT_NAME',
+                    'DEPT_TYPE', 'PLANT', 'LINE', 'ZONENAME', 'PROCESSNAME']
+
+ARROW_TYPES = {
+    **{col: pa.timestamp('ns') for col in DATE_COLUMNS},
+    **{col: pa.string() for col in TEXT_COLUMNS},
+    **{col: pa.float64() for col in NUMBER_COLUMNS},
+    **{col: pa.dictionary(pa.int32(), pa.string()) for col in CATEGORY_COLUMNS},
+}
+
+
+def read_header(path):
+    """Column names of the export; anything outside the fixed schema is an error"""
+    columns = pd.read_csv(path, encoding=ENCODING, nrows=0).columns.tolist()
+    unknown = [col for col in columns if col not in ARROW_TYPES]
+    if unknown:
+        raise ValueError(f"{path}: columns not in the forecast schema: {unknown}")
+    return columns
+
+
+def fill_facilities(df):
+    """Facilities departments come without a DEPT_NAME in the export"""
+    df['DEPT_NAME'] = np.where(
+        df['DEPT'].str.startswith('FA', na=False) & df['DEPT_NAME'].isna(),
+        'FACILITIES',
+        df['DEPT_NAME']
+    )
+    return df
+
+
+def unify_categories(chunk, known):
+    """Re-codes the chunk's categoricals against the categories seen so far (extended in place)"""
+    for col in CATEGORY_COLUMNS:
+        if col not in chunk.columns:
+            continue
+        values = chunk[col]
+        seen = known.get(col, pd.Index([], dtype=object))
+        new = pd.Index(values.dropna().unique()).difference(seen, sort=False)
+        known[col] = seen.append(new.astype(object))
+        chunk[col] = pd.Categorical(values, categories=known[col])
+    return chunk
+
+
+def read_chunks(path, columns, chunk_rows=CHUNK_ROWS):
+    """Typed chunks of the forecast export with unified categories"""
+    dtypes = {col: 'category' if col in CATEGORY_COLUMNS else 'float64' if col in NUMBER_COLUMNS else str
+              for col in columns}
+    known = {}
+    with pd.read_csv(path, encoding=ENCODING, dtype=dtypes, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            for col in DATE_COLUMNS:
+                if col in chunk.columns:
+                    chunk[col] = pd.to_datetime(chunk[col], format=DATE_FORMAT)
+            if 'DEPT_NAME' in chunk.columns:
+                fill_facilities(chunk)
+            yield unify_categories(chunk, known)
+
+
+def ingest_forecast(path, out_path, chunk_rows=CHUNK_ROWS):
+    """Streams the forecast CSV into a Parquet dataset at out_path"""
+    columns = read_header(path)
+    schema = pa.schema([(col, ARROW_TYPES[col]) for col in columns])
+    pm_store.write_chunks(read_chunks(path, columns, chunk_rows), out_path, schema)
+
+
+def read_forecast(path):
+    """Ingested forecast as a frame, typed like a one-shot read_csv (sorted categories, text DEPT_NAME)"""
+    df = pm_store.read_dataset(path)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    if 'DEPT_NAME' in df.columns:
+        df['DEPT_NAME'] = df['DEPT_NAME'].astype(object)
+    return df
@@ -0,0 +1,86 @@
+"""
+INTERVAL parsing shared by the pipeline stages.
+
+INTERVAL has a few dozen distinct values ('1-MONTHS', '2-WEEKS', ...) over
+~100k rows, so each distinct string is parsed once (memoized) into a lookup
+table - interval_number, interval_unit, interval_days, interval_category - and
+rows pick up their entry through categorical codes instead of a regex pass
+per row. A value that does not parse raises IntervalError rather than
+quietly becoming NaN.
+
+    df['interval_days'] = lookup(df['INTERVAL'], 'interval_days')
+    interval_table(['1-MONTHS', '2-WEEKS'])     # one row per distinct interval
+"""
+
+import re
+from functools import lru_cache
+
+import pandas as pd
+
+import pm_derive
+
+INTERVAL_PATTERN = re.compile(r'^(\d+)-([A-Z]+)$')
+
+# Unit -> days used for interval_days / interval_category (Path 1 features)
+UNIT_DAYS = {
+    'DAYS': 1,
+    'WEEKS': 7,
+    'MONTHS': 30.42,
+    'YEARS': 365.25,
+}
+
+
+class IntervalError(ValueError):
+    """INTERVAL values that are not '<number>-<DAYS|WEEKS|MONTHS|YEARS>' (listed in .values)"""
+
+    def __init__(self, message, values):
+        super().__init__(message)
+        self.values = values
+
+
+@lru_cache(maxsize=None)
+def parse(value):
+    """'3-MONTHS' -> (3, 'MONTHS')"""
+    match = INTERVAL_PATTERN.match(str(value).strip().upper())
+    if match is None or match.group(2) not in UNIT_DAYS:
+        raise IntervalError(f"Unrecognized INTERVAL {value!r}", [value])
+    return int(match.group(1)), match.group(2)
+
+
+def interval_table(values, unit_days=UNIT_DAYS):
+    """Lookup table indexed by the distinct interval strings; every bad value is reported at once"""
+    values = pd.Index(pd.unique(pd.Series(values).dropna().astype(str)))
+    bad = []
+    parsed = []
+    for value in values:
+        try:
+            parsed.append(parse(value))
+        except IntervalError:
+            bad.append(value)
+    if bad:
+        raise IntervalError(f"Unrecognized INTERVAL values: {sorted(bad)}", sorted(bad))
+
+    table = pd.DataFrame(parsed, index=values, columns=['interval_number', 'interval_unit'])
+    table['interval_number'] = table['interval_number'].astype(float)
+    table['interval_days'] = table['interval_number'] * table['interval_unit'].map(unit_days)
+    table['interval_category'] = pm_derive.interval_category(table['interval_days'])
+    return table
+
+
+def lookup(intervals, column, unit_days=UNIT_DAYS):
+    """Per-row value of a table column, mapped through the categorical codes (NaN stays NaN)"""
+    intervals = pd.Series(intervals)
+    if not isinstance(intervals.dtype, pd.CategoricalDtype):
+        intervals = intervals.astype('category')
+    cat = intervals.cat
+    table = interval_table(cat.categories, unit_days)
+    # Table rows line up with the categories (both in category order)
+    values = table[column].reset_index(drop=True).array.take(cat.codes.to_numpy(), allow_fill=True)
+    return pd.Series(values, index=intervals.index, name=column)
+
+
+def ordered(intervals, unit_days=UNIT_DAYS):
+    """Distinct intervals present, shortest -> longest (ties by name)"""
+    table = interval_table(intervals, unit_days)
+    return (table.rename_axis('INTERVAL').reset_index()
+            .sort_values(['interval_days', 'INTERVAL'])['INTERVAL'].tolist())
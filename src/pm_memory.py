@@ -0,0 +1,116 @@
+"""
+Memory accounting for multi-user deployments of the dashboard.
+
+Datasets loaded once per process (pm_data, PM_CACHE_MODE=shared) are
+registered here with their size; each session's private state
+(st.session_state) is measured at the end of its rerun. The report lists the
+process RSS, every shared dataset once and one line per session seen:
+
+    pm_memory.register('forecast', df)          # inside a cached loader
+    pm_memory.record_session(session_id, st.session_state)  # or sidebar_panel(st.session_state)
+    pm_memory.report()                          # scope, item, MB
+"""
+
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+MB = 1024 ** 2
+
+# Sessions not seen for this long drop out of the report
+SESSION_TTL_SECONDS = 3600
+
+_lock = threading.Lock()
+_shared = {}    # name -> bytes
+_sessions = {}  # session id -> (bytes, last seen)
+
+
+def nbytes(obj, seen=None):
+    """Approximate deep size of frames, arrays and the containers / cache objects holding them.
+
+    Every object is counted once (by id), so shared references count once and cycles terminate.
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True, index=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sum(nbytes(k, seen) + nbytes(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(nbytes(v, seen) for v in obj)
+    if hasattr(obj, '__dict__'):
+        return nbytes(vars(obj), seen)
+    return sys.getsizeof(obj)
+
+
+def rss_bytes():
+    """Current resident set size (peak RSS where /proc is not available)"""
+    try:
+        with open('/proc/self/status') as f:
+            return next(int(line.split()[1]) * 1024 for line in f if line.startswith('VmRSS'))
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def register(name, obj):
+    """Records a dataset held once per process; returns it unchanged"""
+    with _lock:
+        _shared[name] = nbytes(obj)
+    return obj
+
+
+def forget(prefix):
+    """Drops the datasets whose name starts with prefix (e.g. a retired dataset version)"""
+    with _lock:
+        for name in [n for n in _shared if n.startswith(prefix)]:
+            del _shared[name]
+
+
+def record_session(session_id, session_state):
+    """Measures one session's private state (call at the end of its rerun)"""
+    seen = set()
+    size = sum(nbytes(value, seen) for value in dict(session_state).values())
+    now = time.time()
+    with _lock:
+        _sessions[session_id] = (size, now)
+        for key in [k for k, (_, seen) in _sessions.items() if now - seen > SESSION_TTL_SECONDS]:
+            del _sessions[key]
+
+
+def report(current=None):
+    """One row per process / shared dataset / session, in MB"""
+    with _lock:
+        shared = sorted(_shared.items())
+        sessions = sorted(_sessions.items(), key=lambda item: -item[1][0])
+    rows = [('process', 'RSS', rss_bytes() / MB),
+            ('shared', 'all datasets', sum(size for _, size in shared) / MB)]
+    rows += [('shared', name, size / MB) for name, size in shared]
+    rows += [('session', f"{sid[:8]}{' (this)' if sid == current else ''}", size / MB)
+             for sid, (size, _) in sessions]
+    return pd.DataFrame(rows, columns=['scope', 'item', 'MB'])
+
+
+def sidebar_panel(session_state):
+    """Memory panel: process RSS, shared datasets and per-session state"""
+    import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    session_id = ctx.session_id if ctx is not None else 'local'
+    record_session(session_id, session_state)
+    table = report(session_id)
+    with st.sidebar.expander("🧠 Memory", expanded=False):
+        st.metric("Process RSS", f"{table['MB'].iloc[0]:,.0f} MB")
+        st.caption(f"{(table['scope'] == 'session').sum()} sessions, datasets shared once per process")
+        st.dataframe(table, hide_index=True, use_container_width=True,
+                     column_config={'MB': st.column_config.NumberColumn(format='%.1f')})
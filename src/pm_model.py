@@ -0,0 +1,171 @@
+"""
+Normalized in-memory forecast: PM dimension, occurrences, craft labor.
+
+The forecast export has one row per (COUNTKEY, LABOR_CRAFT), so everything
+that belongs to the PM - description, job plan, department, location - is
+repeated on every craft row of every occurrence. The model keeps each column
+once, at the coarsest level where it is constant (detected from the data):
+
+    pms          one row per PMNUM                       PM attributes
+    occurrences  one row per COUNTKEY, pm = int32 row of pms    due date, occurrence values
+    labor        one row per forecast row, occurrence = int32 row of occurrences    craft values
+
+Labor rows keep the source order, so a position into the wide frame is a
+position into `labor` and bitmap indexes built on either line up.
+Per-occurrence totals are segment reductions over the occurrence ids, and
+grouped sums run on integer codes carried down the ids. The wide view is
+rebuilt only for the rows a detail table shows.
+
+    model = build_model(forecast)
+    model.wide(rows=positions)                              # detail table rows
+    model.occurrence_sum('total_labor_hrs')                 # one total per occurrence
+    model.group_sum('DEPT_NAME', 'PLANNED_LABOR_HRS')       # == groupby('DEPT_NAME')[...].sum()
+    segment_sum(df['COUNTKEY'], df['total_labor_hrs'])      # == groupby('COUNTKEY')[...].transform('sum')
+"""
+
+import numpy as np
+import pandas as pd
+
+import pm_distinct
+
+PM_KEY = 'PMNUM'
+OCCURRENCE_KEY = 'COUNTKEY'
+
+LEVELS = ['pm', 'occurrence', 'labor']
+
+
+def segment_sum(keys, values):
+    """Total of values over the rows sharing each key, on every row (NaN values count as 0, NaN keys give NaN)"""
+    codes, n_keys = pm_distinct.key_codes(keys)
+    values = np.nan_to_num(np.asarray(values, dtype=float))
+    valid = codes >= 0
+    totals = np.bincount(codes[valid], weights=values[valid], minlength=n_keys)
+    out = np.full(len(codes), np.nan)
+    out[valid] = totals[codes[valid]]
+    return out
+
+
+def _ids(values):
+    """Row -> group id in order of first appearance; every null key is a group of its own"""
+    codes, uniques = pd.factorize(values)
+    codes = codes.astype(np.int64)
+    missing = codes < 0
+    codes[missing] = len(uniques) + np.arange(missing.sum())
+    return codes, len(uniques) + int(missing.sum())
+
+
+def _constant_within(values, ids, n_groups):
+    """True when values never differ within a group (null is a value of its own)"""
+    codes, n_keys = pm_distinct.key_codes(values)
+    codes = np.where(codes < 0, n_keys, codes)
+    return pm_distinct.grouped_count(ids, codes, n_groups, n_keys + 1).max(initial=0) <= 1
+
+
+def _compact(df):
+    """Repeated text -> categorical, unique text -> Arrow strings (no Python object per value).
+
+    Categoricals keep only the categories their rows use: a filtered store read
+    carries the dictionary of the whole dataset (every PM, description, job plan).
+    """
+    for col in df.select_dtypes(include='category').columns:
+        df[col] = df[col].cat.remove_unused_categories()
+    for col in df.select_dtypes(include='object').columns:
+        if df[col].nunique() < 0.5 * len(df):
+            df[col] = df[col].astype('category')
+        else:
+            df[col] = df[col].astype('string[pyarrow]')
+    return df
+
+
+class ForecastModel:
+    """PM / occurrence / labor tables of one forecast frame, joined back on demand"""
+
+    def __init__(self, pms, occurrences, labor, columns, level):
+        self.pms = pms                   # PM_KEY + PM attributes
+        self.occurrences = occurrences   # 'pm' + OCCURRENCE_KEY + occurrence values
+        self.labor = labor               # 'occurrence' + labor values, in source row order
+        self.columns = columns           # wide column order
+        self.level = level               # column -> 'pm' | 'occurrence' | 'labor'
+
+    def __len__(self):
+        return len(self.labor)
+
+    def _table(self, level):
+        return {'pm': self.pms, 'occurrence': self.occurrences, 'labor': self.labor}[level]
+
+    def _ids(self, level, rows=None):
+        """Row of `level` for every labor row (or the given labor positions)"""
+        occurrence = self.labor['occurrence'].to_numpy()
+        if rows is not None:
+            occurrence = occurrence[rows]
+        if level == 'labor':
+            return np.arange(len(self.labor)) if rows is None else np.asarray(rows)
+        if level == 'occurrence':
+            return occurrence
+        return self.occurrences['pm'].to_numpy()[occurrence]
+
+    def wide(self, columns=None, rows=None):
+        """The forecast rows as one frame (all rows, or the labor positions given), like df.iloc[rows]"""
+        columns = self.columns if columns is None else list(columns)
+        ids = {level: self._ids(level, rows) for level in {self.level[col] for col in columns}}
+        index = pd.RangeIndex(len(self.labor)) if rows is None else pd.Index(np.asarray(rows))
+        return pd.DataFrame({col: self._table(self.level[col])[col].take(ids[self.level[col]]).set_axis(index)
+                             for col in columns}, index=index)
+
+    def column(self, col, rows=None):
+        """One column per forecast row, as a NumPy array"""
+        return self._table(self.level[col])[col].to_numpy()[self._ids(self.level[col], rows)]
+
+    def occurrence_sum(self, col):
+        """Sum of a labor column per occurrence (segment reduction over the occurrence ids)"""
+        return np.bincount(self.labor['occurrence'].to_numpy(),
+                           weights=np.nan_to_num(self.labor[col].to_numpy(dtype=float)),
+                           minlength=len(self.occurrences))
+
+    def group_sum(self, by, col):
+        """Like wide.groupby(by, observed=True)[col].sum() - grouped on integer codes"""
+        table = self._table(self.level[by])
+        codes, uniques = (table[by].cat.codes.to_numpy(), table[by].cat.categories) \
+            if isinstance(table[by].dtype, pd.CategoricalDtype) else pd.factorize(table[by], sort=True)
+        groups = codes[self._ids(self.level[by])]
+        values = np.nan_to_num(self.column(col).astype(float))
+        valid = groups >= 0
+        sums = np.bincount(groups[valid], weights=values[valid], minlength=len(uniques))
+        present = np.bincount(groups[valid], minlength=len(uniques)) > 0
+        return pd.Series(sums[present], index=pd.Index(uniques[present], name=by), name=col)
+
+    def memory_usage(self):
+        """Bytes per table (deep)"""
+        return {level: int(self._table(level).memory_usage(deep=True, index=True).sum()) for level in LEVELS}
+
+
+def build_model(df):
+    """Splits a wide forecast frame (PM_KEY and OCCURRENCE_KEY columns required) into the three tables"""
+    pm_ids, n_pms = _ids(df[PM_KEY])
+    occurrence_ids, n_occurrences = _ids(df[OCCURRENCE_KEY])
+    if not _constant_within(df[PM_KEY], occurrence_ids, n_occurrences):
+        raise ValueError(f"{OCCURRENCE_KEY} values spanning several {PM_KEY}s - not an occurrence key")
+
+    level = {PM_KEY: 'pm', OCCURRENCE_KEY: 'occurrence'}
+    for col in df.columns:
+        if col in level:
+            continue
+        if _constant_within(df[col], pm_ids, n_pms):
+            level[col] = 'pm'
+        elif _constant_within(df[col], occurrence_ids, n_occurrences):
+            level[col] = 'occurrence'
+        else:
+            level[col] = 'labor'
+    columns = list(df.columns)
+    at = {name: [col for col in columns if level[col] == name] for name in LEVELS}
+
+    # First row of every PM / occurrence (ids are numbered in order of first appearance)
+    first_pm = np.unique(pm_ids, return_index=True)[1]
+    first_occurrence = np.unique(occurrence_ids, return_index=True)[1]
+
+    pms = _compact(df[at['pm']].iloc[first_pm].reset_index(drop=True))
+    occurrences = _compact(df[at['occurrence']].iloc[first_occurrence].reset_index(drop=True))
+    occurrences.insert(0, 'pm', pm_ids[first_occurrence].astype(np.int32))
+    labor = _compact(df[at['labor']].reset_index(drop=True))
+    labor.insert(0, 'occurrence', occurrence_ids.astype(np.int32))
+    return ForecastModel(pms, occurrences, labor, columns, level)
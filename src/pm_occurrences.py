@@ -0,0 +1,135 @@
+"""
+Rolling-horizon occurrence generator.
+
+The forecast export is a static 12-month list of COUNTKEY rows. Here each
+PM's INTERVAL (interval_number + interval_unit, from pm_interval) is rolled
+forward from its last due date with NumPy date arithmetic - DAYS/WEEKS as day
+steps, MONTHS/YEARS on the calendar with the day of month clamped - so the
+forecast can be extended to any horizon without a bigger export. Occurrences
+are generated CHUNK_PMS PMs at a time; a generated occurrence copies the craft
+rows of the PM's last occurrence in the export (one COUNTKEY per PM). The
+extended forecast is streamed to Parquet chunk by chunk, never concatenated
+in memory.
+
+    for chunk in generate_occurrences(forecast, end='2029-04-01'):
+        ...
+    extend_forecast(forecast, 36, out_path)        # export + generated rows -> Parquet
+    pm_ingest.read_forecast(out_path)
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import pm_ingest
+import pm_interval
+import pm_store
+
+CHUNK_PMS = 5000
+
+# Unit -> (calendar 'D' days or 'M' months, steps per interval_number)
+UNIT_STEPS = {
+    'DAYS': ('D', 1),
+    'WEEKS': ('D', 7),
+    'MONTHS': ('M', 1),
+    'YEARS': ('M', 12),
+}
+
+
+def parse_interval(interval):
+    """'3-MONTHS' -> interval_number 3.0, interval_unit 'MONTHS' (see pm_interval)"""
+    return pd.DataFrame({col: pm_interval.lookup(interval, col).to_numpy()
+                         for col in ['interval_number', 'interval_unit']})
+
+
+def last_occurrences(forecast):
+    """Craft rows of each PM's last occurrence (templates for generated ones), grouped by PMNUM.
+
+    One occurrence per PM: the latest COUNTKEY on the PM's last due date, so
+    a PM with several occurrences due that day does not repeat its crafts.
+    """
+    last_due = forecast.groupby('PMNUM', observed=True)['DUE_DATE'].transform('max')
+    last = forecast[forecast['DUE_DATE'] == last_due]
+    countkey = last['COUNTKEY'].astype(str)
+    last = last[countkey == countkey.groupby(last['PMNUM'], observed=True).transform('max')]
+    return last.sort_values('PMNUM', kind='stable').reset_index(drop=True)
+
+
+def next_due_dates(last_due, interval_number, interval_unit, end):
+    """(PM position, due date) of every occurrence after last_due and before end"""
+    last_due = np.asarray(last_due, dtype='datetime64[D]')
+    end = np.datetime64(pd.Timestamp(end).date(), 'D')
+    unit = pd.Series(interval_unit, dtype=object)
+    calendar = unit.map(lambda u: UNIT_STEPS.get(u, (None, 0))[0]).to_numpy()
+    step = np.nan_to_num(np.asarray(interval_number, dtype=float)
+                         * unit.map(lambda u: UNIT_STEPS.get(u, (None, 0))[1]).to_numpy(dtype=float)).astype(int)
+    monthly = calendar == 'M'
+
+    # Upper bound on occurrences per PM (month-based ones are trimmed to < end below)
+    days_left = (end - last_due).astype(int)
+    months_left = (end.astype('datetime64[M]') - last_due.astype('datetime64[M]')).astype(int)
+    count = np.where(monthly, months_left, days_left - 1) // np.maximum(step, 1)
+    count = np.where((step > 0) & (days_left > 0), np.maximum(count, 0), 0)
+
+    pm = np.repeat(np.arange(len(last_due)), count)
+    k = np.arange(len(pm)) - np.repeat(np.cumsum(count) - count, count) + 1
+    base = last_due[pm]
+    offset = k * step[pm]
+
+    # Calendar months: same day of month as the last due date, clamped to the month's length
+    month = base.astype('datetime64[M]') + offset
+    month_start = month.astype('datetime64[D]')
+    month_days = ((month + 1).astype('datetime64[D]') - month_start).astype(int)
+    day = (base - base.astype('datetime64[M]').astype('datetime64[D]')).astype(int)
+    due = np.where(monthly[pm], month_start + np.minimum(day, month_days - 1), base + offset)
+
+    keep = due < end
+    return pm[keep], due[keep]
+
+
+def _countkeys(due, pmnum):
+    """COUNTKEY as in the export: 'YYYY-MM-DD-PMNUM' (dates formatted once per distinct day)"""
+    codes, days = pd.factorize(due)
+    labels = pd.DatetimeIndex(days).strftime('%Y-%m-%d').to_numpy(dtype=object)
+    return labels[codes] + '-' + pmnum.astype(str)
+
+
+def generate_occurrences(forecast, end, chunk_pms=CHUNK_PMS):
+    """Yields forecast-shaped chunks of occurrences after each PM's last due date, up to end"""
+    templates = last_occurrences(forecast)
+    first_row, n_rows = np.unique(templates['PMNUM'].to_numpy(), return_index=True, return_counts=True)[1:]
+    pms = templates.iloc[first_row].reset_index(drop=True)
+    parsed = parse_interval(pms['INTERVAL'])
+
+    for start in range(0, len(pms), chunk_pms):
+        batch = slice(start, start + chunk_pms)
+        pm, due = next_due_dates(pms['DUE_DATE'].to_numpy()[batch],
+                                 parsed['interval_number'].to_numpy()[batch],
+                                 parsed['interval_unit'].to_numpy()[batch], end)
+        if len(pm) == 0:
+            continue
+        pm += start
+
+        # Every occurrence repeats its PM's template rows
+        per_occ = n_rows[pm]
+        occ = np.repeat(np.arange(len(pm)), per_occ)
+        rows = first_row[pm][occ] + np.arange(len(occ)) - np.repeat(np.cumsum(per_occ) - per_occ, per_occ)
+
+        chunk = templates.iloc[rows].reset_index(drop=True)
+        chunk['DUE_DATE'] = due[occ].astype('datetime64[ns]')
+        chunk['COUNTKEY'] = _countkeys(chunk['DUE_DATE'].to_numpy(), chunk['PMNUM'].to_numpy())
+        yield chunk
+
+
+def extend_forecast(forecast, months, out_path):
+    """Streams the export + occurrences up to `months` after its first month into a Parquet dataset.
+
+    Written one chunk at a time with the ingest schema; read it back with
+    pm_ingest.read_forecast.
+    """
+    end = forecast['DUE_DATE'].min().to_period('M').to_timestamp() + pd.DateOffset(months=months or 0)
+    schema = pa.schema([(col, pm_ingest.ARROW_TYPES[col]) for col in forecast.columns])
+    chunks = generate_occurrences(forecast, end) if months else iter(())
+    pm_store.write_chunks(itertools.chain([forecast], chunks), out_path, schema)
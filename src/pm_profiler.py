@@ -0,0 +1,205 @@
+"""
+Opt-in rerun profiler for the dashboard.
+
+Turn it on with ?profile=1 in the URL (or PM_PROFILE=1 in the environment).
+Every rerun then records wall time, rows scanned and bytes sent to the browser
+per section, shows them in a "Performance" panel in the sidebar and offers
+them as JSON lines (one record per section) for offline comparison. With
+profiling off every hook returns immediately.
+
+    checkpoint("Department Workload Calendar")  # times everything up to the next checkpoint
+    with section("KPI cards"):
+        ...
+    record("compute: zones", 12.5, kind='compute')  # timed on another thread
+    @profiled()
+    def load_forecast(...): ...
+    plotly_chart(fig, use_container_width=True)  # st.plotly_chart + payload size (or a cached FigureJSON)
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+
+# Streamlit runs each session's script in its own thread
+_state = threading.local()
+
+# Runs kept per browser session for the panel / export
+HISTORY_SIZE = 50
+
+# Optional file every finished run is appended to (JSON lines)
+LOG_ENV = 'PM_PROFILE_LOG'
+
+
+def requested(query_params=None):
+    """Profiling is on for ?profile=1 or PM_PROFILE=1"""
+    if os.environ.get('PM_PROFILE') == '1':
+        return True
+    return query_params is not None and query_params.get('profile') == '1'
+
+
+def enabled():
+    return getattr(_state, 'run', None) is not None
+
+
+def start_run(page):
+    _state.run = {'page': page, 'started': time.time(), 'records': []}
+    _state.open = []
+    _state.lap = None
+
+
+def _open(name, kind):
+    rec = {'section': name, 'kind': kind, 'depth': len(_state.open),
+           'ms': 0.0, 'rows': 0, 'bytes': 0, '_start': time.perf_counter()}
+    _state.open.append(rec)
+    _state.run['records'].append(rec)
+    return rec
+
+
+def _close(rec):
+    rec['ms'] = round((time.perf_counter() - rec.pop('_start')) * 1000, 2)
+    _state.open.remove(rec)
+
+
+@contextmanager
+def section(name, kind='section'):
+    """Times the enclosed block"""
+    if not enabled():
+        yield None
+        return
+    rec = _open(name, kind)
+    try:
+        yield rec
+    finally:
+        _close(rec)
+
+
+def profiled(name=None):
+    """Decorator version of section(); DataFrame results count as rows scanned"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled():
+                return func(*args, **kwargs)
+            with section(name or func.__name__, kind='call'):
+                result = func(*args, **kwargs)
+                if isinstance(result, pd.DataFrame):
+                    scanned(len(result))
+                return result
+        return wrapper
+    return decorator
+
+
+def checkpoint(name):
+    """Ends the previous checkpoint block and starts a new one (for flat page scripts)"""
+    if not enabled():
+        return
+    if _state.lap is not None:
+        _close(_state.lap)
+    _state.lap = _open(name, 'block')
+
+
+def record(name, ms, kind='section', **values):
+    """Adds a record timed elsewhere (e.g. a section computed on a worker thread)"""
+    if enabled():
+        _state.run['records'].append({'section': name, 'kind': kind, 'depth': len(_state.open),
+                                      'ms': round(ms, 2), 'rows': 0, 'bytes': 0, **values})
+
+
+def scanned(rows):
+    """Adds rows scanned to every open section"""
+    if enabled():
+        for rec in _state.open:
+            rec['rows'] += int(rows)
+
+
+def serialized(nbytes):
+    """Adds bytes sent to the browser to every open section"""
+    if enabled():
+        for rec in _state.open:
+            rec['bytes'] += int(nbytes)
+
+
+def finish_run():
+    """Closes whatever is still open and returns the run (None when profiling is off)"""
+    if not enabled():
+        return None
+    while _state.open:
+        _close(_state.open[-1])
+    run = _state.run
+    _state.run = None
+    run['total_ms'] = round((time.time() - run['started']) * 1000, 2)
+    return run
+
+
+def to_jsonl(runs):
+    """One JSON object per section record"""
+    lines = []
+    for run in runs:
+        for rec in run['records']:
+            lines.append(json.dumps({'started': run['started'], 'page': run['page'],
+                                     'total_ms': run['total_ms'], **rec}))
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+# =============================================================================
+# STREAMLIT WRAPPERS
+# =============================================================================
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart, timed, with the figure's JSON size as bytes sent.
+
+    fig may also be a pre-serialized pm_charts.FigureJSON (pm_data.cached_figure), sent as is.
+    With profiling on, a figure is serialized once and that payload is both measured and sent.
+    """
+    import streamlit as st
+    import pm_charts
+
+    if not enabled():
+        if isinstance(fig, pm_charts.FigureJSON):
+            return pm_charts.send_json(fig, **kwargs)
+        return st.plotly_chart(fig, **kwargs)
+    title = fig.title if isinstance(fig, pm_charts.FigureJSON) else fig.layout.title.text
+    with section(f"chart: {title or 'untitled'}", kind='render'):
+        chart = fig if isinstance(fig, pm_charts.FigureJSON) else pm_charts.FigureJSON(fig)
+        serialized(len(chart))
+        return pm_charts.send_json(chart, **kwargs)
+
+
+def dataframe(data, **kwargs):
+    """st.dataframe, timed, with the Arrow size of the table as bytes sent"""
+    import pyarrow as pa
+    import streamlit as st
+
+    if not enabled():
+        return st.dataframe(data, **kwargs)
+    with section(f"table: {len(data):,} rows", kind='render'):
+        scanned(len(data))
+        serialized(pa.Table.from_pandas(data).nbytes)
+        return st.dataframe(data, **kwargs)
+
+
+def sidebar_panel(run):
+    """Performance panel: this rerun's sections + JSONL export of the session's runs"""
+    import streamlit as st
+
+    history = st.session_state.setdefault('perf_runs', [])
+    history.append(run)
+    del history[:-HISTORY_SIZE]
+
+    log_path = os.environ.get(LOG_ENV)
+    if log_path:
+        with open(log_path, 'a') as f:
+            f.write(to_jsonl([run]))
+
+    with st.sidebar.expander("⏱️ Performance", expanded=False):
+        st.metric("Rerun time", f"{run['total_ms']:,.0f} ms")
+        records = pd.DataFrame(run['records'])
+        if not records.empty:
+            records['section'] = ['  ' * d + s for d, s in zip(records['depth'], records['section'])]
+            st.dataframe(records[['section', 'ms', 'rows', 'bytes']], hide_index=True, use_container_width=True)
+        st.download_button("Export runs (JSONL)", data=to_jsonl(history),
+                           file_name="pm_dashboard_profile.jsonl", mime="application/json")
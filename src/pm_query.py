@@ -0,0 +1,236 @@
+"""
+Pluggable query backends for the page aggregations.
+
+Pages ask a table for grouped aggregates - query(by, agg, filters), total,
+value_counts, values - the interface of pm_cube.Cube. There are two
+implementations behind it:
+
+- pandas: the in-memory cube (forecast) and FrameTable over a loaded frame
+  with its bitmap index (plan vs execution PMs)
+- duckdb: DuckDBTable runs the same aggregate as SQL over the Parquet store,
+  so filters on the MONTH / DEPT_NAME partitions skip whole files, other
+  predicates are pushed into the Parquet scan, and nothing but the grouped
+  result is held in memory
+
+PM_QUERY_BACKEND picks the backend for the dashboard (see pm_data).
+
+A table can have a unit column (PMNUM for the plan vs execution PMs, whose
+table holds a row per attribute combination of a PM): rows are then reduced
+to one per unit and group before aggregating, so a PM counts once in every
+group it belongs to.
+
+    table = DuckDBTable('outputs/store/forecast')
+    table.query(['MONTH', 'DEPT_NAME'], {'PLANNED_LABOR_HRS': 'sum'},
+                filters={'LABOR_CRAFT': ['MECH', 'ELEC']})
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import pm_distinct
+import pm_profiler
+import pm_store
+
+BACKENDS = ['pandas', 'duckdb']
+
+ROWS = 'rows'
+
+
+def _grouped_sort(result, by):
+    """Groups in the same order as groupby(sort=True) (category order for categoricals)"""
+    if not by or result.empty:
+        return result.reset_index(drop=True)
+    return result.sort_values(by, kind='stable').reset_index(drop=True)
+
+
+class FrameTable:
+    """Aggregates over an in-memory frame; filters resolve through its bitmap index.
+
+    Key columns (pm_distinct.KEYS) are interned to codes once, here; 'nunique'
+    on them runs the pm_distinct kernel instead of hashing the values.
+    """
+
+    def __init__(self, df, index=None, unit=None):
+        self.df = df
+        self.index = index
+        self.unit = unit
+        self.codes = {col: pm_distinct.key_codes(df[col]) for col in pm_distinct.KEYS if col in df.columns}
+
+    def _positions(self, filters):
+        return self.index.positions(filters) if filters else None
+
+    def _distinct(self, col, positions, group_ids, n_groups):
+        codes, n_keys = self.codes[col]
+        if positions is not None:
+            codes = codes[positions]
+        return pm_distinct.grouped_count(group_ids, codes, n_groups, n_keys)
+
+    def query(self, by, agg, filters=None):
+        """Like df.groupby(by).agg(agg).reset_index() - 'sum' | 'mean' | 'count' | 'nunique'"""
+        by = [by] if isinstance(by, str) else list(by)
+        positions = self._positions(filters)
+        rows = self.df if positions is None else self.df.iloc[positions]
+        pm_profiler.scanned(len(rows))
+        if self.unit is not None:
+            # One row per unit and group
+            first = ~rows.duplicated([self.unit] + by).to_numpy()
+            positions = (np.arange(len(self.df)) if positions is None else positions)[first]
+            rows = rows[first]
+        distinct = [col for col, how in agg.items() if how == 'nunique' and col in self.codes]
+        if not by:
+            totals = {}
+            for col, how in agg.items():
+                if how == 'count':
+                    totals[col] = [len(rows)]
+                elif col in distinct:
+                    totals[col] = self._distinct(col, positions, np.zeros(len(rows), dtype=np.int64), 1)
+                else:
+                    totals[col] = [rows[col].agg(how)]
+            return pd.DataFrame(totals)
+        grouped = rows.groupby(by, observed=True)
+        named = {col: (by[0], 'size') if how == 'count' else (col, how)
+                 for col, how in agg.items() if col not in distinct}
+        result = grouped.agg(**named) if named else grouped.size().to_frame(ROWS)
+        if distinct:
+            group_ids = grouped.ngroup().fillna(-1).to_numpy().astype(np.int64)
+            for col in distinct:
+                result[col] = self._distinct(col, positions, group_ids, grouped.ngroups)
+        return result[list(agg)].reset_index()
+
+    def total(self, col, how='sum', filters=None):
+        return self.query([], {col: how}, filters)[col].iloc[0]
+
+    def values(self, col, filters=None):
+        positions = self._positions(filters)
+        rows = self.df if positions is None else self.df.iloc[positions]
+        return sorted(rows[col].dropna().unique().tolist())
+
+
+def _param(value):
+    """Filter value as a typed DuckDB parameter (NumPy / pandas scalars -> Python ones)"""
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class DuckDBTable:
+    """Same interface as pm_cube.Cube, answered by DuckDB over a (hive-partitioned) Parquet dataset.
+
+    Ordered categorical columns (levels read from the store, or given in
+    categories) come back as ordered categoricals, in the same group order as
+    the cube.
+    """
+
+    def __init__(self, path, categories=None, unit=None):
+        import duckdb
+
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"No columnar dataset at {path} - run src/pm_pipeline.py")
+        self.con = duckdb.connect()
+        # A SQL string literal - quotes in the path are doubled
+        pattern = f"{path.as_posix()}/**/*.parquet".replace("'", "''")
+        self.source = f"read_parquet('{pattern}', hive_partitioning = true)"
+        self.categories = categories if categories is not None else pm_store.ordered_levels(path)
+        self.unit = unit
+
+    def _execute(self, sql, params):
+        # One cursor per query - the connection is shared across sessions (st.cache_resource)
+        return self.con.cursor().execute(sql, params).df()
+
+    @staticmethod
+    def _where(filters, not_null=()):
+        """{'col': value} / {'col': [values]} -> WHERE clause + parameters (ANDed, like pm_store)"""
+        clauses, params = [], []
+        for col, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                value = list(value)
+                if not value:
+                    clauses.append('FALSE')
+                    continue
+                clauses.append(f'"{col}" IN ({", ".join("?" * len(value))})')
+                params.extend(_param(v) for v in value)
+            else:
+                clauses.append(f'"{col}" = ?')
+                params.append(_param(value))
+        clauses.extend(f'"{col}" IS NOT NULL' for col in not_null)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def _rows(self, filters, by, not_null=()):
+        """FROM clause over the filtered rows (one per unit and group if the table has a unit) + parameters"""
+        where, params = self._where(filters, not_null)
+        if self.unit is None:
+            return f'{self.source}{where}', params
+        keys = ', '.join(f'"{col}"' for col in [self.unit, *by])
+        return f'(SELECT DISTINCT ON ({keys}) * FROM {self.source}{where})', params
+
+    def _typed(self, result, by):
+        for col in by:
+            if col in self.categories:
+                result[col] = pd.Categorical(result[col], categories=self.categories[col], ordered=True)
+        return _grouped_sort(result, by)
+
+    def _mode(self, by, col, filters):
+        """Most frequent value of col per group (by rows); ties go to the smallest value"""
+        quoted = [f'"{c}"' for c in by]
+        keys = ', '.join(quoted + [f'"{col}"'])
+        partition = f'PARTITION BY {", ".join(quoted)} ' if by else ''
+        rows, params = self._rows(filters, by + [col], by + [col])
+        sql = (f'SELECT * EXCLUDE (n, rank) FROM ('
+               f'SELECT {keys}, COUNT(*) AS n, ROW_NUMBER() OVER ({partition}ORDER BY COUNT(*) DESC, "{col}") AS rank '
+               f'FROM {rows} GROUP BY {keys}) WHERE rank = 1')
+        return self._execute(sql, params)
+
+    def query(self, by, agg, filters=None):
+        """Like df.groupby(by).agg(agg).reset_index() on the raw rows (same aggregations as Cube.query)"""
+        by = [by] if isinstance(by, str) else list(by)
+        select = [f'"{col}"' for col in by]
+        modes = []
+        for col, how in agg.items():
+            if how == 'count':
+                select.append(f'COUNT(*) AS "{col}"')
+            elif how == 'sum':
+                select.append(f'COALESCE(SUM("{col}"), 0) AS "{col}"')
+            elif how == 'mean':
+                select.append(f'AVG("{col}") AS "{col}"')
+            elif how == 'nunique':
+                select.append(f'COUNT(DISTINCT "{col}") AS "{col}"')
+            elif how == 'mode':
+                modes.append(col)
+            else:
+                raise ValueError(f"Unsupported aggregation {how!r} for {col}")
+        if len(select) == len(by):
+            select.append(f'COUNT(*) AS "{ROWS}"')
+
+        rows, params = self._rows(filters, by, by)
+        group = f' GROUP BY {", ".join(select[:len(by)])}' if by else ''
+        result = self._execute(f'SELECT {", ".join(select)} FROM {rows}{group}', params)
+
+        for col in modes:
+            top = self._mode(by, col, filters)
+            if by:
+                result = result.merge(top, on=by, how='left')
+            else:
+                result[col] = top[col].iloc[0] if len(top) else None
+        result = result[by + list(agg)]
+        return self._typed(result, by)
+
+    def total(self, col, how='sum', filters=None):
+        """Single grand-total value"""
+        return self.query([], {col: how}, filters)[col].iloc[0]
+
+    def value_counts(self, col, filters=None):
+        """Like df[col].value_counts() on the raw rows"""
+        counts = self.query(col, {ROWS: 'count'}, filters).set_index(col)[ROWS]
+        return counts.sort_values(ascending=False, kind='stable').rename('count')
+
+    def values(self, col, filters=None):
+        """Sorted distinct values of a column"""
+        where, params = self._where(filters, [col])
+        values = self._execute(f'SELECT DISTINCT "{col}" FROM {self.source}{where}', params)[col]
+        return sorted(values.tolist())
+
@@ -0,0 +1,207 @@
+"""
+Hot-reloadable dataset versions for the dashboard.
+
+The pipeline publishes every build as an immutable snapshot
+(outputs/store/versions/<version>/, see pm_store.publish_snapshot). The
+registry polls for a newer snapshot in a background thread, loads it there
+(the `warm` callback fills the snapshot's memo with the frames, cube and
+indexes the pages use) and only then swaps it in as the active version - so
+nobody waits on a cold load. Each rerun pins the version it started with; a
+replaced version is kept until its last pinned rerun finishes, then dropped.
+Every version the process serves (active or still pinned) carries a lease in
+the store, renewed by a heartbeat thread, so the pipeline never prunes it.
+
+    registry = Registry(STORE_DIR, warm=preload).start()
+    with registry.pinned() as snapshot:
+        df = snapshot.get(('forecast',), lambda: pm_store.read_dataset(snapshot.path / 'forecast'))
+"""
+
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+import pm_store
+
+POLL_SECONDS = 10
+
+# Lease renewal interval - well inside pm_store.LEASE_SECONDS
+HEARTBEAT_SECONDS = pm_store.LEASE_SECONDS / 4
+
+# Finished figures / results and filtered reads memoized per snapshot (least recently used ones
+# are dropped first). Datasets, the cube and indexes are held for the snapshot's lifetime, never evicted.
+MAX_CACHED = 64
+
+# Used when the store has no published snapshots (built before versioning)
+UNVERSIONED = 'unversioned'
+
+
+class Snapshot:
+    """One dataset version and everything loaded from it"""
+
+    def __init__(self, version, path):
+        self.version = version
+        self.path = Path(path)
+        self.pins = 0
+        self.loaded_at = None
+        self._resources = {}            # shared datasets, cube, indexes, models - unbounded
+        self._cached = OrderedDict()    # figures, results, filtered reads - LRU, MAX_CACHED entries
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _memo(self, items, key, build, limit=None):
+        """Memoized build() in items - concurrent callers of the same key wait for one build"""
+        with self._lock:
+            if key in items:
+                if limit is not None:
+                    items.move_to_end(key)
+                return items[key]
+            key_lock = self._locks.setdefault((id(items), key), threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in items:
+                    return items[key]
+            value = build()
+            with self._lock:
+                items[key] = value
+                while limit is not None and len(items) > limit:
+                    items.popitem(last=False)
+                self._locks.pop((id(items), key), None)
+            return value
+
+    def get(self, key, build):
+        """Shared resource (dataset, cube, index) - built once, kept until the snapshot is dropped"""
+        return self._memo(self._resources, key, build)
+
+    def cached(self, key, build):
+        """Finished figure / result or filtered read - built once, evicted least recently used beyond MAX_CACHED"""
+        return self._memo(self._cached, key, build, limit=MAX_CACHED)
+
+    def clear(self):
+        with self._lock:
+            self._resources.clear()
+            self._cached.clear()
+
+
+class Registry:
+    """Active snapshot + background watcher that swaps in newer ones once loaded"""
+
+    def __init__(self, store_dir, warm=None, poll_seconds=POLL_SECONDS, on_retire=None):
+        self.store_dir = Path(store_dir)
+        self.warm = warm
+        self.on_retire = on_retire
+        self.poll_seconds = poll_seconds
+        self.loading = None
+        self.error = None
+        self.retired = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        self.holder = f"{socket.gethostname()}-{os.getpid()}-{id(self):x}"
+
+        latest = pm_store.latest_snapshot(self.store_dir)
+        self.active = Snapshot(*latest) if latest else Snapshot(UNVERSIONED, self.store_dir)
+        self._lease(self.active)
+
+    def start(self):
+        """Starts the watcher and lease heartbeat threads (daemons - they never keep the process alive)"""
+        if not self._threads:
+            for target, name in [(self._watch, 'pm-dataset-registry'), (self._heartbeat, 'pm-dataset-leases')]:
+                thread = threading.Thread(target=target, name=name, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            served = [self.active, *self.retired]
+        for snapshot in served:
+            self._release(snapshot)
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_seconds):
+            self.check()
+
+    def _heartbeat(self):
+        while not self._stop.wait(HEARTBEAT_SECONDS):
+            with self._lock:
+                served = [self.active, *self.retired]
+            for snapshot in served:
+                self._lease(snapshot)
+
+    def _lease(self, snapshot):
+        """Takes / renews this process's lease on a served version"""
+        if snapshot.version == UNVERSIONED:
+            return
+        try:
+            pm_store.lease_snapshot(snapshot.path, self.holder)
+        except OSError:   # read-only or already removed store - nothing to protect
+            pass
+
+    def _release(self, snapshot):
+        if snapshot.version == UNVERSIONED:
+            return
+        try:
+            pm_store.release_snapshot(snapshot.path, self.holder)
+        except OSError:
+            pass
+
+    def check(self):
+        """Loads and activates the newest snapshot if it is newer than the active one"""
+        latest = pm_store.latest_snapshot(self.store_dir)
+        if latest is None:
+            return False
+        if self.active.version != UNVERSIONED and latest[0] <= self.active.version:
+            return False
+        snapshot = Snapshot(*latest)
+        self._lease(snapshot)
+        self.loading = snapshot.version
+        try:
+            if self.warm is not None:
+                self.warm(snapshot)
+        except Exception as exc:   # keep serving the active version
+            self.error = f"{snapshot.version}: {exc}"
+            self._release(snapshot)
+            return False
+        finally:
+            self.loading = None
+        self.error = None
+        snapshot.loaded_at = time.time()
+        self._activate(snapshot)
+        return True
+
+    def _activate(self, snapshot):
+        with self._lock:
+            previous, self.active = self.active, snapshot
+            self.retired.append(previous)
+            self._drop_finished()
+
+    def _drop_finished(self):
+        """Forgets replaced versions no rerun is using any more (caller holds the lock)"""
+        for snapshot in [s for s in self.retired if s.pins == 0]:
+            self.retired.remove(snapshot)
+            snapshot.clear()
+            self._release(snapshot)
+            if self.on_retire is not None:
+                self.on_retire(snapshot)
+
+    @contextmanager
+    def pinned(self):
+        """The active snapshot, kept alive for the duration of the block (one rerun)"""
+        with self._lock:
+            snapshot = self.active
+            snapshot.pins += 1
+        try:
+            yield snapshot
+        finally:
+            with self._lock:
+                snapshot.pins -= 1
+                self._drop_finished()
+
+    def status(self):
+        return {'version': self.active.version, 'loading': self.loading, 'error': self.error,
+                'in_use': [s.version for s in self.retired]}
@@ -0,0 +1,234 @@
+"""
+Capacity-constrained leveling of the PM forecast.
+
+Each occurrence (COUNTKEY, all of its craft rows together) may move by whole
+weeks inside a window derived from its interval (WINDOW_SHARE of
+interval_days, at most MAX_SHIFT_WEEKS), so a quarterly PM can slide a few
+weeks while daily and weekly PMs stay put. Overload is the labor above each
+craft's weekly capacity. The leveler works through the most overloaded
+(craft, week) cells from a priority queue, moves the occurrences that reduce
+total overload the most (evaluated for every allowed week at once), then a
+local-search pass pulls moved occurrences back towards their original week
+wherever that costs nothing.
+
+    result = level_schedule(forecast, capacity={'MECH': 900, 'ELEC': 600})
+    result['moves']    # COUNTKEY, DUE_DATE, PROPOSED_DUE_DATE, SHIFT_DAYS
+    result['weekly']   # WEEK_START, LABOR_CRAFT, before, after, capacity
+"""
+
+import heapq
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Workload per row: crew hours (laborers x planned hours)
+HOURS_COLUMN = 'total_labor_hrs'
+SCHEDULE_COLUMNS = ['COUNTKEY', 'DUE_DATE', 'LABOR_CRAFT', 'interval_days', HOURS_COLUMN]
+
+# Allowed shift: +/- this share of the PM's interval, rounded down to whole weeks
+WINDOW_SHARE = 0.25
+MAX_SHIFT_WEEKS = 8
+
+# Rows without a craft are carried along but never constrained
+NO_CRAFT = '(no craft)'
+
+# Tie-break towards the smallest shift (hours of overload per week of shift)
+SHIFT_PENALTY = 1e-6
+LOCAL_SEARCH_PASSES = 3
+
+# Default capacity: average weekly crew hours x this headroom
+HEADROOM = 1.1
+
+
+def _week_origin(due_dates):
+    first = due_dates.min()
+    return first.normalize() - pd.Timedelta(days=first.dayofweek)
+
+
+def weekly_load(df):
+    """Crew hours per craft and week (Monday week starts) - the 'before' curve"""
+    origin = _week_origin(df['DUE_DATE'])
+    week_start = origin + pd.to_timedelta((df['DUE_DATE'] - origin).dt.days // 7 * 7, unit='D')
+    crafts = df['LABOR_CRAFT'].astype(object).fillna(NO_CRAFT)
+    return (df[HOURS_COLUMN].groupby([crafts.rename('LABOR_CRAFT'), week_start.rename('WEEK_START')])
+            .sum().reset_index())
+
+
+def default_capacity(df, headroom=HEADROOM):
+    """Per-craft weekly capacity = average weekly crew hours x headroom"""
+    load = weekly_load(df)
+    n_weeks = load['WEEK_START'].nunique()
+    per_craft = load[load['LABOR_CRAFT'] != NO_CRAFT].groupby('LABOR_CRAFT')[HOURS_COLUMN].sum()
+    return (per_craft / n_weeks * headroom).round().to_dict()
+
+
+def _overload(load, cap):
+    return np.maximum(load - cap, 0)
+
+
+class _Leveler:
+    """Mutable state of one leveling run (loads, job weeks, cell membership)"""
+
+    def __init__(self, df, capacity, window_share, max_shift_weeks):
+        df = df.dropna(subset=['DUE_DATE'])
+        self.origin = _week_origin(df['DUE_DATE'])
+        job, self.keys = pd.factorize(df['COUNTKEY'])
+        craft, self.crafts = pd.factorize(df['LABOR_CRAFT'].astype(object).fillna(NO_CRAFT))
+        week = ((df['DUE_DATE'] - self.origin).dt.days // 7).to_numpy()
+        self.n_weeks = int(week.max()) + 1
+        # A craft missing from capacity, or left blank (None / NaN from a cleared editor cell), is unlimited
+        cap = np.array([capacity.get(c, np.nan) for c in self.crafts], dtype=float)
+        self.cap = np.where(np.isnan(cap), np.inf, cap)[:, None]
+
+        # (job, craft) pairs sorted by job -> CSR layout
+        pairs = (pd.DataFrame({'job': job, 'craft': craft, 'hours': df[HOURS_COLUMN].fillna(0).to_numpy()})
+                 .groupby(['job', 'craft'], sort=True)['hours'].sum().reset_index())
+        self.pair_craft = pairs['craft'].to_numpy()
+        self.pair_hours = pairs['hours'].to_numpy(dtype=float)
+        self.ptr = np.r_[0, np.cumsum(np.bincount(pairs['job'], minlength=len(self.keys)))]
+
+        first = pd.DataFrame({'job': job, 'week': week, 'days': df['interval_days'].to_numpy(),
+                              'due': df['DUE_DATE'].to_numpy()}).groupby('job').first()
+        self.due = first['due'].to_numpy()
+        self.week0 = first['week'].to_numpy()
+        self.week = self.week0.copy()
+        self.window = np.minimum(np.nan_to_num(first['days'].to_numpy() * window_share) // 7,
+                                 max_shift_weeks).astype(int)
+
+        self.load = np.zeros((len(self.crafts), self.n_weeks))
+        np.add.at(self.load, (self.pair_craft, np.repeat(self.week, np.diff(self.ptr))), self.pair_hours)
+        self.before = self.load.copy()
+
+        # Movable jobs by (craft, week) cell
+        self.members = defaultdict(set)
+        for j in np.flatnonzero(self.window > 0):
+            for c in self.pair_craft[self.ptr[j]:self.ptr[j + 1]]:
+                self.members[c, self.week[j]].add(j)
+
+    def total_overload(self, load=None):
+        return float(_overload(self.load if load is None else load, self.cap).sum())
+
+    def _delta(self, j, target):
+        """Change in total overload if job j moves to week target"""
+        pairs = slice(self.ptr[j], self.ptr[j + 1])
+        c, h, w = self.pair_craft[pairs], self.pair_hours[pairs], self.week[j]
+        cap = self.cap[c, 0]
+        src = _overload(self.load[c, w] - h, cap) - _overload(self.load[c, w], cap)
+        dst = _overload(self.load[c, target] + h, cap) - _overload(self.load[c, target], cap)
+        return float((src + dst).sum())
+
+    def _move(self, j, target):
+        pairs = slice(self.ptr[j], self.ptr[j + 1])
+        c, h, w = self.pair_craft[pairs], self.pair_hours[pairs], self.week[j]
+        self.load[c, w] -= h
+        self.load[c, target] += h
+        for craft in c:
+            self.members[craft, w].discard(j)
+            self.members[craft, target].add(j)
+        self.week[j] = target
+        return [(craft, w) for craft in c] + [(craft, target) for craft in c]
+
+    def _best_moves(self, jobs):
+        """Best target week per job, all allowed offsets evaluated at once -> (delta, target)"""
+        counts = np.diff(self.ptr)[jobs]
+        owner = np.repeat(np.arange(len(jobs)), counts)
+        pairs = np.repeat(self.ptr[jobs] - np.r_[0, np.cumsum(counts)[:-1]], counts) + np.arange(counts.sum())
+        c, h = self.pair_craft[pairs], self.pair_hours[pairs]
+        w = self.week[jobs][owner]
+        cap = self.cap[c]
+
+        k = int(self.window[jobs].max())
+        targets = self.week0[jobs][:, None] + np.arange(-k, k + 1)[None, :]
+        allowed = ((np.abs(targets - self.week0[jobs][:, None]) <= self.window[jobs][:, None])
+                   & (targets >= 0) & (targets < self.n_weeks) & (targets != self.week[jobs][:, None]))
+        t = np.clip(targets, 0, self.n_weeks - 1)[owner]
+
+        src = (_overload(self.load[c, w] - h, cap[:, 0]) - _overload(self.load[c, w], cap[:, 0]))[:, None]
+        dst = _overload(self.load[c[:, None], t] + h[:, None], cap) - _overload(self.load[c[:, None], t], cap)
+        delta = np.add.reduceat(src + dst, np.r_[0, np.cumsum(counts)[:-1]], axis=0)
+        delta += SHIFT_PENALTY * np.abs(targets - self.week0[jobs][:, None])
+        delta[~allowed] = np.inf
+
+        best = delta.argmin(axis=1)
+        rows = np.arange(len(jobs))
+        return delta[rows, best], targets[rows, best]
+
+    def level(self):
+        """Greedy: most overloaded cell first, best moves out of it until it fits"""
+        over = _overload(self.load, self.cap)
+        heap = [(-over[c, w], c, w) for c, w in zip(*np.nonzero(over))]
+        heapq.heapify(heap)
+        while heap:
+            neg, c, w = heapq.heappop(heap)
+            current = _overload(self.load[c, w], self.cap[c, 0])
+            if current <= 0:
+                continue
+            if current < -neg - 1e-9:
+                heapq.heappush(heap, (-current, c, w))   # stale entry - requeue with its real overload
+                continue
+            jobs = np.fromiter(self.members[c, w], dtype=int)
+            if len(jobs) == 0:
+                continue
+            delta, target = self._best_moves(jobs)
+            touched = set()
+            for i in np.argsort(delta):
+                if delta[i] >= -1e-9 or self.load[c, w] <= self.cap[c, 0]:
+                    break
+                # Loads changed since the batch was evaluated - recheck this move
+                if self._delta(jobs[i], target[i]) < -1e-9:
+                    touched.update(self._move(jobs[i], target[i]))
+            # Includes (c, w) itself while it is still over: its next batch sees the new loads
+            for cell in touched:
+                cell_over = _overload(self.load[cell], self.cap[cell[0], 0])
+                if cell_over > 0:
+                    heapq.heappush(heap, (-cell_over, *cell))
+
+    def pull_back(self):
+        """Local search: moved jobs step back towards their original week when it costs nothing"""
+        for _ in range(LOCAL_SEARCH_PASSES):
+            changed = False
+            for j in np.flatnonzero(self.week != self.week0):
+                step = self.week[j] + np.sign(self.week0[j] - self.week[j])
+                if self._delta(j, step) <= 1e-9:
+                    self._move(j, step)
+                    changed = True
+            if not changed:
+                break
+
+
+def level_schedule(df, capacity, window_share=WINDOW_SHARE, max_shift_weeks=MAX_SHIFT_WEEKS):
+    """Proposed due dates that flatten weekly crew hours above each craft's capacity"""
+    start = time.perf_counter()
+    lv = _Leveler(df[SCHEDULE_COLUMNS], capacity, window_share, max_shift_weeks)
+    overload_before = lv.total_overload()
+    lv.level()
+    lv.pull_back()
+
+    moved = np.flatnonzero(lv.week != lv.week0)
+    shift_days = (lv.week[moved] - lv.week0[moved]) * 7
+    moves = pd.DataFrame({
+        'COUNTKEY': lv.keys[moved],
+        'DUE_DATE': lv.due[moved],
+        'PROPOSED_DUE_DATE': lv.due[moved] + pd.to_timedelta(shift_days, unit='D').to_numpy(),
+        'SHIFT_DAYS': shift_days,
+    })
+
+    weeks = lv.origin + pd.to_timedelta(np.arange(lv.n_weeks) * 7, unit='D')
+    weekly = pd.DataFrame({
+        'WEEK_START': np.tile(weeks, len(lv.crafts)),
+        'LABOR_CRAFT': np.repeat(lv.crafts, lv.n_weeks),
+        'before': lv.before.ravel(),
+        'after': lv.load.ravel(),
+        'capacity': np.repeat(lv.cap[:, 0], lv.n_weeks),
+    })
+    summary = {
+        'occurrences': len(lv.keys),
+        'movable': int((lv.window > 0).sum()),
+        'moved': len(moves),
+        'overload_before': overload_before,
+        'overload_after': lv.total_overload(),
+        'seconds': time.perf_counter() - start,
+    }
+    return {'moves': moves, 'weekly': weekly, 'summary': summary}
@@ -0,0 +1,178 @@
+"""
+Concurrent computation of independent page sections.
+
+A page script hands each section's data + figure work to the scheduler as soon
+as the section's inputs (department, widget values) are known. The sections
+compute on a thread pool - pandas, NumPy and DuckDB release the GIL for most
+of a query - while the script goes on; the page then emits them in page order
+with result(), which only waits for a section that is not finished yet.
+Workers run with the rerun's pinned dataset version and Streamlit context, so
+cached loaders behave as on the script thread. They must not call st.*.
+
+One bounded pool (WORKERS threads) is shared by every session and rerun; a
+scheduler only holds its rerun's futures. finish() cancels whatever has not
+started and waits for the rest - the dashboard calls finish_open() when a
+page ends, so an interrupted rerun (RerunException, StopException) never
+leaves work behind.
+
+    sections = SectionScheduler()
+    sections.submit("Zones", zone_section, crafts, viz_type)
+    sections.submit("KDE", kde_section, crafts, level)
+    zones = sections.result("Zones")        # emitted in page order
+    ...
+    sections.finish()                       # per-section timings -> profiler
+    finish_open()                           # dashboard, after every page (also on interruption)
+
+With PM_SECTION_WORKERS=1 every section is computed inline at result(), one
+after another (the sequential baseline). report() gives start / end / compute
+and wait times per section; with a pool the sections' wall time (first start
+to last end) follows the critical path - the slowest chain of sections - not
+their sum.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+import pm_data
+import pm_profiler
+
+# Threads of the process-wide section pool (one per core, at most 8, by default);
+# 1 computes the sections inline, in page order
+WORKERS = int(os.environ.get('PM_SECTION_WORKERS', min(os.cpu_count() or 1, 8)))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Schedulers of the rerun running on this thread that have not finished yet
+_open = threading.local()
+
+
+def _shared_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(WORKERS, thread_name_prefix='pm-section')
+        return _pool
+
+
+def _attach(ctx):
+    """The rerun's Streamlit context for the current worker thread (cache_data etc.); None detaches"""
+    from streamlit.runtime.scriptrunner import add_script_run_ctx
+    add_script_run_ctx(threading.current_thread(), ctx)
+
+
+def finish_open():
+    """Finishes every scheduler of this thread's rerun - call when the page ends, however it ends"""
+    for scheduler in list(getattr(_open, 'schedulers', [])):
+        scheduler.finish()
+
+
+class SectionScheduler:
+    """Computes named sections on a thread pool; result(name) returns them in any order"""
+
+    def __init__(self, workers=None):
+        self.workers = WORKERS if workers is None else workers
+        self.snapshot = pm_data.current_snapshot()
+        self.started = time.perf_counter()
+        self._sections = {}
+        self._futures = []     # every submit of this rerun, replaced ones included
+        self._finished = False
+        self._pool = None
+        self._ctx = None
+        if self.workers > 1:
+            from streamlit.runtime.scriptrunner import get_script_run_ctx
+            self._pool = _shared_pool()
+            self._ctx = get_script_run_ctx()
+        if not hasattr(_open, 'schedulers'):
+            _open.schedulers = []
+        _open.schedulers.append(self)
+
+    def _run(self, timing, func, args, kwargs):
+        timing['start'] = time.perf_counter()
+        try:
+            with pm_data.using_snapshot(self.snapshot):
+                return func(*args, **kwargs)
+        finally:
+            timing['end'] = time.perf_counter()
+
+    def _run_pooled(self, timing, func, args, kwargs):
+        """_run on a pool thread, with the rerun's Streamlit context for the duration of the task"""
+        if self._ctx is not None:
+            _attach(self._ctx)
+        try:
+            return self._run(timing, func, args, kwargs)
+        finally:
+            if self._ctx is not None:
+                _attach(None)
+
+    def submit(self, name, func, *args, **kwargs):
+        """Starts computing section name; replaces (and cancels) an earlier submit of the same name"""
+        previous = self._sections.get(name)
+        if previous is not None:
+            previous['future'].cancel()
+        timing = {'wait': 0.0}
+        if self._pool is not None:
+            future = self._pool.submit(self._run_pooled, timing, func, args, kwargs)
+            self._futures.append(future)
+        else:
+            future = Future()
+            timing['call'] = (func, args, kwargs)
+        self._sections[name] = {'future': future, 'timing': timing}
+        return future
+
+    def result(self, name):
+        """The section's return value - waits for it, or computes it here when running inline"""
+        entry = self._sections[name]
+        future, timing = entry['future'], entry['timing']
+        if 'call' in timing:
+            func, args, kwargs = timing.pop('call')
+            try:
+                future.set_result(self._run(timing, func, args, kwargs))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future.result()
+        start = time.perf_counter()
+        try:
+            return future.result()
+        finally:
+            timing['wait'] += time.perf_counter() - start
+
+    def report(self):
+        """One row per finished section, in ms since the scheduler started"""
+        rows = []
+        for name, entry in self._sections.items():
+            timing = entry['timing']
+            if 'end' not in timing:
+                continue
+            rows.append({'section': name,
+                         'start_ms': (timing['start'] - self.started) * 1000,
+                         'end_ms': (timing['end'] - self.started) * 1000,
+                         'ms': (timing['end'] - timing['start']) * 1000,
+                         'wait_ms': timing['wait'] * 1000})
+        return pd.DataFrame(rows, columns=['section', 'start_ms', 'end_ms', 'ms', 'wait_ms'])
+
+    def finish(self):
+        """Cancels sections not started yet, waits for the running ones and records the timings
+        with the profiler (once - later calls do nothing)"""
+        if self._finished:
+            return
+        self._finished = True
+        if self in getattr(_open, 'schedulers', []):
+            _open.schedulers.remove(self)
+        for future in self._futures:
+            future.cancel()
+        wait(self._futures)
+        if not pm_profiler.enabled():
+            return
+        report = self.report()
+        for row in report.itertuples(index=False):
+            pm_profiler.record(f"compute: {row.section}", row.ms, kind='compute',
+                               start_ms=round(row.start_ms, 2), wait_ms=round(row.wait_ms, 2))
+        if not report.empty:
+            pm_profiler.record(f"sections: sum ({len(report)})", report['ms'].sum(), kind='compute')
+            pm_profiler.record(f"sections: wall ({self.workers} threads)",
+                               report['end_ms'].max() - report['start_ms'].min(), kind='compute')
@@ -0,0 +1,248 @@
+"""
+Columnar (Parquet) storage for the dashboard datasets.
+
+Datasets are written as hive-partitioned Parquet under outputs/store/<name>/,
+partitioned by MONTH (calendar months line up with the April-March fiscal
+months) and DEPT_NAME. Categorical columns are stored dictionary-encoded.
+
+Readers ask for just the columns and partitions they need:
+
+    read_dataset('forecast', columns=['MONTH', 'PLANNED_LABOR_HRS'],
+                 filters={'DEPT_NAME': 'PAINT 2'})
+
+Each pipeline build also publishes an immutable snapshot of the datasets under
+outputs/store/versions/<version>/ (hard links, so no extra disk) that the
+dashboard can switch to while it runs (see pm_registry):
+
+    publish_snapshot(STORE_DIR, ['forecast', 'path2', 'path2_pm'], fingerprint)
+    latest_snapshot(STORE_DIR)    # (version, path) of the newest complete snapshot
+
+A dashboard process leases the versions it serves (a lease file it touches
+every poll); publishing prunes old versions but never one with a live lease:
+
+    lease_snapshot(path, holder)  # renew while the version is active / pinned
+    release_snapshot(path, holder)
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+OUTPUT_DIR = Path(__file__).parent.parent / 'outputs'
+STORE_DIR = OUTPUT_DIR / 'store'
+
+PARTITION_COLS = ['MONTH', 'DEPT_NAME']
+
+VERSIONS_DIR = 'versions'
+READY_FILE = 'READY.json'   # written last - a snapshot without it is incomplete
+KEEP_VERSIONS = 3
+
+LEASES_DIR = 'leases'       # versions/<version>/leases/<holder>, touched by the processes serving it
+LEASE_SECONDS = 120         # a lease not renewed for this long is stale (its process is gone)
+
+
+def dataset_path(name, store_dir=STORE_DIR):
+    return Path(store_dir) / name
+
+
+def write_dataset(df, path, partition_cols=PARTITION_COLS):
+    """Writes a DataFrame as partitioned Parquet, replacing whatever was there"""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_to_dataset(table,
+                        root_path=tmp_path,
+                        partition_cols=partition_cols,
+                        use_dictionary=True,
+                        compression='zstd')
+
+    # Swap in the new version only once it is fully written
+    if path.exists():
+        shutil.rmtree(path)
+    tmp_path.rename(path)
+
+
+def write_chunks(chunks, path, schema):
+    """Streams DataFrame chunks into a single Parquet file, one row group per chunk.
+
+    Every chunk is converted with the same Arrow schema, so a chunk where a
+    column happens to be all-null or has fewer categories still matches.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    tmp_path.mkdir(parents=True)
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            if writer is None:
+                # Opened on the first chunk so the file keeps its pandas metadata
+                writer = pq.ParquetWriter(tmp_path / 'part-0.parquet', table.schema,
+                                          use_dictionary=True, compression='zstd')
+            writer.write_table(table)
+        if writer is None:
+            pq.write_table(schema.empty_table(), tmp_path / 'part-0.parquet')
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if path.exists():
+        shutil.rmtree(path)
+    tmp_path.rename(path)
+
+
+def _open(path):
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"No columnar dataset at {path} - run src/pm_pipeline.py")
+    return ds.dataset(path, format='parquet', partitioning='hive')
+
+
+def _filter_expression(filters):
+    """{'col': value} / {'col': [values]} -> pyarrow expression (ANDed together)"""
+    expr = None
+    for col, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            cond = ds.field(col).isin(list(value))
+        else:
+            cond = ds.field(col) == value
+        expr = cond if expr is None else expr & cond
+    return expr
+
+
+def read_dataset(path, columns=None, filters=None):
+    """Reads only the requested columns; filters on partition columns skip whole files"""
+    dataset = _open(path)
+    table = dataset.to_table(columns=list(columns) if columns else None,
+                             filter=_filter_expression(filters))
+    df = table.to_pandas()
+
+    # Partition columns come back last - restore the original column order
+    if not columns:
+        metadata = dataset.schema.pandas_metadata or {}
+        columns = [c['name'] for c in metadata.get('columns', []) if c['name'] in df.columns]
+    return df[[c for c in columns if c in df.columns]]
+
+
+def partition_values(path, column):
+    """Distinct values of a partition column, read from the directory names only"""
+    dataset = _open(path)
+    values = set()
+    for fragment in dataset.get_fragments():
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        if keys.get(column) is not None:
+            values.add(keys[column])
+    return sorted(values)
+
+
+def ordered_levels(path):
+    """Levels of the ordered categorical columns, from the first file's dictionaries
+    (every file is written with the full category list, used or not)"""
+    dataset = _open(path)
+    columns = [field.name for field in dataset.schema
+               if pa.types.is_dictionary(field.type) and field.type.ordered]
+    fragment = next(dataset.get_fragments(), None)
+    if not columns or fragment is None:
+        return {}
+    head = fragment.head(1, columns=columns)
+    return {col: head.column(col).chunk(0).dictionary.to_pylist() for col in columns}
+
+
+# =============================================================================
+# VERSIONED SNAPSHOTS
+# =============================================================================
+def _link_tree(src, dst):
+    """Hard-links every file of src into dst (copies where links are not supported)"""
+    for root, _, files in os.walk(src):
+        target = Path(dst) / Path(root).relative_to(src)
+        target.mkdir(parents=True, exist_ok=True)
+        for name in files:
+            try:
+                os.link(Path(root) / name, target / name)
+            except OSError:
+                shutil.copy2(Path(root) / name, target / name)
+
+
+def list_snapshots(store_dir=STORE_DIR):
+    """Complete snapshots, oldest first: [(version, path, ready info)]"""
+    versions = Path(store_dir) / VERSIONS_DIR
+    if not versions.exists():
+        return []
+    snapshots = []
+    for path in sorted(p for p in versions.iterdir() if (p / READY_FILE).exists()):
+        snapshots.append((path.name, path, json.loads((path / READY_FILE).read_text())))
+    return snapshots
+
+
+def latest_snapshot(store_dir=STORE_DIR):
+    """(version, path) of the newest complete snapshot, None when nothing was published"""
+    snapshots = list_snapshots(store_dir)
+    return snapshots[-1][:2] if snapshots else None
+
+
+def lease_snapshot(path, holder):
+    """Marks the snapshot at path as in use by holder (call again to renew)"""
+    lease = Path(path) / LEASES_DIR / holder
+    lease.parent.mkdir(exist_ok=True)
+    lease.touch()
+
+
+def release_snapshot(path, holder):
+    (Path(path) / LEASES_DIR / holder).unlink(missing_ok=True)
+
+
+def is_leased(path, max_age=LEASE_SECONDS):
+    """True while some process holds a lease on the snapshot renewed within max_age seconds"""
+    leases = Path(path) / LEASES_DIR
+    if not leases.exists():
+        return False
+    now = time.time()
+    for lease in leases.iterdir():
+        try:
+            if now - lease.stat().st_mtime < max_age:
+                return True
+        except FileNotFoundError:   # released meanwhile
+            continue
+    return False
+
+
+def publish_snapshot(store_dir, names, fingerprint, keep=KEEP_VERSIONS):
+    """Publishes the current datasets as a new snapshot, unless the newest one has the same fingerprint.
+
+    Returns the version. Only the `keep` newest snapshots are kept, plus older
+    ones a running dashboard still leases (active, or pinned by a rerun).
+    """
+    store_dir = Path(store_dir)
+    snapshots = list_snapshots(store_dir)
+    if snapshots and snapshots[-1][2].get('fingerprint') == fingerprint:
+        return snapshots[-1][0]
+
+    version = f"{datetime.now():%Y%m%d-%H%M%S}-{fingerprint[:8]}"
+    path = store_dir / VERSIONS_DIR / version
+    tmp_path = path.with_name(path.name + '.tmp')
+    if tmp_path.exists():
+        shutil.rmtree(tmp_path)
+    for name in names:
+        _link_tree(store_dir / name, tmp_path / name)
+    tmp_path.rename(path)
+    (path / READY_FILE).write_text(json.dumps({'version': version, 'fingerprint': fingerprint,
+                                              'datasets': list(names),
+                                              'published_at': datetime.now().isoformat(timespec='seconds')}))
+
+    for _, old_path, _ in list_snapshots(store_dir)[:-keep]:
+        if not is_leased(old_path):
+            shutil.rmtree(old_path, ignore_errors=True)
+    return version
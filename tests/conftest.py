@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+# Flat src/ modules, and the synthetic data generator from benchmarks/
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+import pm_pipeline
+import synthetic
+
+
+@pytest.fixture(scope='session')
+def store(tmp_path_factory):
+    """Store built by the pipeline from the synthetic exports, under a path with a quote in it"""
+    data_dir = tmp_path_factory.mktemp('data')
+    synthetic.write_csv(*synthetic.generate(1, 0), data_dir)
+    output_dir = tmp_path_factory.mktemp("planner's outputs")
+    pm_pipeline.run_pipeline(data_dir, output_dir, verbose=False)
+    return output_dir / 'store'
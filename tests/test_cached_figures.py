@@ -0,0 +1,83 @@
+"""
+Figures of the filter-free pages are serialized once per dataset version.
+
+pm_data.cached_figure keeps the finished Plotly JSON on the snapshot, and
+pm_profiler.plotly_chart sends it as is: a repeat visit neither rebuilds nor
+re-encodes the figure, with or without profiling, and the profiler measures
+the one payload it sends.
+"""
+
+import plotly.express as px
+import plotly.io
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import pm_data
+import pm_profiler
+import pm_registry
+
+
+def bar_figure():
+    return px.bar(x=['a', 'b', 'c'], y=[3, 1, 2], title="Hours", height=320)
+
+
+@pytest.mark.parametrize('profile', [False, True])
+def test_repeat_visit_does_not_serialize_again(tmp_path, monkeypatch, profile):
+    size = len(bar_figure().to_json())
+    encoded, built = [], []
+    to_json = plotly.io.to_json
+    monkeypatch.setattr(plotly.io, 'to_json', lambda *args, **kwargs: encoded.append(1) or to_json(*args, **kwargs))
+
+    def build():
+        built.append(1)
+        return bar_figure()
+
+    with pm_data.using_snapshot(pm_registry.Snapshot('v1', tmp_path)):
+        for _ in range(3):
+            if profile:
+                pm_profiler.start_run('test')
+            pm_profiler.plotly_chart(pm_data.cached_figure('test/bars', build), use_container_width=True)
+            run = pm_profiler.finish_run()
+            if profile:
+                assert run['records'][0]['bytes'] == size
+    assert len(built) == 1
+    assert len(encoded) == 1
+
+    # A new dataset version starts empty
+    with pm_data.using_snapshot(pm_registry.Snapshot('v2', tmp_path)):
+        pm_profiler.plotly_chart(pm_data.cached_figure('test/bars', build), use_container_width=True)
+    assert len(built) == 2
+
+
+def test_cached_json_renders_like_the_figure():
+    def app():
+        import plotly.express as px
+        import streamlit as st
+
+        import pm_charts
+
+        fig = px.bar(x=['a', 'b', 'c'], y=[3, 1, 2], title="Hours", height=320)
+        st.plotly_chart(fig, use_container_width=True)
+        pm_charts.send_json(pm_charts.FigureJSON(fig), use_container_width=True)
+
+    at = AppTest.from_function(app).run()
+    assert not at.exception
+    plain, cached = at.get('plotly_chart')
+    assert cached.proto.spec == plain.proto.spec
+    assert cached.proto.theme == plain.proto.theme
+    assert cached.proto.id != plain.proto.id
+
+
+def test_profiled_figure_is_serialized_once(monkeypatch):
+    """The profiler measures the payload it sends instead of encoding the figure a second time"""
+    fig = bar_figure()
+    size = len(fig.to_json())
+    encoded = []
+    to_json = plotly.io.to_json
+    monkeypatch.setattr(plotly.io, 'to_json', lambda *args, **kwargs: encoded.append(1) or to_json(*args, **kwargs))
+
+    pm_profiler.start_run('test')
+    pm_profiler.plotly_chart(fig, use_container_width=True)
+    run = pm_profiler.finish_run()
+    assert len(encoded) == 1
+    assert run['records'][0]['bytes'] == size
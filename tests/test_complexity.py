@@ -0,0 +1,79 @@
+"""
+Refreshing the complexity model with a new export.
+
+Rows with unseen COUNTKEYs are absorbed into a copy of the published model.
+While the estimated share of rows that would change level stays under the
+threshold, the published scale and cutoffs are kept; above it the model is
+refit on the new export. Either way the model being served is left as it was.
+"""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pm_complexity
+
+
+def export(n, start=0, spread=1.0, seed=0):
+    """n feature rows with COUNTKEYs start.., components scaled by `spread`"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'COUNTKEY': [f'K{i}' for i in range(start, start + n)],
+        'task_density': rng.gamma(2.0, 1.5, n) * spread,
+        'total_labor_per_occurrence': rng.lognormal(1.0, 0.6, n) * spread,
+        'desc_intensity': rng.uniform(0, 40, n) * spread,
+    })
+
+
+def published_scale(model):
+    return model.cap, tuple(model.low), tuple(model.high), model.thresholds
+
+
+@pytest.fixture
+def served():
+    return pm_complexity.fit(export(5_000))
+
+
+def test_refresh_below_threshold_keeps_the_published_scale(served):
+    df = pd.concat([export(5_000), export(200, start=5_000, seed=1)], ignore_index=True)
+    model = pm_complexity.refresh(df, served)
+
+    assert model.last_shift <= pm_complexity.DRIFT_THRESHOLD
+    assert not model.rescaled
+    assert published_scale(model) == published_scale(served)
+    assert model.new_rows == 200
+    assert model.n_rows == served.n_rows + 200
+    assert model.keys.equals(pd.Index(df['COUNTKEY']))
+
+    # An export with no unseen rows absorbs nothing
+    again = pm_complexity.refresh(df, model)
+    assert again.new_rows == 0 and again.n_rows == model.n_rows
+
+
+def test_refresh_above_threshold_refits(served):
+    df = pd.concat([export(5_000), export(3_000, start=5_000, spread=3.0, seed=1)], ignore_index=True)
+    model = pm_complexity.refresh(df, served)
+
+    assert model.last_shift > pm_complexity.DRIFT_THRESHOLD
+    assert model.rescaled
+    assert published_scale(model) != published_scale(served)
+    np.testing.assert_equal(published_scale(model), published_scale(pm_complexity.fit(df)))
+
+    # The same drift is tolerated under a looser threshold
+    kept = pm_complexity.refresh(df, served, threshold=1.0)
+    assert not kept.rescaled
+    assert published_scale(kept) == published_scale(served)
+
+
+@pytest.mark.parametrize('spread', [1.0, 3.0])
+def test_refresh_never_mutates_the_served_model(served, spread):
+    before = pickle.dumps(served)
+    df = pd.concat([export(5_000), export(3_000, start=5_000, spread=spread, seed=1)], ignore_index=True)
+    model = pm_complexity.refresh(df, served)
+
+    assert model is not served
+    assert pickle.dumps(served) == before
+    for name in ['labor', 'scores', 'sample', 'keys', 'rng']:
+        assert getattr(model, name) is not getattr(served, name)
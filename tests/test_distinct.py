@@ -0,0 +1,75 @@
+"""
+Distinct PM counts over interned keys.
+
+grouped_count() has a dense kernel (a group x key table) and a sparse one
+(sorted packed pairs) for tables over DENSE_LIMIT cells. Both, and the group
+numbering in group_ids(), must count what pandas' groupby(...).nunique()
+counts: categorical and object keys, unused categories, null keys and null
+PMs included.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pm_distinct
+
+
+@pytest.fixture(params=['dense', 'sparse'])
+def kernel(request, monkeypatch):
+    if request.param == 'sparse':
+        monkeypatch.setattr(pm_distinct, 'DENSE_LIMIT', 0)
+    return request.param
+
+
+def forecast(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    pmnum = pd.Series(rng.integers(0, 3_000, n)).map('PM{:05d}'.format)
+    pmnum[rng.random(n) < 0.02] = None
+    dept = pd.Series(rng.choice(['MECH', 'ELEC', 'OPS', 'UTIL', None], n))
+    return pd.DataFrame({
+        'PMNUM': pmnum,
+        'DEPT_NAME': dept.astype(pd.CategoricalDtype(['UTIL', 'OPS', 'ELEC', 'MECH', 'UNUSED'])),
+        'JOB_TYPE': rng.choice(['PM', 'INSP', 'LUBE'], n).astype(object),
+        'due_month': pd.Series(rng.integers(1, 13, n)).where(rng.random(n) > 0.01),
+    })
+
+
+@pytest.mark.parametrize('by', ['DEPT_NAME', 'JOB_TYPE', 'due_month',
+                                ['DEPT_NAME', 'JOB_TYPE'], ['due_month', 'DEPT_NAME', 'JOB_TYPE']])
+@pytest.mark.parametrize('interned', [False, True])
+def test_groupby_count_matches_pandas(kernel, by, interned):
+    df = forecast()
+    expected = df.groupby(by, observed=True)['PMNUM'].nunique()
+    if interned:
+        df = pm_distinct.intern_keys(df)
+    result = pm_distinct.groupby_count(df, by, 'PMNUM')
+
+    # Same groups in the same order; the index holds the category values, not a CategoricalIndex
+    assert result.index.names == expected.index.names
+    assert result.index.tolist() == expected.index.tolist()
+    pd.testing.assert_series_equal(result.reset_index(drop=True), expected.reset_index(drop=True))
+
+
+def test_count_matches_nunique(kernel):
+    df = forecast()
+    assert pm_distinct.count(df['PMNUM']) == df['PMNUM'].nunique()
+    assert pm_distinct.count(df['PMNUM'].astype('category')) == df['PMNUM'].nunique()
+    assert pm_distinct.count(df['PMNUM'].iloc[:0]) == 0
+    assert pm_distinct.count(pd.Series([None, None], dtype=object)) == 0
+
+
+def test_kernels_agree_on_raw_codes(monkeypatch):
+    rng = np.random.default_rng(1)
+    n_groups, n_keys = 40, 500
+    group_ids = rng.integers(-1, n_groups, 50_000)
+    codes = rng.integers(-1, n_keys, 50_000)
+    dense = pm_distinct.grouped_count(group_ids, codes, n_groups, n_keys)
+    monkeypatch.setattr(pm_distinct, 'DENSE_LIMIT', 0)
+    sparse = pm_distinct.grouped_count(group_ids, codes, n_groups, n_keys)
+
+    keep = (group_ids >= 0) & (codes >= 0)
+    expected = (pd.Series(codes[keep]).groupby(group_ids[keep]).nunique()
+                .reindex(range(n_groups), fill_value=0).to_numpy())
+    np.testing.assert_array_equal(dense, expected)
+    np.testing.assert_array_equal(sparse, expected)
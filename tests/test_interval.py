@@ -0,0 +1,76 @@
+"""
+INTERVAL parsing.
+
+Every distinct interval string is parsed once into a lookup table that rows
+pick up through categorical codes. Per-row lookups and the interval ordering
+must agree with parsing each value on its own, across every frequency band,
+and a value that does not parse raises IntervalError naming it instead of
+becoming NaN.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pm_derive
+import pm_interval
+from pm_interval import IntervalError
+
+# At least one interval per band, Daily through Multi-Year, in mixed spelling
+INTERVALS = ['1-DAYS', '2-DAYS', '1-WEEKS', '2-WEEKS', '3-WEEKS', '1-MONTHS', ' 2-months', '6-WEEKS',
+             '3-MONTHS', '6-MONTHS', '1-YEARS', '12-MONTHS', '2-YEARS', '5-YEARS', '90-DAYS']
+
+MALFORMED = ['3-MONTH', '2-FORTNIGHTS', '1.5-MONTHS', 'MONTHS', '-3-DAYS', '3 MONTHS', '', 'nan']
+
+
+def parsed_days(value):
+    number, unit = pm_interval.parse(value)
+    return number * pm_interval.UNIT_DAYS[unit]
+
+
+@pytest.mark.parametrize('value', MALFORMED)
+def test_malformed_interval_names_the_value(value):
+    with pytest.raises(IntervalError) as error:
+        pm_interval.parse(value)
+    assert error.value.values == [value]
+    assert repr(value) in str(error.value)
+
+
+def test_every_malformed_value_is_reported_at_once():
+    rows = pd.Series(INTERVALS + ['3-MONTH', '2-FORTNIGHTS', '3-MONTH', None] * 10)
+    for call in [lambda: pm_interval.interval_table(rows),
+                 lambda: pm_interval.lookup(rows, 'interval_days'),
+                 lambda: pm_interval.ordered(rows)]:
+        with pytest.raises(IntervalError) as error:
+            call()
+        assert error.value.values == ['2-FORTNIGHTS', '3-MONTH']
+
+
+def test_lookup_agrees_with_parse():
+    rng = np.random.default_rng(0)
+    rows = pd.Series(rng.choice(INTERVALS + [None], 5_000), index=rng.permutation(5_000))
+    days = pm_interval.lookup(rows, 'interval_days')
+    category = pm_interval.lookup(rows, 'interval_category')
+
+    expected = rows.map(lambda value: np.nan if value is None else parsed_days(value)).astype(float)
+    pd.testing.assert_series_equal(days, expected, check_names=False)
+    assert category.index.equals(rows.index)
+    pd.testing.assert_series_equal(category.astype(object),
+                                   pm_derive.interval_category(expected).astype(object), check_names=False)
+    assert set(category.dropna()) == set(pm_derive.INTERVAL_LABELS)
+
+    # Categorical input (as read from the store) gives the same values
+    pd.testing.assert_series_equal(pm_interval.lookup(rows.astype('category'), 'interval_days'), days)
+
+
+def test_ordered_agrees_with_parse():
+    rows = pd.Series(INTERVALS * 3 + [None])
+    ordered = pm_interval.ordered(rows)
+    assert sorted(ordered) == sorted(INTERVALS)
+    assert ordered == sorted(ordered, key=lambda value: (parsed_days(value), value))
+
+    # Ties broken by name: 1-YEARS and 52-WEEKS are the same length here
+    units = {'DAYS': 1, 'WEEKS': 7, 'MONTHS': 30, 'YEARS': 364}
+    assert pm_interval.ordered(['1-YEARS', '52-WEEKS', '12-MONTHS', '1-MONTHS'], units) == \
+        ['1-MONTHS', '12-MONTHS', '1-YEARS', '52-WEEKS']
+
@@ -0,0 +1,56 @@
+"""
+The binned FFT KDE against scipy.stats.gaussian_kde on the Deep Dive's 0-1 grid.
+
+Curves must match gaussian_kde to a small fraction of their peak for small
+and large groups. Degenerate groups (one value, all values equal), where
+gaussian_kde raises, give a MIN_BANDWIDTH Gaussian at the value.
+"""
+
+import numpy as np
+import pytest
+from scipy.stats import gaussian_kde, norm
+
+import pm_kde
+
+X = np.linspace(0, 1, 200)
+
+# Largest difference from gaussian_kde, relative to the curve's peak
+RTOL = 1e-4
+
+
+def samples(kind, n):
+    rng = np.random.default_rng(n)
+    if kind == 'normal':
+        return rng.normal(0.5, 0.15, n)
+    if kind == 'skewed':
+        return rng.beta(2, 5, n)
+    # Normalized components pile up at the 0 / 1 clip bounds
+    return np.clip(rng.normal(0.2, 0.2, n), 0, 1)
+
+
+@pytest.mark.parametrize('n', [2, 10, 200, 20_000])
+@pytest.mark.parametrize('kind', ['normal', 'skewed', 'clipped'])
+def test_matches_gaussian_kde(kind, n):
+    values = samples(kind, n)
+    expected = gaussian_kde(values)(X)
+    actual = pm_kde.binned_kde(values, X)
+    assert np.abs(actual - expected).max() <= RTOL * expected.max()
+
+
+def test_missing_values_are_dropped():
+    values = samples('normal', 500)
+    with_gaps = np.concatenate([values, [np.nan, np.inf]])
+    np.testing.assert_array_equal(pm_kde.binned_kde(with_gaps, X), pm_kde.binned_kde(values, X))
+
+
+@pytest.mark.parametrize('values', [[0.3], [0.7] * 50, [0.0, 0.0], [1 / 3] * 7],
+                         ids=['single', 'all equal', 'at the bound', 'inexact value'])
+def test_degenerate_groups(values):
+    expected = norm.pdf(X, values[0], pm_kde.MIN_BANDWIDTH)
+    actual = pm_kde.binned_kde(values, X)
+    assert np.abs(actual - expected).max() <= 1e-3 * expected.max()
+
+
+def test_empty_group():
+    np.testing.assert_array_equal(pm_kde.binned_kde([], X), np.zeros_like(X))
+    np.testing.assert_array_equal(pm_kde.binned_kde([np.nan], X), np.zeros_like(X))
@@ -0,0 +1,114 @@
+"""
+Rolling-horizon occurrences.
+
+generate_occurrences() rolls each PM's interval forward from its last due
+date with vectorized date arithmetic, chunk by chunk. It must produce what a
+plain pandas loop produces: for each PM, the craft rows of its last
+occurrence (the latest COUNTKEY on its last due date), repeated on every
+last_due + k * interval before the end (calendar months with the day
+clamped, as pd.DateOffset does). extend_forecast() writes the export plus
+those rows.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pm_ingest
+import pm_interval
+import pm_occurrences
+import synthetic
+
+END = pd.Timestamp('2029-04-01')
+
+
+def with_edge_cases(forecast):
+    """Adds PMs due on month ends, on 29 February, and twice on their last day"""
+    template = forecast[forecast['PMNUM'] == forecast['PMNUM'].iloc[0]]
+    template = template[template['COUNTKEY'] == template['COUNTKEY'].iloc[0]]
+    edge = []
+    for pmnum, interval, due in [('PMEDGE1', '1-MONTHS', '2027-01-31'), ('PMEDGE2', '1-YEARS', '2028-02-29'),
+                                 ('PMEDGE3', '3-MONTHS', '2027-03-31'), ('PMEDGE3', '3-MONTHS', '2027-03-31'),
+                                 ('PMEDGE4', '2-WEEKS', '2027-03-30')]:
+        rows = template.assign(PMNUM=pmnum, DUE_DATE=pd.Timestamp(due))
+        rows['INTERVAL'] = rows['INTERVAL'].cat.set_categories(forecast['INTERVAL'].cat.categories)
+        rows.loc[:, 'INTERVAL'] = interval
+        rows['COUNTKEY'] = f'{due}-{pmnum}' + ('' if len(edge) != 3 else '-B')
+        if len(edge) == 3:
+            rows = rows.assign(LABOR_CRAFT='EDGE')
+        edge.append(rows)
+    return pd.concat([forecast] + edge, ignore_index=True)
+
+
+@pytest.fixture(scope='module')
+def forecast():
+    return with_edge_cases(synthetic.generate_forecast(0.02, 0))
+
+
+@pytest.fixture(scope='module')
+def generated(forecast):
+    return pd.concat(pm_occurrences.generate_occurrences(forecast, END), ignore_index=True)
+
+
+def reference(forecast, end):
+    """Row by row: each PM's last occurrence repeated every interval until end"""
+    chunks = []
+    for pmnum, rows in forecast.groupby('PMNUM', observed=True, sort=True):
+        last = rows[rows['DUE_DATE'] == rows['DUE_DATE'].max()]
+        last = last[last['COUNTKEY'].astype(str) == last['COUNTKEY'].astype(str).max()]
+        number, unit = pm_interval.parse(last['INTERVAL'].iloc[0])
+        base = last['DUE_DATE'].iloc[0]
+        for k in range(1, 10_000):
+            if unit in ('MONTHS', 'YEARS'):
+                due = base + pd.DateOffset(months=k * number * (12 if unit == 'YEARS' else 1))
+            else:
+                due = base + pd.Timedelta(days=k * number * (7 if unit == 'WEEKS' else 1))
+            if due >= end:
+                break
+            chunks.append(last.assign(DUE_DATE=due, COUNTKEY=f"{due:%Y-%m-%d}-{pmnum}"))
+    return pd.concat(chunks, ignore_index=True)
+
+
+def in_order(df):
+    return df.sort_values(['PMNUM', 'DUE_DATE', 'COUNTKEY', 'LABOR_CRAFT'], kind='stable').reset_index(drop=True)
+
+
+def test_generated_occurrences_match_pandas(forecast, generated):
+    pd.testing.assert_frame_equal(in_order(generated), in_order(reference(forecast, END)), check_categorical=False)
+
+    # Every generated occurrence is after its PM's last due date and before the end, under a new COUNTKEY
+    last_due = forecast.groupby('PMNUM', observed=True)['DUE_DATE'].max()
+    assert (generated['DUE_DATE'] > generated['PMNUM'].map(last_due)).all()
+    assert (generated['DUE_DATE'] < END).all()
+    assert (generated.groupby('COUNTKEY')['DUE_DATE'].nunique() == 1).all()
+    assert not generated['COUNTKEY'].isin(forecast['COUNTKEY']).any()
+
+
+def test_chunks_do_not_change_the_result(forecast, generated):
+    chunks = list(pm_occurrences.generate_occurrences(forecast, END, chunk_pms=7))
+    assert len(chunks) > 1
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), generated)
+
+
+def test_edge_cases(forecast, generated):
+    due = generated.groupby('PMNUM')['DUE_DATE'].unique()
+    assert list(due['PMEDGE1'][:3].strftime('%m-%d')) == ['02-28', '03-31', '04-30']
+    assert list(due['PMEDGE2'].strftime('%Y-%m-%d')) == ['2029-02-28']
+    # One template occurrence: the latest COUNTKEY's craft, once per due date
+    edge3 = generated[generated['PMNUM'] == 'PMEDGE3']
+    assert edge3['COUNTKEY'].is_unique
+    assert (edge3['LABOR_CRAFT'] == 'EDGE').all()
+    assert (np.diff(due['PMEDGE4']) == np.timedelta64(14, 'D')).all()
+
+
+@pytest.mark.parametrize('months', [0, 24])
+def test_extend_forecast_writes_export_and_generated_rows(forecast, tmp_path, months):
+    export = forecast.drop(forecast.index[forecast['PMNUM'].str.startswith('PMEDGE')])
+    pm_occurrences.extend_forecast(export, months, tmp_path / 'horizon')
+    extended = pm_ingest.read_forecast(tmp_path / 'horizon')
+
+    end = export['DUE_DATE'].min().to_period('M').to_timestamp() + pd.DateOffset(months=months)
+    expected = pd.concat([export, reference(export, end)], ignore_index=True) if months else export
+    assert len(extended) == len(expected)
+    pd.testing.assert_frame_equal(in_order(extended), in_order(expected[extended.columns]),
+                                  check_dtype=False, check_categorical=False)
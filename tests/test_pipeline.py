@@ -0,0 +1,98 @@
+"""
+Incremental pipeline runs.
+
+A stage's fingerprint covers its code, the helper modules it calls and the
+fingerprints of its inputs. Each test starts from a copy of one complete
+build and checks which stages the next run builds: an unchanged rerun builds
+nothing, an edited helper module, stage function or raw export rebuilds
+exactly the stages downstream of it, and --force rebuilds every stage.
+"""
+
+import inspect
+import re
+import shutil
+
+import pytest
+
+import pm_complexity
+import pm_pipeline
+import synthetic
+
+# Every stage a run without a horizon builds (forecast_horizon is then just forecast_raw)
+ALL_BUILT = set(pm_pipeline.STAGES) - {'forecast_horizon'}
+
+# Everything that reads the complexity model, directly or through its scores
+COMPLEXITY_DOWNSTREAM = {'complexity_model', 'complexity_drift', 'forecast_clean',
+                         'clipped_report', 'forecast_store'}
+PERFORMANCE_DOWNSTREAM = {'performance_raw', 'path2', 'path2_store', 'path2_pm_store'}
+
+
+@pytest.fixture(scope='module')
+def base_build(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp('data')
+    synthetic.write_csv(*synthetic.generate(1, 0), data_dir)
+    output_dir = tmp_path_factory.mktemp('outputs')
+    status = pm_pipeline.run_pipeline(data_dir, output_dir, verbose=False)
+    assert built(status) == ALL_BUILT
+    return data_dir, output_dir
+
+
+@pytest.fixture
+def build(base_build, tmp_path):
+    """A private copy of the complete build: (data_dir, output_dir)"""
+    data_dir, output_dir = tmp_path / 'data', tmp_path / 'outputs'
+    shutil.copytree(base_build[0], data_dir)
+    shutil.copytree(base_build[1], output_dir)
+    return data_dir, output_dir
+
+
+def built(status):
+    return {name for name, state in status.items() if state == 'built'}
+
+
+def edited_source(monkeypatch, target):
+    """As if `target` (a module or function) had been edited on disk"""
+    getsource = inspect.getsource
+    monkeypatch.setattr(inspect, 'getsource',
+                        lambda obj: getsource(obj) + ('\n# edited\n' if obj is target else ''))
+
+
+def test_unchanged_rerun_builds_nothing(build):
+    status = pm_pipeline.run_pipeline(*build, verbose=False)
+    assert built(status) == set()
+    assert status == {name: 'up to date' for name in pm_pipeline.TARGETS}
+
+
+@pytest.mark.parametrize('target, expected', [
+    (pm_complexity, COMPLEXITY_DOWNSTREAM),
+    (pm_pipeline.clipped_report, {'clipped_report'}),
+    (pm_pipeline.build_path2_pm, {'path2_pm_store'}),
+])
+def test_edited_code_rebuilds_downstream_stages(build, monkeypatch, target, expected):
+    edited_source(monkeypatch, target)
+    assert built(pm_pipeline.run_pipeline(*build, verbose=False)) == expected
+
+    # The edit is recorded: the run after it builds nothing
+    assert built(pm_pipeline.run_pipeline(*build, verbose=False)) == set()
+
+
+def test_changed_export_rebuilds_downstream_stages(build):
+    data_dir, output_dir = build
+    performance = data_dir / pm_pipeline.PERFORMANCE_FILE
+    lines = performance.read_bytes().splitlines(keepends=True)
+    performance.write_bytes(b''.join(lines[:-1]))
+
+    assert built(pm_pipeline.run_pipeline(data_dir, output_dir, verbose=False)) == PERFORMANCE_DOWNSTREAM
+    assert built(pm_pipeline.run_pipeline(data_dir, output_dir, verbose=False)) == set()
+
+
+def test_missing_output_is_rebuilt(build):
+    data_dir, output_dir = build
+    (output_dir / pm_pipeline.STAGES['complexity_drift']['output']).unlink()
+    assert built(pm_pipeline.run_pipeline(data_dir, output_dir, verbose=False)) == {'complexity_drift'}
+
+
+def test_force_rebuilds_everything(build, capsys):
+    data_dir, output_dir = build
+    pm_pipeline.main(['--force', '--data-dir', str(data_dir), '--output-dir', str(output_dir)])
+    assert set(re.findall(r'-> Built (\w+)', capsys.readouterr().out)) == ALL_BUILT
@@ -0,0 +1,149 @@
+"""
+Parity of the page queries on the pandas and DuckDB backends.
+
+The pipeline builds a Parquet store from the synthetic exports (conftest), in
+a folder whose name holds a quote. Every query behind the page
+charts must return the same groups and numbers from the in-memory cube / PM
+frame and from DuckDB over the store. Typed filters (numbers, dates) are
+checked against plain pandas, as are cube means over missing values and the
+PM table's per-craft membership.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pm_cube
+import pm_data
+import pm_index
+import pm_query
+import pm_store
+
+
+def forecast_queries(dept, crafts):
+    """(name, table method, args, kwargs) - the forecast queries behind the page charts"""
+    dept_filter = {'DEPT_NAME': dept}
+    craft_filter = {'DEPT_NAME': dept, 'LABOR_CRAFT': crafts}
+    return [
+        ('monthly dept hours', 'query', (['MONTH', 'DEPT_NAME'], {'PLANNED_LABOR_HRS': 'sum'}), {}),
+        ('zone summary', 'query', ('ZONENAME', {'PMNUM': 'nunique', 'COUNTKEY': 'count',
+                                                'PLANNED_LABOR_HRS': 'sum', 'total_labor_hrs': 'sum'}),
+         {'filters': craft_filter}),
+        ('interval mix', 'query', ('interval_category', {'PMNUM': 'nunique', 'COUNTKEY': 'count',
+                                                         'PLANNED_LABOR_HRS': 'sum', 'PLANNED_LABORERS': 'sum',
+                                                         'complexity_score': 'mean', 'TASK_COUNT': 'mean'}),
+         {'filters': craft_filter}),
+        ('dept summary (mode)', 'query', ('DEPT_NAME', {'PLANNED_LABOR_HRS': 'sum', 'PMNUM': 'nunique',
+                                                        'complexity_score': 'mean', 'LABOR_CRAFT': 'mode'}), {}),
+        ('interval counts', 'value_counts', ('interval_category',), {}),
+        ('total PMs', 'total', ('PMNUM', 'nunique'), {}),
+        ('dominant craft', 'total', ('LABOR_CRAFT', 'mode'), {'filters': dept_filter}),
+        ('crafts', 'values', ('LABOR_CRAFT',), {'filters': dept_filter}),
+    ]
+
+
+def execution_queries(selection):
+    return [
+        ('dept_exec', 'query', ('DEPT_NAME', {'completion_rate': 'mean', 'on_time_rate': 'mean',
+                                              'PMNUM': 'nunique'}), {}),
+        ('dept_exec (filtered)', 'query', ('DEPT_NAME', {'completion_rate': 'mean', 'on_time_rate': 'mean',
+                                                         'PMNUM': 'nunique'}), {'filters': selection}),
+        ('cat_summary', 'query', ('INTERVAL', {'completion_rate': 'mean', 'on_time_rate': 'mean',
+                                               'hour_deviation_pct': 'mean', 'PMNUM': 'nunique'}), {}),
+        ('cat_summary (filtered)', 'query', ('LABOR_CRAFT', {'completion_rate': 'mean', 'on_time_rate': 'mean',
+                                                             'hour_deviation_pct': 'mean', 'PMNUM': 'nunique'}),
+         {'filters': selection}),
+    ]
+
+
+def as_frame(result):
+    """Query result -> DataFrame with plain (object) labels, for comparison"""
+    if isinstance(result, pd.Series):
+        result = result.reset_index()
+    elif isinstance(result, list):
+        result = pd.DataFrame({'value': result})
+    elif not isinstance(result, pd.DataFrame):
+        result = pd.DataFrame({'value': [result]})
+    result = result.reset_index(drop=True)
+    return result.astype({col: object for col in result.columns
+                          if isinstance(result[col].dtype, pd.CategoricalDtype)})
+
+
+@pytest.fixture(scope='module')
+def forecast_tables(store):
+    path = store / 'forecast'
+    return pm_cube.build_cube(pm_store.read_dataset(path, pm_cube.CUBE_COLUMNS)), pm_query.DuckDBTable(path)
+
+
+@pytest.fixture(scope='module')
+def pm_tables(store):
+    path = store / 'path2_pm'
+    pms = pm_store.read_dataset(path)
+    frame = pm_query.FrameTable(pms, pm_index.build_index(pms, pm_data.INDEX_COLUMNS["Plan vs Execution"]),
+                                unit='PMNUM')
+    return pms, frame, pm_query.DuckDBTable(path, unit='PMNUM')
+
+
+def check(tables, method, args, kwargs):
+    expected, actual = (as_frame(getattr(table, method)(*args, **kwargs)) for table in tables)
+    pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_exact=False, rtol=1e-9)
+
+
+def test_forecast_queries_match(store, forecast_tables):
+    cube, _ = forecast_tables
+    dept = pm_store.partition_values(store / 'forecast', 'DEPT_NAME')[0]
+    crafts = cube.values('LABOR_CRAFT', filters={'DEPT_NAME': dept})[:2]
+    for name, method, args, kwargs in forecast_queries(dept, crafts):
+        check(forecast_tables, method, args, kwargs)
+
+
+def test_execution_queries_match(pm_tables):
+    pms, frame, sql = pm_tables
+    selection = {'DEPT_NAME': [pms['DEPT_NAME'].dropna().astype(str).min()],
+                 'JOB_TYPE': sorted(pms['JOB_TYPE'].dropna().unique())[:2]}
+    for name, method, args, kwargs in execution_queries(selection):
+        check((frame, sql), method, args, kwargs)
+
+
+def test_pm_table_keeps_every_membership(store, pm_tables):
+    """A PM with several crafts counts, once, under each of them - as in the row-level data"""
+    _, frame, sql = pm_tables
+    rows = pm_store.read_dataset(store / 'path2', ['PMNUM', 'JOB_TYPE', 'LABOR_CRAFT', 'completion_rate'])
+    assert (rows.groupby('PMNUM', observed=True)['LABOR_CRAFT'].nunique() > 1).any()
+    job_type = sorted(rows['JOB_TYPE'].dropna().unique())[0]
+    members = (rows[rows['JOB_TYPE'] == job_type].dropna(subset=['LABOR_CRAFT'])
+               .drop_duplicates(['PMNUM', 'LABOR_CRAFT']))
+    expected = (members.groupby('LABOR_CRAFT', observed=True)
+                .agg(completion_rate=('completion_rate', 'mean'), PMNUM=('PMNUM', 'nunique')).reset_index())
+    agg = {'completion_rate': 'mean', 'PMNUM': 'nunique'}
+    for table in (frame, sql):
+        actual = table.query('LABOR_CRAFT', agg, filters={'JOB_TYPE': [job_type]})
+        pd.testing.assert_frame_equal(as_frame(expected), as_frame(actual), check_dtype=False,
+                                      check_exact=False, rtol=1e-9)
+        assert table.total('PMNUM', 'nunique') == rows['PMNUM'].nunique()
+
+
+def test_typed_filters(store, forecast_tables):
+    """Numeric and date filters compare as numbers / dates, not as their str()"""
+    _, sql = forecast_tables
+    rows = pm_store.read_dataset(store / 'forecast', ['interval_days', 'DUE_DATE', 'PLANNED_LABOR_HRS'])
+    days = rows['interval_days'].dropna().unique()[:2]
+    due = rows['DUE_DATE'].iloc[0]
+    cases = [({'interval_days': np.float64(days[0])}, rows['interval_days'] == days[0]),
+             ({'interval_days': list(days)}, rows['interval_days'].isin(days)),
+             ({'DUE_DATE': due}, rows['DUE_DATE'] == due),
+             ({'DUE_DATE': [due.to_datetime64()]}, rows['DUE_DATE'] == due)]
+    for filters, mask in cases:
+        assert mask.sum() > 0
+        assert sql.total('PLANNED_LABOR_HRS', filters=filters) == pytest.approx(rows.loc[mask, 'PLANNED_LABOR_HRS'].sum())
+
+
+def test_cube_mean_skips_missing(store):
+    """A cube mean divides by the non-null count, like a raw groupby mean"""
+    rows = pm_store.read_dataset(store / 'forecast', pm_cube.CUBE_COLUMNS)
+    rows.loc[rows.index[::3], 'complexity_score'] = np.nan
+    rows.loc[rows['DEPT_NAME'] == rows['DEPT_NAME'].iloc[0], 'TASK_COUNT'] = np.nan
+    agg = {'complexity_score': 'mean', 'TASK_COUNT': 'mean'}
+    expected = rows.groupby('DEPT_NAME', observed=True).agg(agg).reset_index()
+    pd.testing.assert_frame_equal(as_frame(expected), as_frame(pm_cube.build_cube(rows).query('DEPT_NAME', agg)),
+                                  check_dtype=False, check_exact=False, rtol=1e-9)
@@ -0,0 +1,117 @@
+"""
+Capacity-constrained leveling.
+
+Leveling only moves occurrences, so every craft keeps its total crew hours.
+When the work fits under capacity within the allowed shifts, no (craft, week)
+cell is left over capacity. Crafts with a blank capacity are unlimited and
+never moved, and every occurrence stays inside its window: the pull-back pass
+only steps moved work towards its original week, never past it.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import pm_schedule
+
+MONDAY = pd.Timestamp('2025-01-06')
+
+# Daily PMs that stay put and span the schedule over weeks 0-12
+SPAN = [('START', 0, 'MECH', 1, 1.0), ('END', 12, 'MECH', 1, 1.0)]
+
+
+def occurrences(rows):
+    """(COUNTKEY, week, craft, interval_days, hours) tuples -> schedule frame"""
+    df = pd.DataFrame(rows, columns=['COUNTKEY', 'week', 'LABOR_CRAFT', 'interval_days', pm_schedule.HOURS_COLUMN])
+    df['DUE_DATE'] = MONDAY + pd.to_timedelta(df.pop('week') * 7 + 2, unit='D')
+    return df[pm_schedule.SCHEDULE_COLUMNS]
+
+
+def random_forecast(n=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    keys = np.arange(n)
+    df = pd.DataFrame({
+        'COUNTKEY': keys,
+        'week': rng.integers(0, 40, n) // rng.choice([1, 4], n),   # bunched into the first weeks
+        'LABOR_CRAFT': rng.choice(['MECH', 'ELEC', 'INST', None], n),
+        'interval_days': rng.choice([1, 7, 30, 91, 182, 365], n),
+        pm_schedule.HOURS_COLUMN: rng.gamma(2.0, 3.0, n).round(1),
+    })
+    # A quarter of the occurrences need a second craft
+    extra = df.sample(frac=0.25, random_state=seed).assign(LABOR_CRAFT='ELEC')
+    return occurrences(pd.concat([df, extra]).itertuples(index=False))
+
+
+def craft_totals(weekly, column):
+    return weekly.groupby('LABOR_CRAFT')[column].sum()
+
+
+def test_total_hours_are_conserved():
+    df = random_forecast()
+    capacity = pm_schedule.default_capacity(df, headroom=0.8)
+    result = pm_schedule.level_schedule(df, capacity)
+    assert result['summary']['moved'] > 0
+    assert result['summary']['overload_after'] < result['summary']['overload_before']
+
+    weekly = result['weekly']
+    pd.testing.assert_series_equal(craft_totals(weekly, 'after'), craft_totals(weekly, 'before'), check_names=False)
+    assert weekly['after'].sum() == pytest.approx(df[pm_schedule.HOURS_COLUMN].sum())
+
+
+def test_no_cell_over_capacity_when_leveling_is_feasible():
+    # 20 x 5 h of yearly MECH work due in week 4, room for 10 h a week over weeks 0-12
+    rows = [(f'Y{i}', 4, 'MECH', 365, 5.0) for i in range(20)]
+    rows += SPAN
+    # Two-craft occurrences move as a whole
+    rows += [(f'Q{i}', 5, craft, 91, 4.0) for i in range(3) for craft in ['MECH', 'ELEC']]
+    result = pm_schedule.level_schedule(occurrences(rows), {'MECH': 11, 'ELEC': 4})
+
+    weekly = result['weekly']
+    assert (weekly['before'] > weekly['capacity']).any()
+    assert (weekly['after'] <= weekly['capacity'] + 1e-9).all()
+    assert result['summary']['overload_after'] == 0
+
+    moves = result['moves'].set_index('COUNTKEY')
+    for key in moves.index[moves.index.str.startswith('Q')]:
+        assert (weekly.loc[weekly['LABOR_CRAFT'] == 'ELEC', 'after'] <= 4).all()
+        assert moves.loc[key, 'SHIFT_DAYS'] % 7 == 0
+
+
+@pytest.mark.parametrize('blank', [None, np.nan])
+def test_blank_capacity_is_unlimited(blank):
+    rows = [(f'Y{i}', 4, 'MECH', 365, 5.0) for i in range(20)]
+    rows += [(f'E{i}', 4, 'ELEC', 365, 50.0) for i in range(5)]
+    rows += SPAN
+    result = pm_schedule.level_schedule(occurrences(rows), {'MECH': 11, 'ELEC': blank})
+
+    assert not result['moves']['COUNTKEY'].str.startswith('E').any()
+    elec = result['weekly'][result['weekly']['LABOR_CRAFT'] == 'ELEC']
+    assert np.isinf(elec['capacity']).all()
+    assert (elec['after'] == elec['before']).all()
+    assert result['summary']['overload_after'] == 0
+
+
+def test_moves_stay_inside_the_due_window():
+    df = random_forecast(seed=1)
+    lv = pm_schedule._Leveler(df, pm_schedule.default_capacity(df, headroom=0.8),
+                              pm_schedule.WINDOW_SHARE, pm_schedule.MAX_SHIFT_WEEKS)
+    lv.level()
+    leveled = lv.week.copy()
+    assert (leveled != lv.week0).any()
+    lv.pull_back()
+
+    # Pulled back towards the original week, never past it
+    low, high = np.minimum(leveled, lv.week0), np.maximum(leveled, lv.week0)
+    assert ((lv.week >= low) & (lv.week <= high)).all()
+    assert (np.abs(lv.week - lv.week0) <= lv.window).all()
+
+
+@pytest.mark.parametrize('offset', [-2, 2])
+def test_pull_back_stops_at_the_original_week(offset):
+    rows = [('PM', 4, 'MECH', 365, 5.0)] + SPAN
+    lv = pm_schedule._Leveler(occurrences(rows), {}, pm_schedule.WINDOW_SHARE, pm_schedule.MAX_SHIFT_WEEKS)
+    job = list(lv.keys).index('PM')
+    lv._move(job, lv.week0[job] + offset)
+    lv.pull_back()
+    assert lv.week[job] == lv.week0[job] == 4
+    np.testing.assert_array_equal(lv.load, lv.before)
@@ -0,0 +1,144 @@
+"""
+Concurrent dashboard sessions over one registry of dataset versions.
+
+N sessions run a rerun each on their own thread, reading the page datasets
+and aggregates through pm_data as the pages do. Halfway through, a new
+snapshot is published and swapped in. Every session must read the version
+it pinned for its whole rerun, return what a single session returns, and
+get the very same shared frames: the datasets are held once per version,
+whatever the number of sessions. Session state is measured with each object
+counted once.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import pm_data
+import pm_memory
+import pm_pipeline
+import pm_registry
+import pm_store
+
+N_SESSIONS = 8
+
+
+def page_results():
+    """The aggregates behind the page charts, as plain frames / values"""
+    cube = pm_data.load_cube()
+    dept = cube.values('DEPT_NAME')[0]
+    weekly = pm_data.load_forecast(pm_data.PAGE_COLUMNS["Workload Calendar"])
+    positions = pm_data.load_calendar_index().positions({'DEPT_NAME': dept})
+    return {
+        'monthly': cube.query(['MONTH', 'DEPT_NAME'], {'PLANNED_LABOR_HRS': 'sum'}),
+        'pms': cube.total('PMNUM', 'nunique'),
+        'kpi': pm_data.cached_result('test/complexity', lambda: cube.total('complexity_score', 'mean')),
+        'dept_hours': float(weekly['PLANNED_LABOR_HRS'].iloc[positions].sum()),
+        'execution': pm_data.load_path2_pm_table().query('DEPT_NAME', {'completion_rate': 'mean',
+                                                                       'PMNUM': 'nunique'}),
+    }
+
+
+def shared_frames():
+    """ids of the datasets a session was handed"""
+    return (id(pm_data.load_forecast(pm_data.PAGE_COLUMNS["Workload Calendar"])),
+            id(pm_data.load_path2_pm()), id(pm_data.load_cube()))
+
+
+def assert_same(results, expected):
+    assert results.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(results[key], value)
+        else:
+            assert results[key] == value or (np.isnan(value) and np.isnan(results[key]))
+
+
+def shared_bytes(version):
+    report = pm_memory.report()
+    return report.loc[report['item'].str.startswith(version), 'MB'].sum()
+
+
+def test_concurrent_sessions(store, monkeypatch):
+    # Which snapshot every memoized read went to, per session thread
+    reads = {}
+    memo = pm_registry.Snapshot._memo
+
+    def recording_memo(self, items, key, build, limit=None):
+        reads.setdefault(threading.get_ident(), set()).add(self.version)
+        return memo(self, items, key, build, limit)
+    monkeypatch.setattr(pm_registry.Snapshot, '_memo', recording_memo)
+
+    registry = pm_registry.Registry(store, warm=pm_data.preload)
+    try:
+        with registry.pinned() as snapshot, pm_data.using_snapshot(snapshot):
+            expected, frames = page_results(), shared_frames()
+        first = snapshot.version
+        single_bytes = shared_bytes(first)
+        assert single_bytes > 0
+
+        # Every session is mid-rerun when the new version is swapped in
+        swap = threading.Barrier(N_SESSIONS + 1)
+
+        def session(i):
+            with registry.pinned() as pinned, pm_data.using_snapshot(pinned):
+                before = page_results()
+                swap.wait()
+                swap.wait()
+                after = page_results()
+                return pinned.version, before, after, shared_frames()
+
+        with ThreadPoolExecutor(N_SESSIONS) as pool:
+            futures = [pool.submit(session, i) for i in range(N_SESSIONS)]
+            swap.wait()
+            time.sleep(1)   # versions are timestamped to the second
+            pm_store.publish_snapshot(store, list(pm_pipeline.SNAPSHOT_STAGES), 'concurrent-sessions-test')
+            assert registry.check()
+            swap.wait()
+            sessions = [future.result() for future in futures]
+
+        for version, before, after, session_frames in sessions:
+            assert version == first
+            assert_same(before, expected)
+            assert_same(after, expected)
+            assert session_frames == frames
+        session_threads = set(reads) - {threading.get_ident()}
+        assert all(reads[thread] == {first} for thread in session_threads)
+
+        # Held once per version: N sessions added nothing to the shared datasets
+        assert shared_bytes(first) == single_bytes
+
+        # The next reruns read the new version (already loaded by the swap), with the same results,
+        # and N of them at once grow the process by less than one copy of the datasets
+        assert registry.status()['in_use'] == []
+        rss = pm_memory.rss_bytes()
+
+        def rerun(i):
+            with registry.pinned() as pinned, pm_data.using_snapshot(pinned):
+                return pinned.version, page_results()
+
+        with ThreadPoolExecutor(N_SESSIONS) as pool:
+            reruns = list(pool.map(rerun, range(N_SESSIONS)))
+        for version, results in reruns:
+            assert version != first
+            assert_same(results, expected)
+        assert pm_memory.rss_bytes() - rss < single_bytes * pm_memory.MB
+    finally:
+        registry.stop()
+
+
+def test_session_state_size_counts_each_object_once():
+    """Cycles in session state terminate; a frame held under two keys is counted once"""
+    frame = pd.DataFrame({'hours': np.arange(10_000, dtype=float)})
+    node = {'frame': frame}
+    node['parent'] = node
+    state = {'selection': frame, 'tree': node, 'history': [node, node]}
+    frame_bytes = pm_memory.nbytes(frame)
+    assert frame_bytes <= pm_memory.nbytes(state) < 2 * frame_bytes
+
+    pm_memory.record_session('cyclic-session', state)
+    report = pm_memory.report()
+    assert report.loc[report['item'] == 'cyclic-s', 'MB'].iloc[0] < 2 * frame_bytes / pm_memory.MB